@@ -0,0 +1,48 @@
+"""
+Adaptive check ordering benchmark.
+
+A flag holds an expensive membership check on a large list next to a cheap
+boolean check that fails for most traffic. Insertion order runs the
+expensive check first; adaptive ordering learns to run the cheap one first.
+
+    python benchmarks/adaptive_ordering.py
+"""
+
+import argparse
+import random
+import timeit
+
+from flipper import Condition
+from flipper.conditions import AdaptiveOrdering, CompiledConditions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--list-size", type=int, default=5000)
+    parser.add_argument("--staff-rate", type=float, default=0.05)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    conditions = [Condition(account_id__in=list(range(args.list_size)), is_staff=True)]
+    rng = random.Random(1)
+    contexts = [
+        {"account_id": rng.randrange(args.list_size * 2), "is_staff": rng.random() < args.staff_rate}
+        for _ in range(args.calls)
+    ]
+
+    static = CompiledConditions(conditions)
+    adaptive = CompiledConditions(conditions, adaptive_ordering=AdaptiveOrdering(sample_every=100, reorder_every=10))
+
+    assert [static.check_context(c) for c in contexts] == [adaptive.check_context(c) for c in contexts]  # noqa: S101
+
+    static_time = timeit.timeit(lambda: [static.check_context(c) for c in contexts], number=3)
+    adaptive_time = timeit.timeit(lambda: [adaptive.check_context(c) for c in contexts], number=3)
+
+    print(f"learned order:     {adaptive.variables}")
+    print(f"insertion order:   {static_time / (3 * args.calls) * 1e6:.2f} us per call")
+    print(f"adaptive ordering: {adaptive_time / (3 * args.calls) * 1e6:.2f} us per call")
+    print(f"speedup:           {static_time / adaptive_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
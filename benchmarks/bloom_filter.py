@@ -0,0 +1,54 @@
+"""
+Bloom filter membership benchmark.
+
+Reports the payload size of an `in_bloom` check next to an exact set of the
+same ids, the lookup speed of both, and the measured false-positive rate.
+
+    python benchmarks/bloom_filter.py --members 1000000 --rate 0.01
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+from flipper.conditions import BloomFilter, Condition
+
+
+def measure_exact_set(members: int) -> tuple[set, int]:
+    tracemalloc.start()
+    exact = {str(i) for i in range(members)}
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return exact, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=1_000_000)
+    parser.add_argument("--rate", type=float, default=0.01)
+    parser.add_argument("--probes", type=int, default=100_000)
+    args = parser.parse_args()
+
+    bloom = BloomFilter.from_iterable((str(i) for i in range(args.members)), args.members, args.rate)
+    exact, exact_size = measure_exact_set(args.members)
+
+    condition = Condition(user_id__in_bloom=bloom.to_dict())
+    exact_condition = Condition(user_id__in=exact)
+
+    misses = range(args.members, args.members + args.probes)
+    false_positives = sum(1 for i in misses if str(i) in bloom)
+
+    bloom_time = timeit.timeit(lambda: condition.check(user_id="12345"), number=args.probes)
+    exact_time = timeit.timeit(lambda: exact_condition.check(user_id="12345"), number=args.probes)
+
+    print(f"members:              {args.members:,}")
+    print(f"bits / hashes:        {bloom.num_bits:,} / {bloom.num_hashes}")
+    print(f"bloom bit array:      {bloom.size_in_bytes / 1024 / 1024:.2f} MiB")
+    print(f"exact set of strings: {exact_size / 1024 / 1024:.2f} MiB")
+    print(f"bloom lookup:         {bloom_time / args.probes * 1e6:.2f} us")
+    print(f"exact lookup:         {exact_time / args.probes * 1e6:.2f} us")
+    print(f"false positive rate:  {false_positives / args.probes:.4%} (target {args.rate:.4%})")
+
+
+if __name__ == "__main__":
+    main()
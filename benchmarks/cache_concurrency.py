@@ -0,0 +1,87 @@
+"""
+Cache concurrency benchmark.
+
+Runs `get` from 1 to 32 threads against a `CachedFeatureFlagStore` in
+concurrent mode, and against the default cache behind one global lock, with
+a share of writes mixed in. Reports throughput and any errors raised.
+
+    python benchmarks/cache_concurrency.py --flags 10000 --ops 20000
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from flipper import CachedFeatureFlagStore, MemoryFeatureFlagStore
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+class LockedStore:
+    def __init__(self, store: CachedFeatureFlagStore) -> None:
+        self._store = store
+        self._lock = threading.Lock()
+
+    def get(self, feature_name: str) -> object:
+        with self._lock:
+            return self._store.get(feature_name)
+
+    def set(self, feature_name: str, is_enabled: bool) -> None:
+        with self._lock:
+            self._store.set(feature_name, is_enabled)
+
+
+def run(store: object, names: list[str], threads: int, ops: int, write_ratio: float) -> tuple[float, int]:
+    errors = []
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        # Skewed access: a few flags are read far more often than the rest.
+        keys = [names[min(len(names) - 1, int(rng.paretovariate(1.2)) - 1)] for _ in range(ops)]
+        barrier.wait()
+        try:
+            for name in keys:
+                if rng.random() < write_ratio:
+                    store.set(name, True)
+                else:
+                    store.get(name)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return threads * ops / elapsed, len(errors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flags", type=int, default=10_000)
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--write-ratio", type=float, default=0.01)
+    args = parser.parse_args()
+
+    backend = MemoryFeatureFlagStore()
+    names = [f"flag-{i}" for i in range(args.flags)]
+    for name in names:
+        backend.create(name, is_enabled=True)
+
+    print(f"{'threads':>7}  {'global lock ops/s':>18}  {'concurrent ops/s':>17}  errors")
+    for threads in THREAD_COUNTS:
+        locked = LockedStore(CachedFeatureFlagStore(backend, size=args.size))
+        striped = CachedFeatureFlagStore(backend, size=args.size, concurrent=True)
+        locked_rate, locked_errors = run(locked, names, threads, args.ops, args.write_ratio)
+        striped_rate, striped_errors = run(striped, names, threads, args.ops, args.write_ratio)
+        print(f"{threads:>7}  {locked_rate:>18,.0f}  {striped_rate:>17,.0f}  {locked_errors + striped_errors}")
+
+
+if __name__ == "__main__":
+    main()
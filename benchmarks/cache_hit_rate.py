@@ -0,0 +1,97 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""
+Cache hit rate benchmark.
+
+Replays synthetic traces of flag reads through each eviction policy of
+`CachedFeatureFlagStore` and reports the hit rate. The traces draw flags
+from a Zipf distribution, with and without periodic scans over cold flags
+(an admin listing or a batch job), and with the popular flags changing
+halfway through. Scanned flags are never read again, so the hit rate only
+counts the Zipf reads.
+
+    python benchmarks/cache_hit_rate.py --flags 80000 --size 5000 --requests 200000
+"""
+
+import argparse
+import itertools
+import random
+from collections.abc import Callable, Iterator
+
+from flipper.contrib.cached import EVICTION_POLICIES
+
+
+def zipf(rng: random.Random, flags: int, skew: float, requests: int) -> list[int]:
+    # Ranks are shuffled so that popularity is unrelated to the key's hash.
+    ranks = list(range(flags))
+    rng.shuffle(ranks)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(flags)))
+    return rng.choices(ranks, cum_weights=cum_weights, k=requests)
+
+
+def with_scans(trace: list[int], flags: int, scan_every: int, scan_length: int) -> Iterator[int]:
+    # Scanned flags are outside the skewed set, so none of them is reused.
+    cold = itertools.count(flags)
+    for i, key in enumerate(trace):
+        if i and i % scan_every == 0:
+            yield from itertools.islice(cold, scan_length)
+        yield key
+
+
+def shifting(rng: random.Random, flags: int, skew: float, requests: int) -> list[int]:
+    first = zipf(rng, flags, skew, requests // 2)
+    second = zipf(rng, flags, skew, requests - requests // 2)
+    return first + second
+
+
+def hit_rate(cache_factory: Callable[[int], object], size: int, flags: int, trace: Iterator[int]) -> float:
+    cache = cache_factory(size)
+    hits = misses = 0
+    for key in trace:
+        if key in cache:
+            cache[key]
+            hits += key < flags
+        else:
+            cache[key] = key
+            misses += key < flags
+    return hits / (hits + misses)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flags", type=int, default=80000)
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--skew", type=float, default=0.9)
+    parser.add_argument("--scan-every", type=int, default=25000)
+    parser.add_argument("--scan-length", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = zipf(rng, args.flags, args.skew, args.requests)
+    workloads: dict[str, Callable[[], Iterator[int]]] = {
+        "zipf": lambda: iter(base),
+        "zipf + scans": lambda: with_scans(base, args.flags, args.scan_every, args.scan_length),
+        "shifting zipf": lambda: iter(shifting(random.Random(args.seed), args.flags, args.skew, args.requests)),
+    }
+
+    print(f"{args.flags} flags, cache size {args.size}, {args.requests} requests, skew {args.skew}")
+    print(f"{'workload':<16}" + "".join(f"{policy:>12}" for policy in EVICTION_POLICIES))
+    for workload, trace in workloads.items():
+        rates = [hit_rate(factory, args.size, args.flags, trace()) for factory in EVICTION_POLICIES.values()]
+        print(f"{workload:<16}" + "".join(f"{rate:>12.1%}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Consistent hash bucketing benchmark.
+
+Compares `hash_version` 1 (JSON + SHA-1, 100 buckets) with `hash_version` 2
+(binary encoding + 8-byte BLAKE2b) on speed and on how evenly identities
+spread over buckets, reported as a chi-squared statistic over 100 buckets
+(about 99 is ideal) and as the share enabled at a 0.5% rollout.
+
+    python benchmarks/consistent_hash.py --identities 200000
+"""
+
+import argparse
+import time
+
+from flipper.bucketing import ConsistentHashPercentageBucketer, Percentage
+
+BUCKETS = 100
+
+
+def chi_squared(scores: list[float]) -> float:
+    counts = [0] * BUCKETS
+    for score in scores:
+        # Round before truncating: version 1 scores are exact hundredths.
+        counts[min(int(round(score * BUCKETS, 6)), BUCKETS - 1)] += 1
+    expected = len(scores) / BUCKETS
+    return sum((count - expected) ** 2 / expected for count in counts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--identities", type=int, default=200_000)
+    args = parser.parse_args()
+
+    identities = range(args.identities)
+    for hash_version in (1, 2):
+        bucketer = ConsistentHashPercentageBucketer(
+            key_whitelist=["user_id"],
+            percentage=Percentage(0.005),
+            hash_version=hash_version,
+        )
+
+        started = time.perf_counter()
+        enabled = sum(bucketer.check(user_id=user_id, plan="pro") for user_id in identities)
+        elapsed = time.perf_counter() - started
+
+        scores = [bucketer.score(user_id=user_id) for user_id in identities]
+
+        print(f"hash_version {hash_version}:")
+        print(f"  check:           {elapsed / args.identities * 1e6:.2f} us")
+        print(f"  chi-squared:     {chi_squared(scores):.1f}")
+        print(f"  enabled at 0.5%: {enabled / args.identities:.3%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Evaluate-all benchmark.
+
+Compares calling `FeatureFlagClient.is_enabled` on 1,000 flags one by one
+against `FeatureFlagClient.evaluate_all`, which reuses a `FeatureFlagRuleIndex`
+until the store's flags change, for a single context.
+
+    python benchmarks/evaluate_all.py --flags 1000
+"""
+
+import argparse
+import random
+import timeit
+
+from flipper import Condition, FeatureFlagClient, MemoryFeatureFlagStore
+from flipper.contrib.storage import FeatureFlagStoreMeta
+from flipper.contrib.util.date import now
+
+PLANS = ["free", "starter", "pro", "enterprise"]
+
+
+def make_client(count: int, rng: random.Random) -> FeatureFlagClient:
+    store = MemoryFeatureFlagStore()
+    for i in range(count):
+        conditions = [Condition(is_staff=rng.choice([True, False]))]
+        if rng.random() < 0.7:
+            conditions.append(Condition(plan__in=rng.sample(PLANS, 2)))
+        if rng.random() < 0.3:
+            conditions.append(Condition(seats__gte=rng.choice([5, 10, 50])))
+        store.create(f"flag_{i}", is_enabled=True)
+        store.set_meta(f"flag_{i}", FeatureFlagStoreMeta(now(), conditions=conditions))
+    return FeatureFlagClient(store)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flags", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    client = make_client(args.flags, random.Random(42))
+    names = [flag.name for flag in client.list()]
+    context = {"is_staff": False, "plan": "pro", "seats": 12}
+
+    expected = {name: client.is_enabled(name, **context) for name in names}
+    assert client.evaluate_all(**context) == expected  # noqa: S101
+
+    per_flag = timeit.timeit(lambda: [client.is_enabled(name, **context) for name in names], number=args.repeat)
+    evaluate_all = timeit.timeit(lambda: client.evaluate_all(**context), number=args.repeat)
+
+    print(f"flags:           {args.flags:,}")
+    print(f"distinct checks: {client.rule_index().distinct_check_count:,}")
+    print(f"per-flag:        {per_flag / args.repeat * 1e3:.3f} ms per context")
+    print(f"evaluate_all:    {evaluate_all / args.repeat * 1e3:.3f} ms per context")
+    print(f"speedup:         {per_flag / evaluate_all:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
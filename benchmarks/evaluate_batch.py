@@ -0,0 +1,64 @@
+"""
+Batch evaluation benchmark.
+
+Compares `evaluate_batch` over NumPy columns with calling
+`is_enabled(**row)` for every row of the same data.
+
+    python benchmarks/evaluate_batch.py --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from flipper import Condition
+from flipper.batch import evaluate_batch
+from flipper.bucketing import ConsistentHashPercentageBucketer, Percentage
+from flipper.contrib.storage import FeatureFlagStoreItem, FeatureFlagStoreMeta
+from flipper.contrib.util.date import now
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scalar-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    columns = {
+        "seats": rng.integers(0, 500, args.rows),
+        "plan": rng.choice(np.array(["free", "pro", "enterprise"]), args.rows),
+        "user_id": rng.integers(0, 10_000_000, args.rows),
+    }
+
+    conditional = FeatureFlagStoreItem(
+        "conditional",
+        True,
+        FeatureFlagStoreMeta(now(), conditions=[Condition(seats__gte=10, plan__in=["pro", "enterprise"])]),
+    )
+    bucketed = FeatureFlagStoreItem(
+        "bucketed",
+        True,
+        FeatureFlagStoreMeta(
+            now(),
+            bucketer=ConsistentHashPercentageBucketer(key_whitelist=["user_id"], percentage=Percentage(0.2)),
+        ),
+    )
+
+    for item in (conditional, bucketed):
+        started = time.perf_counter()
+        evaluate_batch(item, columns)
+        batch = time.perf_counter() - started
+
+        rows = zip(*(columns[name][: args.scalar_rows].tolist() for name in columns), strict=True)
+        started = time.perf_counter()
+        for row in rows:
+            item.is_enabled(**dict(zip(columns, row, strict=True)))
+        scalar = (time.perf_counter() - started) * args.rows / args.scalar_rows
+
+        print(f"{item.feature_name}: batch {batch:.2f}s, per-row (extrapolated) {scalar:.2f}s for {args.rows:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Network membership benchmark.
+
+Matches random client addresses against thousands of CIDRs with an
+`in_network` check, and with a plain loop over `ipaddress` networks.
+
+    python benchmarks/in_network.py --networks 5000
+"""
+
+import argparse
+import ipaddress
+import random
+import timeit
+
+from flipper import Condition
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--networks", type=int, default=5000)
+    parser.add_argument("--probes", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    networks = [
+        str(ipaddress.ip_network((rng.getrandbits(32), rng.choice([16, 20, 24, 28])), strict=False))
+        for _ in range(args.networks)
+    ]
+    addresses = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(args.probes)]
+
+    condition = Condition(client_ip__in_network=networks)
+    parsed_networks = [ipaddress.ip_network(network) for network in networks]
+
+    def naive(address: str) -> bool:
+        parsed = ipaddress.ip_address(address)
+        return any(parsed in network for network in parsed_networks)
+
+    naive_probes = max(1, args.probes // 100)
+    agrees = all(condition.check(client_ip=a) == naive(a) for a in addresses[:naive_probes])
+
+    indexed = timeit.timeit(lambda: [condition.check(client_ip=a) for a in addresses], number=1)
+    scanned = timeit.timeit(lambda: [naive(a) for a in addresses[:naive_probes]], number=1)
+
+    print(f"networks:          {args.networks:,}")
+    print(f"in_network lookup: {indexed / args.probes * 1e6:.2f} us")
+    print(f"ipaddress scan:    {scanned / naive_probes * 1e6:.2f} us")
+    print(f"results agree:     {agrees}")
+
+
+if __name__ == "__main__":
+    main()
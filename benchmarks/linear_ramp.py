@@ -0,0 +1,47 @@
+"""
+Linear ramp benchmark.
+
+Reads `LinearRampPercentage.value` with the system clock and with a coarse
+clock, next to the `datetime.now()` arithmetic it used to do on every read.
+
+    python benchmarks/linear_ramp.py --reads 1000000
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timedelta
+
+from flipper.bucketing import LinearRampPercentage
+from flipper.bucketing.percentage import CoarseClock, SystemClock
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reads", type=int, default=1_000_000)
+    parser.add_argument("--resolution", type=float, default=0.01)
+    args = parser.parse_args()
+
+    started = datetime.now() - timedelta(minutes=10)  # noqa: DTZ005
+    initial_time = int(started.timestamp())
+
+    def datetime_value() -> float:
+        slope = (1.0 - 0.0) / 3600
+        dt = (datetime.now() - started).total_seconds()  # noqa: DTZ005
+        return min(1.0, slope * dt + 0.0)
+
+    clocks = {
+        "system clock": SystemClock(),
+        "coarse clock (thread)": CoarseClock(resolution=args.resolution),
+        "coarse clock (counter)": CoarseClock(refresh_every=1000),
+    }
+
+    baseline = timeit.timeit(datetime_value, number=args.reads)
+    print(f"datetime.now():         {baseline / args.reads * 1e9:.0f} ns")
+    for name, clock in clocks.items():
+        percentage = LinearRampPercentage(ramp_duration=3600, initial_time=initial_time, clock=clock)
+        elapsed = timeit.timeit(lambda percentage=percentage: percentage.value, number=args.reads)
+        print(f"{name + ':':<24}{elapsed / args.reads * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@
 from . import decorators
 from .client import FeatureFlagClient
 from .conditions import Condition
+from .context import EvaluationContext
 from .contrib import (
     CachedFeatureFlagStore,
     ConsulFeatureFlagStore,
@@ -29,6 +30,7 @@ __all__ = [
     "CachedFeatureFlagStore",
     "Condition",
     "ConsulFeatureFlagStore",
+    "EvaluationContext",
     "FeatureFlagClient",
     "FlagDoesNotExistError",
     "MemoryFeatureFlagStore",
@@ -0,0 +1,222 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from .bucketing import ConsistentHashPercentageBucketer, NoOpBucketer, PercentageBucketer
+from .bucketing.consistent_hash_percentage_bucketer import LEGACY_HASH_VERSION
+from .conditions.intervals import IntervalSet
+from .conditions.operators.between_operator import BetweenOperator
+from .conditions.operators.equality_operator import EqualityOperator
+from .conditions.operators.greater_than_operator import GreaterThanOperator
+from .conditions.operators.greater_than_or_equal_to_operator import GreaterThanOrEqualToOperator
+from .conditions.operators.less_than_operator import LessThanOperator
+from .conditions.operators.less_than_or_equal_to_operator import LessThanOrEqualToOperator
+from .conditions.operators.negated_between_operator import NegatedBetweenOperator
+from .conditions.operators.negated_set_membership_operator import NegatedSetMembershipOperator
+from .conditions.operators.negation_operator import NegationOperator
+from .conditions.operators.set_membership_operator import SetMembershipOperator
+
+if TYPE_CHECKING:
+    from .conditions.check import Check
+    from .contrib.storage import FeatureFlagStoreItem
+
+NUMPY_ENABLED = False
+try:
+    import numpy as np
+
+    NUMPY_ENABLED = True
+except ModuleNotFoundError:
+    pass
+
+
+class NumpyNotEnabled(Exception):  # noqa: N818
+    def __init__(self) -> None:
+        super().__init__(
+            "NumPy is not enabled, please install extra dependency [numpy]",
+        )
+
+
+def _in_intervals(column: "np.ndarray", value: Any) -> "np.ndarray":
+    intervals = IntervalSet.from_value(value).intervals
+    if not intervals:
+        return np.zeros(len(column), dtype=bool)
+    lows, highs = (np.asarray(bound) for bound in zip(*intervals, strict=True))
+    i = np.searchsorted(lows, column, side="right") - 1
+    return (i >= 0) & (column <= highs[np.maximum(i, 0)])
+
+
+VECTORIZED_OPERATORS: dict[type, Callable[["np.ndarray", Any], "np.ndarray"]] = {
+    EqualityOperator: lambda column, value: column == value,
+    NegationOperator: lambda column, value: column != value,
+    GreaterThanOperator: lambda column, value: column > value,
+    GreaterThanOrEqualToOperator: lambda column, value: column >= value,
+    LessThanOperator: lambda column, value: column < value,
+    LessThanOrEqualToOperator: lambda column, value: column <= value,
+    SetMembershipOperator: lambda column, value: np.isin(column, list(value)),
+    NegatedSetMembershipOperator: lambda column, value: ~np.isin(column, list(value)),
+    BetweenOperator: _in_intervals,
+    NegatedBetweenOperator: lambda column, value: ~_in_intervals(column, value),
+}
+
+
+COLLECTION_OPERATORS = (SetMembershipOperator, NegatedSetMembershipOperator, BetweenOperator, NegatedBetweenOperator)
+
+
+def evaluate_batch(
+    item: "FeatureFlagStoreItem | None",
+    columns: Mapping[str, Any],
+    size: int | None = None,
+    default: bool = False,
+) -> "np.ndarray":
+    """
+    Evaluates a flag for every row of a columnar context, returning a boolean
+    array that matches calling `item.is_enabled(**row)` row by row.
+
+    Comparisons and membership checks run as NumPy expressions over whole
+    columns. Operators without a vectorized form, and the SHA-1 hashing of
+    consistent bucketing, fall back to Python but run once per distinct
+    value rather than once per row. `size` is only needed when `columns` is
+    empty, and `default` fills the result when the flag does not exist.
+    Dotted variables such as `user.plan` are read from the column with that
+    full name, since columnar data is already flat.
+    """
+    if not NUMPY_ENABLED:
+        raise NumpyNotEnabled
+
+    arrays = {name: np.asarray(column) for name, column in columns.items()}
+    size = _row_count(arrays, size)
+
+    if item is None:
+        return np.full(size, default, dtype=bool)
+
+    if item.raw_is_enabled is False:
+        return np.zeros(size, dtype=bool)
+
+    if arrays and item.conditions:
+        return _evaluate_conditions(item, arrays, size)
+
+    bucketer = item.bucketer
+    if bucketer.get_type() == NoOpBucketer.get_type():
+        return np.ones(size, dtype=bool)
+    return _evaluate_bucketer(bucketer, arrays, size)
+
+
+def _row_count(arrays: Mapping[str, "np.ndarray"], size: int | None) -> int:
+    lengths = {len(array) for array in arrays.values()}
+    if len(lengths) > 1:
+        msg = "All columns must have the same length"
+        raise ValueError(msg)
+    if lengths:
+        return lengths.pop()
+    if size is None:
+        msg = "size is required when no columns are given"
+        raise ValueError(msg)
+    return size
+
+
+def _evaluate_conditions(item: "FeatureFlagStoreItem", arrays: Mapping[str, "np.ndarray"], size: int) -> "np.ndarray":
+    result = np.ones(size, dtype=bool)
+    for condition in item.conditions:
+        for check in condition.iter_checks():
+            column = arrays.get(check.variable)
+            if column is not None:
+                result &= _evaluate_check(check, column)
+    return result
+
+
+def _evaluate_check(check: "Check", column: "np.ndarray") -> "np.ndarray":
+    vectorized = VECTORIZED_OPERATORS.get(type(check.operator))
+    if vectorized is not None and _can_vectorize(check, column):
+        return np.asarray(vectorized(column, check.value), dtype=bool)
+    return _map_distinct(column, lambda value: check.check(value) is not False)
+
+
+def _can_vectorize(check: "Check", column: "np.ndarray") -> bool:
+    # Collections on either side of a plain comparison would broadcast, and
+    # `in` against a string is a substring test; both stay on the scalar path.
+    # Typed checks coerce each context value, which NumPy cannot do for them.
+    if check.value_type is not None:
+        return False
+    if isinstance(check.operator, COLLECTION_OPERATORS):
+        if not isinstance(check.value, list | tuple | set | frozenset):
+            return False
+        # np.isin casts numbers and strings to a common string type, so 1
+        # could match "1"; only compare values with a column of their kind.
+        if isinstance(check.operator, SetMembershipOperator | NegatedSetMembershipOperator):
+            return _same_kind(check.value, column)
+        return True
+    return isinstance(check.value, bool | int | float | str)
+
+
+def _same_kind(values: Any, column: "np.ndarray") -> bool:
+    if all(isinstance(value, str) for value in values):
+        return column.dtype.kind in "US"
+    if all(isinstance(value, bool | int | float) for value in values):
+        return column.dtype.kind in "biuf"
+    return False
+
+
+def _evaluate_bucketer(bucketer: Any, arrays: Mapping[str, "np.ndarray"], size: int) -> "np.ndarray":
+    if isinstance(bucketer, ConsistentHashPercentageBucketer):
+        return _evaluate_consistent_hash_bucketer(bucketer, arrays, size)
+
+    if type(bucketer) is PercentageBucketer:
+        if bucketer.percentage == 0:
+            return np.zeros(size, dtype=bool)
+        return np.random.default_rng().random(size) <= bucketer.percentage
+
+    if not arrays:
+        return np.fromiter((bucketer.check() for _ in range(size)), dtype=bool, count=size)
+    names = list(arrays)
+    rows = zip(*(arrays[name].tolist() for name in names), strict=True)
+    return np.fromiter((bucketer.check(**dict(zip(names, row, strict=True))) for row in rows), dtype=bool, count=size)
+
+
+def _evaluate_consistent_hash_bucketer(
+    bucketer: ConsistentHashPercentageBucketer,
+    arrays: Mapping[str, "np.ndarray"],
+    size: int,
+) -> "np.ndarray":
+    if bucketer.percentage == 0:
+        return np.zeros(size, dtype=bool)
+
+    whitelist = bucketer.key_whitelist
+    names = sorted(name for name in arrays if not whitelist or name in whitelist)
+    if not names:
+        return np.full(size, bucketer.check(), dtype=bool)
+
+    rows = list(zip(*(arrays[name].tolist() for name in names), strict=True))
+    scores = _map_distinct_rows(rows, lambda row: bucketer.score(**dict(zip(names, row, strict=True))))
+    if bucketer.hash_version == LEGACY_HASH_VERSION:
+        return scores <= bucketer.percentage
+    return scores < bucketer.percentage
+
+
+def _map_distinct(column: "np.ndarray", fn: Callable[[Any], Any]) -> "np.ndarray":
+    return _map_distinct_rows(column.tolist(), fn).astype(bool)
+
+
+def _map_distinct_rows(rows: list, fn: Callable[[Any], Any]) -> "np.ndarray":
+    cache: dict = {}
+    results = []
+    for row in rows:
+        try:
+            result = cache[row]
+        except KeyError:
+            result = cache[row] = fn(row)
+        except TypeError:
+            result = fn(row)
+        results.append(result)
+    return np.asarray(results)
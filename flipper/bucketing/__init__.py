@@ -16,6 +16,7 @@ from .factory import BucketerFactory
 from .noop_bucketer import NoOpBucketer
 from .percentage import LinearRampPercentage, Percentage, PercentageFactory
 from .percentage_bucketer import PercentageBucketer
+from .variant_bucketer import VariantBucketer
 
 __all__ = [
     "BucketerFactory",
@@ -25,4 +26,5 @@ __all__ = [
     "Percentage",
     "PercentageBucketer",
     "PercentageFactory",
+    "VariantBucketer",
 ]
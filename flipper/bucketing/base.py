@@ -12,6 +12,7 @@
 # language governing permissions and limitations under the License.
 
 from abc import ABCMeta, abstractmethod
+from collections.abc import Mapping
 from typing import Any
 
 
@@ -20,6 +21,14 @@ class AbstractBucketer(metaclass=ABCMeta):
     def check(self, **checks) -> bool:  # noqa: ANN003
         pass
 
+    def check_context(self, context: Mapping[str, Any]) -> bool:
+        """
+        Same as `check`, for a context given as a mapping. Bucketers that
+        only read some of the context override this so that the rest is never
+        resolved; this default reads every value.
+        """
+        return self.check(**context)
+
     @staticmethod
     @abstractmethod
     def get_type() -> str:
@@ -13,44 +13,108 @@
 
 import hashlib
 import json
+from collections.abc import Mapping
 from typing import Any
 
+from .hashing import DIGEST_RANGE, identity_digest, mix, salt_key
 from .percentage import PercentageFactory
 from .percentage_bucketer import PercentageBucketer
 
+LEGACY_HASH_VERSION = 1
+BINARY_HASH_VERSION = 2
+HASH_VERSIONS = (LEGACY_HASH_VERSION, BINARY_HASH_VERSION)
+
 
 class ConsistentHashPercentageBucketer(PercentageBucketer):
+    """
+    Assigns a stable bucket to each identity (the whitelisted context values)
+    and enables the flag for identities whose bucket falls below the
+    percentage.
+
+    `hash_version` 1 hashes the JSON-encoded identity with SHA-1 into one of
+    100 buckets and is kept for existing flags, whose assignments it
+    reproduces exactly. `hash_version` 2 hashes a canonical binary encoding
+    with an 8-byte BLAKE2b digest, which is faster, accepts UUIDs, dates and
+    decimals, and resolves buckets to 2**-64 instead of 1%.
+
+    With version 2 a `salt` (typically the flag's name) gives each flag its
+    own assignment, so the same users are not first in every rollout. The
+    identity digest does not depend on the salt; it is computed once per
+    evaluation context and mixed with each flag's salt.
+    """
+
     def __init__(self, **kwargs) -> None:  # noqa: ANN003
         self._key_whitelist = set(kwargs.pop("key_whitelist", []))
+        self._hash_version = kwargs.pop("hash_version", LEGACY_HASH_VERSION)
+        self._salt = kwargs.pop("salt", None)
+        if self._hash_version not in HASH_VERSIONS:
+            msg = f"Hash version not supported: {self._hash_version}"
+            raise ValueError(msg)
+        if self._salt is not None and self._hash_version == LEGACY_HASH_VERSION:
+            msg = f"salt requires hash_version {BINARY_HASH_VERSION}"
+            raise ValueError(msg)
+        self._salt_key = salt_key(self._salt) if self._salt is not None else None
+        self._frozen_whitelist = frozenset(self._key_whitelist)
         super().__init__(**kwargs)
 
     @classmethod
     def get_type(cls) -> str:
         return "ConsistentHashPercentageBucketer"
 
+    @property
+    def key_whitelist(self) -> frozenset[str]:
+        return self._frozen_whitelist
+
+    @property
+    def hash_version(self) -> int:
+        return self._hash_version
+
+    @property
+    def salt(self) -> str | None:
+        return self._salt
+
     def check(self, randomizer=None, **checks) -> bool:  # noqa: ANN001, ANN003, ARG002
-        if self._percentage == 0:
+        return self.check_context(checks)
+
+    def check_context(self, context: Mapping[str, Any]) -> bool:
+        percentage = self._percentage.value
+        if percentage == 0:
             return False
 
-        serialized = self._serialize_checks(checks)
+        score = self.score_context(context)
+        if self._hash_version == LEGACY_HASH_VERSION:
+            return score <= percentage
+        # Scores lie in [0, 1), so a strict bound makes 1.0 include everyone.
+        return score < percentage
 
-        hashed = hashlib.sha1(serialized)  # nosec  # noqa: S324
-        score = self._score_hash(hashed)
+    def score(self, **checks) -> float:  # noqa: ANN003
+        return self.score_context(checks)
+
+    def score_context(self, context: Mapping[str, Any]) -> float:
+        if self._hash_version == LEGACY_HASH_VERSION:
+            return self._legacy_score(context)
+
+        score = identity_digest(context, self._frozen_whitelist)
+        if self._salt_key is not None:
+            score = mix(score, self._salt_key)
+        return score / DIGEST_RANGE
 
-        return score <= self._percentage
+    def _legacy_score(self, context: Mapping[str, Any]) -> float:
+        serialized = self._serialize_checks(context)
 
-    def _serialize_checks(self, checks: dict[str, Any]) -> bytes:
+        hashed = hashlib.sha1(serialized)  # nosec  # noqa: S324
+        return self._score_hash(hashed)
+
+    def _serialize_checks(self, checks: Mapping[str, Any]) -> bytes:
         filtered_checks = self._filter_checks(checks)
         sorted_checks = self._sort_checks(filtered_checks)
         return json.dumps(sorted_checks).encode("utf-8")
 
-    def _filter_checks(self, checks: dict[str, Any]) -> dict[str, Any]:
-        return {k: v for (k, v) in checks.items() if self._should_check_key(k)}
-
-    def _should_check_key(self, key: str) -> bool:
+    def _filter_checks(self, checks: Mapping[str, Any]) -> dict[str, Any]:
+        # Only whitelisted keys are read, so other lazy values stay unresolved.
         if len(self._key_whitelist) == 0:
-            return True
-        return key in self._key_whitelist
+            return {k: checks[k] for k in checks}
+        return {k: checks[k] for k in self._key_whitelist if k in checks}
 
     def _sort_checks(self, checks: dict[str, Any]) -> list[tuple[str, Any]]:
         return sorted(checks.items(), key=lambda x: x[0])
@@ -63,6 +127,8 @@ class ConsistentHashPercentageBucketer(PercentageBucketer):
             **super().to_dict(),
             "type": ConsistentHashPercentageBucketer.get_type(),
             "key_whitelist": list(self._key_whitelist),
+            "hash_version": self._hash_version,
+            "salt": self._salt,
         }
 
     @classmethod
@@ -72,4 +138,9 @@ class ConsistentHashPercentageBucketer(PercentageBucketer):
         percentage = None
         if percentage_fields is not None:
             percentage = PercentageFactory.create(percentage_fields)
-        return cls(key_whitelist=key_whitelist, percentage=percentage)
+        return cls(
+            key_whitelist=key_whitelist,
+            percentage=percentage,
+            hash_version=fields.get("hash_version", LEGACY_HASH_VERSION),
+            salt=fields.get("salt"),
+        )
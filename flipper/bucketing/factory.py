@@ -17,6 +17,7 @@ from .base import AbstractBucketer
 from .consistent_hash_percentage_bucketer import ConsistentHashPercentageBucketer
 from .noop_bucketer import NoOpBucketer
 from .percentage_bucketer import PercentageBucketer
+from .variant_bucketer import VariantBucketer
 
 
 class BucketerFactory:
@@ -24,6 +25,7 @@ class BucketerFactory:
         ConsistentHashPercentageBucketer.get_type(): ConsistentHashPercentageBucketer,
         NoOpBucketer.get_type(): NoOpBucketer,
         PercentageBucketer.get_type(): PercentageBucketer,
+        VariantBucketer.get_type(): VariantBucketer,
     }
 
     class InvalidBucketerTypeError(Exception):
@@ -0,0 +1,193 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import struct
+from collections.abc import Callable, Iterable, Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from hashlib import blake2b
+from typing import Any
+from uuid import UUID
+
+from flipper.context import EvaluationContext
+
+DIGEST_SIZE = 8
+DIGEST_RANGE = 2 ** (DIGEST_SIZE * 8)
+
+_MASK = DIGEST_RANGE - 1
+
+
+def encode_identity(items: Iterable[tuple[str, Any]]) -> bytes:
+    """
+    Canonical binary encoding of identity values, sorted by key. Every value
+    is tagged with its type and length-prefixed, so `1`, `1.0`, `True` and
+    `"1"` all encode differently and no two distinct identities can collide
+    through concatenation. Unlike JSON, UUIDs, dates and decimals encode
+    natively.
+    """
+    out = bytearray()
+    # Keys are unique, so sorting the pairs never compares values.
+    for key, value in sorted(items):
+        _encode_bytes(out, b"k", key.encode("utf-8"))
+        _encode_value(out, value)
+    return bytes(out)
+
+
+def digest(payload: bytes) -> int:
+    return int.from_bytes(blake2b(payload, digest_size=DIGEST_SIZE).digest(), "big")
+
+
+def identity_digest(context: Mapping[str, Any], key_whitelist: frozenset[str]) -> int:
+    """
+    Digest of the whitelisted context values, or of every value when the
+    whitelist is empty. On an `EvaluationContext` it is computed once and
+    shared by every bucketer with the same whitelist.
+    """
+    if not isinstance(context, EvaluationContext):
+        return digest(encode_identity(_identity_items(context, key_whitelist)))
+
+    cache_key = ("identity", key_whitelist)
+    cached = context.cache.get(cache_key)
+    if cached is None:
+        cached = context.cache[cache_key] = digest(encode_identity(_identity_items(context, key_whitelist)))
+    return cached
+
+
+def salt_key(salt: str) -> int:
+    return digest(salt.encode("utf-8"))
+
+
+def mix(identity_digest: int, key: int) -> int:
+    """
+    Derives a per-salt digest from an identity digest with the SplitMix64
+    finalizer: a few integer operations instead of another hash, with every
+    input bit affecting every output bit, so buckets under different salts
+    are independent.
+    """
+    value = ((identity_digest ^ key) + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def _identity_items(context: Mapping[str, Any], key_whitelist: frozenset[str]) -> list[tuple[str, Any]]:
+    # Only whitelisted keys are read, so other lazy values stay unresolved.
+    if not key_whitelist:
+        return [(k, context[k]) for k in context]
+    return [(k, context[k]) for k in key_whitelist if k in context]
+
+
+def _encode_value(out: bytearray, value: Any) -> None:
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        encoder = _find_encoder(value)
+    encoder(out, value)
+
+
+def _find_encoder(value: Any) -> Callable[[bytearray, Any], None]:
+    # Subclasses (an IntEnum, a str subclass, ...) encode like their base.
+    for base, encoder in _ENCODERS.items():
+        if isinstance(value, base):
+            return encoder
+    msg = f"Cannot hash identity value of type {type(value).__name__}"
+    raise TypeError(msg)
+
+
+def _encode_bytes(out: bytearray, tag: bytes, payload: bytes) -> None:
+    out += tag
+    out += _pack_length(len(payload))
+    out += payload
+
+
+def _encode_none(out: bytearray, value: None) -> None:  # noqa: ARG001
+    out += b"n"
+
+
+def _encode_bool(out: bytearray, value: bool) -> None:
+    out += b"t" if value else b"f"
+
+
+def _encode_int(out: bytearray, value: int) -> None:
+    _encode_bytes(out, b"i", str(int(value)).encode("ascii"))
+
+
+def _encode_float(out: bytearray, value: float) -> None:
+    out += b"d"
+    out += _pack_float(value)
+
+
+def _encode_str(out: bytearray, value: str) -> None:
+    _encode_bytes(out, b"s", value.encode("utf-8"))
+
+
+def _encode_raw_bytes(out: bytearray, value: bytes) -> None:
+    _encode_bytes(out, b"b", bytes(value))
+
+
+def _encode_uuid(out: bytearray, value: UUID) -> None:
+    out += b"u"
+    out += value.bytes
+
+
+def _encode_datetime(out: bytearray, value: datetime) -> None:
+    _encode_bytes(out, b"T", value.isoformat().encode("ascii"))
+
+
+def _encode_date(out: bytearray, value: date) -> None:
+    _encode_bytes(out, b"D", value.isoformat().encode("ascii"))
+
+
+def _encode_time(out: bytearray, value: time) -> None:
+    _encode_bytes(out, b"H", value.isoformat().encode("ascii"))
+
+
+def _encode_decimal(out: bytearray, value: Decimal) -> None:
+    _encode_bytes(out, b"m", str(value).encode("ascii"))
+
+
+def _encode_sequence(out: bytearray, value: list | tuple) -> None:
+    out += b"l"
+    out += _pack_length(len(value))
+    for element in value:
+        _encode_value(out, element)
+
+
+def _encode_mapping(out: bytearray, value: Mapping) -> None:
+    out += b"o"
+    out += _pack_length(len(value))
+    for key in sorted(value):
+        _encode_value(out, key)
+        _encode_value(out, value[key])
+
+
+_pack_length = struct.Struct(">I").pack
+_pack_float = struct.Struct(">d").pack
+
+# Order matters for subclasses: bool before int, datetime before date.
+_ENCODERS: dict[type, Callable[[bytearray, Any], None]] = {
+    type(None): _encode_none,
+    bool: _encode_bool,
+    int: _encode_int,
+    float: _encode_float,
+    str: _encode_str,
+    bytes: _encode_raw_bytes,
+    UUID: _encode_uuid,
+    datetime: _encode_datetime,
+    date: _encode_date,
+    time: _encode_time,
+    Decimal: _encode_decimal,
+    list: _encode_sequence,
+    tuple: _encode_sequence,
+    dict: _encode_mapping,
+    Mapping: _encode_mapping,
+}
@@ -11,6 +11,7 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+from collections.abc import Mapping
 from typing import Any
 
 from .base import AbstractBucketer
@@ -24,6 +25,9 @@ class NoOpBucketer(AbstractBucketer):
     def check(self, **checks) -> bool:  # noqa: ANN003, ARG002
         return True
 
+    def check_context(self, context: Mapping[str, Any]) -> bool:  # noqa: ARG002
+        return True
+
     def to_dict(self) -> dict[str, Any]:
         return super().to_dict()
 
@@ -12,13 +12,20 @@
 # language governing permissions and limitations under the License.
 
 from .base import AbstractPercentage
+from .clock import Clock, CoarseClock, FakeClock, SystemClock, get_default_clock, set_default_clock
 from .factory import PercentageFactory
 from .linear_ramp_percentage import LinearRampPercentage
 from .percentage import Percentage
 
 __all__ = [
     "AbstractPercentage",
+    "Clock",
+    "CoarseClock",
+    "FakeClock",
     "LinearRampPercentage",
     "Percentage",
     "PercentageFactory",
+    "SystemClock",
+    "get_default_clock",
+    "set_default_clock",
 ]
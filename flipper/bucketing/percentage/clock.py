@@ -0,0 +1,148 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import os
+import threading
+import time
+import weakref
+from abc import ABCMeta, abstractmethod
+
+
+class Clock(metaclass=ABCMeta):
+    """
+    Source of the current time, in seconds since the epoch, for percentages
+    that change over time.
+    """
+
+    @abstractmethod
+    def now(self) -> float:
+        pass
+
+
+class SystemClock(Clock):
+    def now(self) -> float:
+        return time.time()
+
+
+class CoarseClock(Clock):
+    """
+    Clock that reads the system time at most once per `resolution` seconds
+    and returns the cached reading in between.
+
+    By default a daemon thread, started on the first read, refreshes the
+    reading; `close` stops it, and a later read starts it again. A forked
+    child starts its own thread on its first read. With `refresh_every` set,
+    no thread is started and the reading is refreshed on every
+    `refresh_every`-th call instead, which bounds staleness by call count
+    rather than by time.
+    """
+
+    def __init__(self, resolution: float = 0.01, refresh_every: int | None = None) -> None:
+        self._resolution = resolution
+        self._refresh_every = refresh_every
+        self._calls = refresh_every or 0
+        self._now = time.time()
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        _clocks.add(self)
+
+    @property
+    def resolution(self) -> float:
+        return self._resolution
+
+    def now(self) -> float:
+        if self._refresh_every is not None:
+            self._calls -= 1
+            if self._calls <= 0:
+                self._calls = self._refresh_every
+                self._now = time.time()
+        elif self._thread is None:
+            self._start()
+        return self._now
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopped.set()
+        if thread is not None:
+            thread.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._now = time.time()
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(
+                target=self._refresh, args=(self._stopped,), name="flipper-coarse-clock", daemon=True
+            )
+            self._thread.start()
+
+    def _refresh(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self._resolution):
+            self._now = time.time()
+
+    def _after_fork(self) -> None:
+        # The parent's refresh thread does not exist in the child, and the
+        # lock may have been held at the time of the fork.
+        self._lock = threading.Lock()
+        self._thread = None
+        self._now = time.time()
+
+
+_clocks: "weakref.WeakSet[CoarseClock]" = weakref.WeakSet()
+
+
+def _reset_clocks_after_fork() -> None:
+    for clock in list(_clocks):
+        clock._after_fork()  # noqa: SLF001
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clocks_after_fork)
+
+
+class FakeClock(Clock):
+    """
+    Clock that only moves when told to, for tests.
+    """
+
+    def __init__(self, now: float = 0.0) -> None:
+        self._now = float(now)
+
+    def now(self) -> float:
+        return self._now
+
+    def set(self, now: float) -> None:
+        self._now = float(now)
+
+    def advance(self, seconds: float) -> None:
+        self._now += seconds
+
+
+_default_clock: Clock = SystemClock()
+
+
+def get_default_clock() -> Clock:
+    return _default_clock
+
+
+def set_default_clock(clock: Clock) -> Clock:
+    """
+    Sets the clock used by percentages created without one, including those
+    that already exist, and returns the previous clock so it can be restored.
+    """
+    global _default_clock
+    previous, _default_clock = _default_clock, clock
+    return previous
@@ -11,27 +11,39 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
-from datetime import datetime
 from typing import Any, cast
 
 from .base import AbstractPercentage
+from .clock import Clock, get_default_clock
 
 
 class LinearRampPercentage(AbstractPercentage):
+    """
+    Percentage that moves linearly from `initial_value` to `final_value` over
+    `ramp_duration` seconds starting at `initial_time`.
+
+    The slope and start time are kept as floats, so reading `value` is a clock
+    read and a few float operations. Without a `clock`, the process-wide
+    default from `set_default_clock` is used.
+    """
+
     def __init__(
         self,
         initial_value: float = 0.0,
         final_value: float = 1.0,
         ramp_duration: int = 3600,
         initial_time: int | None = None,
+        clock: Clock | None = None,
     ) -> None:
         self._initial_value = initial_value
         self._final_value = final_value
         self._ramp_duration = ramp_duration
+        self._clock = clock
+        self._slope = (final_value - initial_value) / ramp_duration if ramp_duration else 0.0
         if initial_time is None:
-            self._initial_time = datetime.now()  # noqa: DTZ005
+            self._initial_time = self._now()
         else:
-            self._initial_time = datetime.fromtimestamp(initial_time)  # noqa: DTZ006
+            self._initial_time = float(initial_time)
 
     @classmethod
     def get_type(cls) -> str:
@@ -41,15 +53,19 @@ class LinearRampPercentage(AbstractPercentage):
     def value(self) -> float:
         if self._ramp_duration == 0:
             return self._final_value
-        return min(self._final_value, self.slope * self.dt + self._initial_value)
+        now = (self._clock or get_default_clock()).now()
+        return min(self._final_value, self._slope * (now - self._initial_time) + self._initial_value)
 
     @property
     def slope(self) -> float:
-        return (self._final_value - self._initial_value) / self._ramp_duration
+        return self._slope
 
     @property
     def dt(self) -> float:
-        return (datetime.now() - self._initial_time).total_seconds()  # noqa: DTZ005
+        return self._now() - self._initial_time
+
+    def _now(self) -> float:
+        return (self._clock or get_default_clock()).now()
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -57,7 +73,7 @@ class LinearRampPercentage(AbstractPercentage):
             "initial_value": self._initial_value,
             "final_value": self._final_value,
             "ramp_duration": self._ramp_duration,
-            "initial_time": int(self._initial_time.timestamp()),
+            "initial_time": int(self._initial_time),
         }
 
     @classmethod
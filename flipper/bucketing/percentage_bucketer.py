@@ -12,6 +12,7 @@
 # language governing permissions and limitations under the License.
 
 import random
+from collections.abc import Mapping
 from typing import Any
 
 from .base import AbstractBucketer
@@ -35,6 +36,9 @@ class PercentageBucketer(AbstractBucketer):
             return False
         return randomizer() <= self._percentage
 
+    def check_context(self, context: Mapping[str, Any]) -> bool:  # noqa: ARG002
+        return self.check()
+
     def to_dict(self) -> dict[str, Any]:
         return {**super().to_dict(), "percentage": self._percentage.to_dict()}
 
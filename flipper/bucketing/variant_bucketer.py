@@ -0,0 +1,112 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import itertools
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from .base import AbstractBucketer
+from .hashing import DIGEST_RANGE, identity_digest, mix, salt_key
+
+# Weights are floats, so allow for rounding in sums like 0.1 + 0.2 + 0.7.
+_WEIGHT_TOLERANCE = 1e-9
+
+
+class VariantBucketer(AbstractBucketer):
+    """
+    Assigns each identity (the whitelisted context values) to at most one of
+    several named variants, for A/B/n experiments.
+
+    `variants` maps names to weights, the fraction of identities each one
+    receives. Weights must add up to at most 1; identities in the remainder
+    get no variant and the flag is off for them. The identity is hashed once,
+    as with version 2 of `ConsistentHashPercentageBucketer`, and its score is
+    looked up in a cumulative weight table, so variants never overlap and
+    adding arms costs nothing per evaluation. Pass a `salt` (typically the
+    flag's name) so that experiments do not share assignments.
+    """
+
+    def __init__(
+        self,
+        variants: Mapping[str, float] | None = None,
+        key_whitelist: Iterable[str] = (),
+        salt: str | None = None,
+    ) -> None:
+        variants = dict(variants or {})
+        if any(weight < 0 for weight in variants.values()):
+            msg = "Variant weights must not be negative"
+            raise ValueError(msg)
+        if sum(variants.values()) > 1 + _WEIGHT_TOLERANCE:
+            msg = "Variant weights must add up to at most 1"
+            raise ValueError(msg)
+
+        self._variants = variants
+        self._names = list(variants)
+        self._cumulative = list(itertools.accumulate(variants.values()))
+        self._key_whitelist = frozenset(key_whitelist)
+        self._salt = salt
+        self._salt_key = salt_key(salt) if salt is not None else None
+
+    @classmethod
+    def get_type(cls) -> str:
+        return "VariantBucketer"
+
+    @property
+    def variants(self) -> dict[str, float]:
+        return dict(self._variants)
+
+    @property
+    def key_whitelist(self) -> frozenset[str]:
+        return self._key_whitelist
+
+    @property
+    def salt(self) -> str | None:
+        return self._salt
+
+    def check(self, **checks) -> bool:  # noqa: ANN003
+        return self.check_context(checks)
+
+    def check_context(self, context: Mapping[str, Any]) -> bool:
+        return self.variant_context(context) is not None
+
+    def variant(self, **checks) -> str | None:  # noqa: ANN003
+        return self.variant_context(checks)
+
+    def variant_context(self, context: Mapping[str, Any]) -> str | None:
+        i = bisect_right(self._cumulative, self.score_context(context))
+        if i < len(self._names):
+            return self._names[i]
+        return None
+
+    def score_context(self, context: Mapping[str, Any]) -> float:
+        score = identity_digest(context, self._key_whitelist)
+        if self._salt_key is not None:
+            score = mix(score, self._salt_key)
+        return score / DIGEST_RANGE
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **super().to_dict(),
+            "variants": [{"name": name, "weight": weight} for name, weight in self._variants.items()],
+            "key_whitelist": sorted(self._key_whitelist),
+            "salt": self._salt,
+        }
+
+    @classmethod
+    def from_dict(cls, fields: dict[str, Any]) -> "VariantBucketer":
+        return cls(
+            variants={variant["name"]: variant["weight"] for variant in fields.get("variants", [])},
+            key_whitelist=fields.get("key_whitelist", []),
+            salt=fields.get("salt"),
+        )
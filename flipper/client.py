@@ -11,17 +11,21 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
-from collections.abc import Iterable, Iterator
-from typing import cast
+from collections.abc import Iterable, Iterator, Mapping
+from typing import TYPE_CHECKING, Any, cast
 
+from .batch import evaluate_batch
 from .bucketing.base import AbstractBucketer
 from .conditions import Condition
 from .contrib.interface import AbstractFeatureFlagStore
-from .contrib.storage import FeatureFlagStoreItem, FeatureFlagStoreMeta
+from .contrib.storage import FeatureFlagRuleIndex, FeatureFlagStoreItem, FeatureFlagStoreMeta
 from .events import EventType, FlipperEventEmitter, IEventEmitter
 from .exceptions import FlagDoesNotExistError
 from .flag import FeatureFlag
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 def flag_must_exist(fn):  # noqa: ANN001, ANN201
     def wrapper(self, feature_name: str, *args, **kwargs):  # noqa: ANN001, ANN002, ANN003, ANN202
@@ -36,6 +40,8 @@ class FeatureFlagClient:
     def __init__(self, store: AbstractFeatureFlagStore) -> None:
         self._store = store
         self._event_emitter = FlipperEventEmitter()  # type: IEventEmitter
+        # The last rule index, with the items it was built from.
+        self._rule_index: tuple[list[FeatureFlagStoreItem], FeatureFlagRuleIndex] | None = None
 
     def get_events(self) -> IEventEmitter:
         return self._event_emitter
@@ -75,6 +81,68 @@ class FeatureFlagClient:
             return default
         return item.is_enabled(**conditions)
 
+    def is_enabled_context(self, feature_name: str, context: Mapping[str, Any], default: bool = False) -> bool:
+        """
+        Same as `is_enabled`, for a context given as a mapping, such as a lazy
+        mapping that loads values on demand. Only values the flag reads are
+        looked up.
+        """
+        item = self._store.get(feature_name)
+        if item is None:
+            return default
+        return item.is_enabled_context(context)
+
+    def get_variant(self, feature_name: str, default: str | None = None, **conditions) -> str | None:  # noqa: ANN003
+        """
+        Returns the variant of the flag's `VariantBucketer` assigned to the
+        context, or `default` when the flag does not exist or assigns none.
+        """
+        item = self._store.get(feature_name)
+        if item is None:
+            return default
+        variant = item.get_variant(**conditions)
+        return default if variant is None else variant
+
+    def evaluate_batch(
+        self,
+        feature_name: str,
+        columns: Mapping[str, Any],
+        default: bool = False,
+    ) -> "np.ndarray":
+        """
+        Evaluates one flag for many contexts given as columns (for example
+        NumPy arrays or DataFrame columns), returning a boolean array with one
+        entry per row. Requires the [numpy] extra.
+        """
+        return evaluate_batch(self._store.get(feature_name), columns, default=default)
+
+    def rule_index(self) -> FeatureFlagRuleIndex:
+        """
+        Index of the flags currently in the store. Stores replace an item
+        whenever its flag is written, so the last index is reused for as long
+        as the store lists the very same items.
+        """
+        items = list(self._store.list())
+        cached = self._rule_index
+        if cached is not None:
+            indexed, index = cached
+            if len(items) == len(indexed) and all(item is other for item, other in zip(items, indexed, strict=True)):
+                return index
+        index = FeatureFlagRuleIndex(items)
+        self._rule_index = (items, index)
+        return index
+
+    def evaluate_all(self, **conditions) -> dict[str, bool]:  # noqa: ANN003
+        """
+        Evaluates every flag in the store against one context. Checks shared by
+        several flags run once, and the index is reused until the store's flags
+        change.
+        """
+        return self.rule_index().evaluate(**conditions)
+
+    def evaluate_all_context(self, context: Mapping[str, Any]) -> dict[str, bool]:
+        return self.rule_index().evaluate_context(context)
+
     def exists(self, feature_name: str):  # noqa: ANN201
         return self._store.get(feature_name) is not None
 
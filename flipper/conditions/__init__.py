@@ -11,6 +11,8 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+from .bloom import BloomFilter
+from .compiled import AdaptiveOrdering, CompiledConditions
 from .condition import Condition
 
-__all__ = ["Condition"]
+__all__ = ["AdaptiveOrdering", "BloomFilter", "CompiledConditions", "Condition"]
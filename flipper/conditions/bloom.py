@@ -0,0 +1,136 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import base64
+import hashlib
+import math
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+_MASK_64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set used by the `in_bloom` condition operator.
+
+    Members are normalized with `str()` before hashing, so `42` and `"42"` are
+    the same member. Lookups never produce false negatives; false positives
+    happen at roughly the rate the filter was sized for.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: bytearray | None = None) -> None:
+        if num_bits <= 0 or num_hashes <= 0:
+            msg = "num_bits and num_hashes must be positive"
+            raise ValueError(msg)
+        self._num_bits = num_bits
+        self._num_hashes = num_hashes
+        self._bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(
+        cls,
+        capacity: int,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ) -> "BloomFilter":
+        if not 0 < false_positive_rate < 1:
+            msg = "false_positive_rate must be between 0 and 1"
+            raise ValueError(msg)
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @classmethod
+    def from_iterable(
+        cls,
+        members: Iterable[Any],
+        capacity: int,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ) -> "BloomFilter":
+        bloom = cls.for_capacity(capacity, false_positive_rate)
+        for member in members:
+            bloom.add(member)
+        return bloom
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | Path,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+        capacity: int | None = None,
+    ) -> "BloomFilter":
+        """
+        Builds a filter from a file with one member per line. The file is
+        streamed, never loaded whole; when `capacity` is not given it is read
+        twice, once to count members and once to add them.
+        """
+        path = Path(path)
+        if capacity is None:
+            capacity = sum(1 for _ in _iter_lines(path))
+        return cls.from_iterable(_iter_lines(path), capacity, false_positive_rate)
+
+    @property
+    def num_bits(self) -> int:
+        return self._num_bits
+
+    @property
+    def num_hashes(self) -> int:
+        return self._num_hashes
+
+    @property
+    def size_in_bytes(self) -> int:
+        return len(self._bits)
+
+    def add(self, member: Any) -> None:
+        bits = self._bits
+        for position in self._positions(member):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, member: Any) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(member))
+
+    def _positions(self, member: Any) -> list[int]:
+        # Kirsch-Mitzenmacher double hashing: one digest yields all k positions.
+        digest = hashlib.blake2b(str(member).encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self._num_bits
+        return [((h1 + i * h2) & _MASK_64) % num_bits for i in range(self._num_hashes)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "num_bits": self._num_bits,
+            "num_hashes": self._num_hashes,
+            "bits": base64.b64encode(bytes(self._bits)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, fields: dict[str, Any]) -> "BloomFilter":
+        return cls(
+            fields["num_bits"],
+            fields["num_hashes"],
+            bytearray(base64.b64decode(fields["bits"])),
+        )
+
+
+def _iter_lines(path: Path) -> Iterator[str]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            member = line.strip()
+            if member:
+                yield member
@@ -12,39 +12,123 @@
 # language governing permissions and limitations under the License.
 
 import contextlib
+from collections.abc import Mapping
 from typing import Any
 
+from .bloom import BloomFilter
 from .operators import Operator
 from .operators.interface import AbstractOperator
+from .operators.set_intersection_operator import SetIntersectionOperator, as_members
+from .paths import PATH_ERRORS, compile_path, split_variable
+from .value_types import ValueType, get_value_type, infer_value_type
 
 OPERATOR_DELIMITER = "__"
 
 
 class Check:
-    def __init__(self, variable: str, value: Any, operator: AbstractOperator) -> None:
+    def __init__(
+        self,
+        variable: str,
+        value: Any,
+        operator: AbstractOperator,
+        value_type: str | None = None,
+    ) -> None:
         self._variable = variable
-        self._value = value
+        self._root, path = split_variable(variable)
+        self._path = compile_path(path) if path is not None else None
+        self._value_type = get_value_type(value_type) if value_type is not None else infer_value_type(value)
+        self._value = value if self._value_type is None else self._value_type.coerce_threshold(value)
         self._operator = operator
+        self._operator.prepare(self._value)
+        self._coerces_members = isinstance(operator, SetIntersectionOperator)
 
     @property
     def variable(self):  # noqa: ANN201
         return self._variable
 
+    @property
+    def root(self) -> str:
+        """
+        Context key the check reads: the variable itself, or the part before
+        the first dot for a dotted path such as `user.company.plan`.
+        """
+        return self._root
+
     @property
     def value(self):  # noqa: ANN201
         return self._value
 
+    @property
+    def value_type(self) -> ValueType | None:
+        return self._value_type
+
     @property
     def operator(self):  # noqa: ANN201
         return self._operator
 
+    @property
+    def coerces_members(self) -> bool:
+        """
+        Whether `coerce` converts each member of a multi-valued context value,
+        as the set-intersection operators compare members rather than the
+        value as a whole.
+        """
+        return self._coerces_members
+
+    def coerce(self, value: Any) -> Any:
+        """
+        Converts a context value to the check's value type. Raises TypeError
+        or ValueError when it cannot be converted.
+        """
+        if self._coerces_members:
+            return tuple(self._value_type.coerce(member) for member in as_members(value))
+        return self._value_type.coerce(value)
+
     def check(self, value):  # noqa: ANN001, ANN201
+        if self._value_type is not None:
+            try:
+                value = self.coerce(value)
+            except (TypeError, ValueError):
+                return False
         return self._operator.compare(value, self._value)
 
+    @property
+    def has_path(self) -> bool:
+        return self._path is not None
+
+    def supplied_by(self, context: Mapping[str, Any]) -> bool:
+        """
+        Whether the context has a value for the check: the variable itself as
+        a key, or the root of its dotted path.
+        """
+        return self._variable in context or (self._path is not None and self._root in context)
+
+    def check_context(self, context: Mapping[str, Any]) -> bool:
+        """
+        Checks the value the context supplies, which `supplied_by` must allow.
+        A key equal to the whole variable wins over following the path, so
+        flat dotted keys such as `app.version` keep working.
+        """
+        if self._variable in context:
+            return self.check(context[self._variable])
+        return self.check_root(context[self._root])
+
+    def check_root(self, value: Any) -> bool:
+        """
+        Checks the context value stored under `root`, following the dotted
+        path first. A path that cannot be followed fails the check.
+        """
+        if self._path is not None:
+            try:
+                value = self._path(value)
+            except PATH_ERRORS:
+                return False
+        return self.check(value)
+
     @classmethod
-    def factory(cls, check_key: str, check_value: Any):  # noqa: ANN206
+    def factory(cls, check_key: str, check_value: Any, value_type: str | None = None):  # noqa: ANN206
         variable, operator = cls._parse_check_key(check_key)
-        return cls(variable, check_value, operator)
+        return cls(variable, check_value, operator, value_type=value_type)
 
     @classmethod
     def _parse_check_key(cls, check_key: str) -> tuple[str, AbstractOperator]:
@@ -56,10 +140,19 @@ class Check:
         return variable, Operator.factory(raw_operator)
 
     def to_dict(self) -> dict:
+        if self._value_type is None:
+            # A Bloom filter is stored as its payload, which `in_bloom` reads back.
+            value = self._value.to_dict() if isinstance(self._value, BloomFilter) else self._value
+            return {
+                "variable": self._variable,
+                "value": value,
+                "operator": self._operator.SYMBOL,
+            }
         return {
             "variable": self._variable,
-            "value": self._value,
+            "value": self._value_type.serialize(self._value),
             "operator": self._operator.SYMBOL,
+            "value_type": self._value_type.NAME,
         }
 
     @classmethod
@@ -68,6 +161,7 @@ class Check:
             fields["variable"],
             fields["value"],
             Operator.factory(fields["operator"]),
+            value_type=fields.get("value_type"),
         )
 
     @classmethod
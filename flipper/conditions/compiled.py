@@ -0,0 +1,360 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import contextlib
+import functools
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from .check import Check
+from .condition import Condition
+from .intervals import IntervalSet
+from .operators.all_set_membership_operator import AllSetMembershipOperator
+from .operators.between_operator import BetweenOperator
+from .operators.equality_operator import EqualityOperator
+from .operators.greater_than_or_equal_to_operator import GreaterThanOrEqualToOperator
+from .operators.interface import AbstractOperator
+from .operators.less_than_or_equal_to_operator import LessThanOrEqualToOperator
+from .operators.negated_between_operator import NegatedBetweenOperator
+from .operators.no_set_membership_operator import NoSetMembershipOperator
+from .operators.set_intersection_operator import as_members
+from .paths import PATH_ERRORS, compile_path, split_variable
+
+if TYPE_CHECKING:
+    from .value_types import ValueType
+
+_MISSING = object()
+
+
+class VariableEvaluator:
+    """
+    Every check a flag holds for one variable, merged across conditions into
+    a short list of predicates.
+
+    Equality checks with hashable values collapse into the set of distinct
+    values they require, so any number of them costs a single comparison.
+    `between` checks are intersected (and clipped by `gte`/`lte` bounds) into
+    one sorted interval list, and `not_between` checks are unioned, so any
+    number of ranges costs a single bisect. Likewise `all_in` sets are
+    intersected and `none_in` sets unioned into one set operation each.
+    """
+
+    def __init__(self, variable: str, checks: Iterable[Check]) -> None:
+        self.variable = variable
+        self.predicates: list[Callable[[Any], bool]] = []
+
+        # Set-intersection checks coerce each member of the context value
+        # rather than the value itself, so they are merged separately.
+        checks_by_coercion: dict[tuple[ValueType | None, bool], list[Check]] = defaultdict(list)
+        for check in checks:
+            checks_by_coercion[check.value_type, check.coerces_members].append(check)
+
+        for (value_type, _), typed_checks in checks_by_coercion.items():
+            predicates = self._compile(typed_checks)
+            if value_type is not None:
+                # Merged predicates compare against coerced thresholds, so the
+                # context value is coerced once up front.
+                predicates = [_coerced(predicate, typed_checks[0].coerce) for predicate in predicates]
+            self.predicates.extend(predicates)
+
+    def _compile(self, checks: list[Check]) -> list[Callable[[Any], bool]]:
+        predicates: list[Callable[[Any], bool]] = []
+        required = set()
+        remaining = []
+        for check in checks:
+            if isinstance(check.operator, EqualityOperator) and _is_hashable(check.value):
+                required.add(check.value)
+            else:
+                remaining.append(check)
+
+        if len(required) > 1:
+            # Conditions are AND-ed, and no value equals two distinct values.
+            predicates.append(_never)
+        elif required:
+            predicates.append(_equals(required.pop()))
+
+        with contextlib.suppress(TypeError):
+            remaining = self._merge_ranges(remaining, predicates)
+        with contextlib.suppress(TypeError):
+            remaining = self._merge_sets(remaining, predicates)
+        predicates.extend(_passes(check) for check in remaining)
+        return predicates
+
+    def _merge_ranges(self, checks: list[Check], predicates: list[Callable[[Any], bool]]) -> list[Check]:
+        included = [IntervalSet.from_value(c.value) for c in checks if isinstance(c.operator, BetweenOperator)]
+        excluded = [IntervalSet.from_value(c.value) for c in checks if isinstance(c.operator, NegatedBetweenOperator)]
+        merged_types: tuple[type, ...] = (BetweenOperator, NegatedBetweenOperator)
+        merged: list[Callable[[Any], bool]] = []
+
+        if included:
+            ranges = functools.reduce(IntervalSet.intersection, included)
+            lows = [c.value for c in checks if isinstance(c.operator, GreaterThanOrEqualToOperator)]
+            highs = [c.value for c in checks if isinstance(c.operator, LessThanOrEqualToOperator)]
+            ranges = ranges.clip(max(lows, default=None), min(highs, default=None))
+            merged_types += (GreaterThanOrEqualToOperator, LessThanOrEqualToOperator)
+            merged.append(ranges.__contains__)
+
+        if excluded:
+            holes = functools.reduce(IntervalSet.union, excluded)
+            merged.append(lambda value: value not in holes)
+
+        predicates.extend(merged)
+        return [c for c in checks if not isinstance(c.operator, merged_types)]
+
+    def _merge_sets(self, checks: list[Check], predicates: list[Callable[[Any], bool]]) -> list[Check]:
+        allowed = [frozenset(as_members(c.value)) for c in checks if isinstance(c.operator, AllSetMembershipOperator)]
+        excluded = [frozenset(as_members(c.value)) for c in checks if isinstance(c.operator, NoSetMembershipOperator)]
+        merged: list[Callable[[Any], bool]] = []
+
+        if allowed:
+            # Every value must be in each set, so in their intersection.
+            merged.append(_prepared(AllSetMembershipOperator(), frozenset.intersection(*allowed)))
+        if excluded:
+            # No value may be in any of the sets, so in their union.
+            merged.append(_prepared(NoSetMembershipOperator(), frozenset.union(*excluded)))
+
+        predicates.extend(merged)
+        return [c for c in checks if not isinstance(c.operator, AllSetMembershipOperator | NoSetMembershipOperator)]
+
+    def __call__(self, value: Any) -> bool:
+        return all(predicate(value) for predicate in self.predicates)
+
+
+class AdaptiveOrdering:
+    """
+    Settings for reordering compiled checks by observed selectivity.
+
+    One call in every `sample_every` is timed and its pass/fail outcomes are
+    recorded per check. After every `reorder_every` samples the checks are
+    sorted by expected cost, `cost / (1 - pass_rate)`, so cheap checks that
+    usually fail run first.
+
+    For contexts on which every check returns, results never change. A check
+    that raises after reordering is retried in the original order, so an
+    exception only escapes when the original order raises it too. A context
+    on which the original order would raise may instead get False, when a
+    check moved ahead of the raising one fails.
+    """
+
+    def __init__(self, sample_every: int = 100, reorder_every: int = 10) -> None:
+        self.sample_every = max(1, sample_every)
+        self.reorder_every = max(1, reorder_every)
+
+
+class CheckStatistics:
+    __slots__ = ("errors", "passes", "samples", "total_ns")
+
+    def __init__(self) -> None:
+        self.samples = 0
+        self.passes = 0
+        self.errors = 0
+        self.total_ns = 0
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passes / self.samples if self.samples else 0.5
+
+    @property
+    def mean_cost_ns(self) -> float:
+        return self.total_ns / self.samples if self.samples else 0.0
+
+    def rank(self, default_cost_ns: float) -> float:
+        if self.errors:
+            # Checks that have raised stay behind the ones that shield them.
+            return float("inf")
+        cost = self.mean_cost_ns if self.samples else default_cost_ns
+        fail_rate = 1.0 - self.pass_rate
+        return cost / fail_rate if fail_rate > 0 else float("inf")
+
+
+class _Step:
+    __slots__ = ("path", "predicate", "root", "statistics", "variable")
+
+    def __init__(self, variable: str, predicate: Callable[[Any], bool]) -> None:
+        self.variable = variable
+        self.root, path = split_variable(variable)
+        self.path = compile_path(path) if path is not None else None
+        self.predicate = predicate
+        self.statistics = CheckStatistics()
+
+    def supplied_by(self, context: Mapping[str, Any]) -> bool:
+        return self.variable in context or (self.path is not None and self.root in context)
+
+    def check_context(self, context: Mapping[str, Any]) -> bool:
+        if self.variable in context:
+            return self.predicate(context[self.variable])
+        try:
+            value = self.path(context[self.root])  # type: ignore[misc]
+        except PATH_ERRORS:
+            return False
+        return self.predicate(value)
+
+
+class CompiledConditions:
+    """
+    Flattened form of a flag's conditions.
+
+    A flag's conditions are AND-ed together and every check on a variable the
+    context does not supply is skipped, so the whole set reduces to one merged
+    evaluator per variable. Evaluation does a hash lookup per variable instead
+    of walking every `Condition`, with the same result as checking each one.
+    """
+
+    def __init__(
+        self,
+        conditions: Iterable[Condition],
+        adaptive_ordering: AdaptiveOrdering | None = None,
+    ) -> None:
+        checks_by_variable: dict[str, list[Check]] = defaultdict(list)
+        for condition in conditions:
+            for check in condition.iter_checks():
+                checks_by_variable[check.variable].append(check)
+
+        self._steps = [
+            _Step(variable, predicate)
+            for variable, checks in checks_by_variable.items()
+            for predicate in VariableEvaluator(variable, checks).predicates
+        ]
+        # Insertion order, which decides what raises once steps are reordered.
+        self._original_steps = self._steps
+        self._adaptive_ordering = adaptive_ordering
+        self._calls = 0
+        self._samples = 0
+
+    @property
+    def variables(self) -> list[str]:
+        return list(dict.fromkeys(step.variable for step in self._steps))
+
+    @property
+    def statistics(self) -> list[tuple[str, CheckStatistics]]:
+        return [(step.variable, step.statistics) for step in self._steps]
+
+    def check(self, **checks) -> bool:  # noqa: ANN003
+        return self.check_context(checks)
+
+    def check_context(self, context: Mapping[str, Any]) -> bool:
+        if self._adaptive_ordering is not None:
+            self._calls += 1
+            if self._calls % self._adaptive_ordering.sample_every == 0:
+                return self._sample(context)
+
+        steps = self._steps
+        try:
+            return _evaluate(steps, context)
+        except Exception:
+            if steps is self._original_steps:
+                raise
+            return _evaluate(self._original_steps, context)
+
+    def _sample(self, context: Mapping[str, Any]) -> bool:
+        steps = self._steps
+        try:
+            result = self._measure_all(steps, context)
+        except Exception:
+            if steps is self._original_steps:
+                raise
+            result = _evaluate(self._original_steps, context)
+
+        self._samples += 1
+        if self._samples % self._adaptive_ordering.reorder_every == 0:  # type: ignore[union-attr]
+            self._reorder()
+        return result
+
+    def _measure_all(self, steps: list[_Step], context: Mapping[str, Any]) -> bool:
+        result = True
+        for step in steps:
+            if not step.supplied_by(context):
+                continue
+            if not result:
+                # The outcome is already decided; keep measuring the remaining
+                # checks, but never let them change the result or raise.
+                try:
+                    self._measure(step, context)
+                except Exception:  # noqa: BLE001
+                    step.statistics.errors += 1
+                continue
+            try:
+                result = self._measure(step, context)
+            except Exception:
+                step.statistics.errors += 1
+                raise
+        return result
+
+    def _measure(self, step: _Step, context: Mapping[str, Any]) -> bool:
+        started = time.perf_counter_ns()
+        passed = step.check_context(context)
+        statistics = step.statistics
+        statistics.total_ns += time.perf_counter_ns() - started
+        statistics.samples += 1
+        statistics.passes += bool(passed)
+        return passed
+
+    def _reorder(self) -> None:
+        measured = [step.statistics.mean_cost_ns for step in self._steps if step.statistics.samples]
+        default_cost_ns = sum(measured) / len(measured) if measured else 0.0
+        self._steps = sorted(self._steps, key=lambda step: step.statistics.rank(default_cost_ns))
+
+
+def _evaluate(steps: list[_Step], context: Mapping[str, Any]) -> bool:
+    for step in steps:
+        # A key equal to the whole variable wins over a dotted path.
+        if step.variable in context:
+            value = context[step.variable]
+        elif step.path is not None and step.root in context:
+            try:
+                value = step.path(context[step.root])
+            except PATH_ERRORS:
+                return False
+        else:
+            continue
+        if not step.predicate(value):
+            return False
+    return True
+
+
+def _never(value: Any) -> bool:  # noqa: ARG001
+    return False
+
+
+def _equals(required: Any) -> Callable[[Any], bool]:
+    return lambda value: value == required
+
+
+def _prepared(operator: AbstractOperator, actual: Any) -> Callable[[Any], bool]:
+    operator.prepare(actual)
+    return lambda value: operator.compare(value, actual) is not False
+
+
+def _passes(check: Check) -> Callable[[Any], bool]:
+    return lambda value: check.check(value) is not False
+
+
+def _coerced(predicate: Callable[[Any], bool], coerce: Callable[[Any], Any]) -> Callable[[Any], bool]:
+    def coerced(value: Any) -> bool:
+        try:
+            value = coerce(value)
+        except (TypeError, ValueError):
+            return False
+        return predicate(value)
+
+    return coerced
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
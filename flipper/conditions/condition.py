@@ -13,8 +13,11 @@
 
 import copy
 from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping
 from typing import Any
 
+from flipper.context import EvaluationContext
+
 from .check import Check
 
 
@@ -22,10 +25,25 @@ class Condition:
     def __init__(self, **checks) -> None:  # noqa: ANN003
         self._checks = self._parse_checks(checks)
 
+    @classmethod
+    def from_checks(cls, checks: Iterable[Check]) -> "Condition":
+        """
+        Builds a condition from `Check` objects, for checks that need options
+        keyword arguments cannot express, such as a declared `value_type`.
+        """
+        condition = cls()
+        for check in checks:
+            condition._checks[check.variable].append(check)
+        return condition
+
     @property
     def checks(self) -> dict[str, list[Check]]:
         return copy.deepcopy(self._checks)
 
+    def iter_checks(self) -> Iterator[Check]:
+        for checkers in self._checks.values():
+            yield from checkers
+
     def _parse_checks(self, checks: dict[str, Any]) -> dict[str, list[Check]]:
         parsed_checks = defaultdict(list)  # type: Dict[str, List[Check]]
         for check_key, check_value in checks.items():
@@ -34,12 +52,24 @@ class Condition:
         return parsed_checks
 
     def check(self, **checks) -> bool:  # noqa: ANN003
-        for check_name, check_value in checks.items():
-            checkers = self._checks[check_name]
+        return self.check_context(checks)
 
-            for checker in checkers:
-                if checker.check(check_value) is False:
+    def check_context(self, context: Mapping[str, Any]) -> bool:
+        context = EvaluationContext.wrap(context)
+        for variable, checkers in self._checks.items():
+            # A key equal to the whole variable wins over a dotted path.
+            if variable in context:
+                value = context[variable]
+                if any(checker.check(value) is False for checker in checkers):
                     return False
+                continue
+
+            root = checkers[0].root
+            if not checkers[0].has_path or root not in context:
+                continue
+            value = context[root]
+            if any(checker.check_root(value) is False for checker in checkers):
+                return False
         return True
 
     def to_dict(self) -> dict[str, Any]:
@@ -47,15 +77,4 @@ class Condition:
 
     @classmethod
     def from_dict(cls, conditions: dict[str, Any]) -> "Condition":
-        constructor_kwargs = {}
-
-        for checks in conditions.values():
-            for check in checks:
-                check_key = cls._make_key_for_check(check)
-                constructor_kwargs[check_key] = check["value"]
-
-        return cls(**constructor_kwargs)
-
-    @classmethod
-    def _make_key_for_check(cls, check: dict[str, Any]) -> str:
-        return Check.make_check_key(check["variable"], check["operator"])
+        return cls.from_checks(Check.from_dict(check) for checks in conditions.values() for check in checks)
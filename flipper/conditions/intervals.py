@@ -0,0 +1,83 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+
+class IntervalSet:
+    """
+    Sorted, non-overlapping list of closed intervals with O(log n) membership.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[Any, Any]] = ()) -> None:
+        self._lows: list[Any] = []
+        self._highs: list[Any] = []
+        for low, high in sorted((low, high) for low, high in intervals if not high < low):
+            if self._highs and not self._highs[-1] < low:
+                self._highs[-1] = max(self._highs[-1], high)
+            else:
+                self._lows.append(low)
+                self._highs.append(high)
+
+    @classmethod
+    def from_value(cls, value: Sequence) -> "IntervalSet":
+        """
+        Accepts either a single `[low, high]` pair or a list of such pairs.
+        """
+        if isinstance(value, IntervalSet):
+            return value
+        if len(value) == 2 and not isinstance(value[0], list | tuple):  # noqa: PLR2004
+            return cls([(value[0], value[1])])
+        return cls((low, high) for low, high in value)
+
+    @property
+    def intervals(self) -> list[tuple[Any, Any]]:
+        return list(zip(self._lows, self._highs, strict=True))
+
+    def __len__(self) -> int:
+        return len(self._lows)
+
+    def __contains__(self, value: Any) -> bool:
+        i = bisect_right(self._lows, value) - 1
+        return i >= 0 and not self._highs[i] < value
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        result = []
+        i = j = 0
+        while i < len(self._lows) and j < len(other._lows):  # noqa: SLF001
+            low = max(self._lows[i], other._lows[j])  # noqa: SLF001
+            high = min(self._highs[i], other._highs[j])  # noqa: SLF001
+            if not high < low:
+                result.append((low, high))
+            if self._highs[i] < other._highs[j]:  # noqa: SLF001
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(result)
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet(self.intervals + other.intervals)
+
+    def clip(self, low: Any = None, high: Any = None) -> "IntervalSet":
+        """
+        Restricts the set to values `>= low` and `<= high`; `None` leaves that
+        side unbounded.
+        """
+        clipped = []
+        for interval_low, interval_high in self.intervals:
+            new_low = interval_low if low is None else max(interval_low, low)
+            new_high = interval_high if high is None else min(interval_high, high)
+            clipped.append((new_low, new_high))
+        return IntervalSet(clipped)
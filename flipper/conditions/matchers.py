@@ -0,0 +1,126 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+TRIE_THRESHOLD = 16
+
+_TERMINAL = ""
+
+
+class PrefixMatcher:
+    """
+    Matches strings against a set of prefixes.
+
+    Small sets use `str.startswith` with a tuple; larger ones are merged into
+    a character trie, so a lookup costs O(len(value)) however many prefixes
+    there are.
+    """
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        self._prefixes = tuple(dict.fromkeys(prefixes))
+        self._trie: dict | None = None
+        if len(self._prefixes) > TRIE_THRESHOLD:
+            self._trie = _build_trie(self._prefixes)
+
+    @classmethod
+    def from_value(cls, value: str | Iterable[str]) -> "PrefixMatcher":
+        return cls([value] if isinstance(value, str) else value)
+
+    def matches(self, value: Any) -> bool:
+        if not isinstance(value, str):
+            return False
+        if self._trie is None:
+            return value.startswith(self._prefixes)
+        return _walk_trie(self._trie, value)
+
+
+class SuffixMatcher:
+    """
+    Matches strings against a set of suffixes, using a trie of the reversed
+    suffixes once the set is large.
+    """
+
+    def __init__(self, suffixes: Iterable[str]) -> None:
+        self._suffixes = tuple(dict.fromkeys(suffixes))
+        self._trie: dict | None = None
+        if len(self._suffixes) > TRIE_THRESHOLD:
+            self._trie = _build_trie(suffix[::-1] for suffix in self._suffixes)
+
+    @classmethod
+    def from_value(cls, value: str | Iterable[str]) -> "SuffixMatcher":
+        return cls([value] if isinstance(value, str) else value)
+
+    def matches(self, value: Any) -> bool:
+        if not isinstance(value, str):
+            return False
+        if self._trie is None:
+            return value.endswith(self._suffixes)
+        return _walk_trie(self._trie, reversed(value))
+
+
+class PatternSet:
+    """
+    Patterns searched one after the other, for lists that cannot be joined
+    into one alternation.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._patterns = tuple(re.compile(pattern) for pattern in patterns)
+
+    def search(self, value: str) -> re.Match | None:
+        for pattern in self._patterns:
+            match = pattern.search(value)
+            if match is not None:
+                return match
+        return None
+
+
+def compile_pattern(value: str | Iterable[str]) -> re.Pattern | PatternSet:
+    """
+    Compiles a pattern, or a list of patterns into a single alternation. A
+    pattern with global inline flags, such as `(?i)`, cannot be part of an
+    alternation, so such lists are compiled pattern by pattern instead.
+    """
+    if isinstance(value, str):
+        return re.compile(value)
+    patterns = list(value)
+    try:
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    except re.error:
+        return PatternSet(patterns)
+
+
+def _build_trie(keys: Iterable[str]) -> dict:
+    trie: dict = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = True
+    return trie
+
+
+def _walk_trie(trie: dict, chars: Iterable[str]) -> bool:
+    node = trie
+    if _TERMINAL in node:
+        return True
+    for char in chars:
+        node = node.get(char)
+        if node is None:
+            return False
+        if _TERMINAL in node:
+            return True
+    return False
@@ -0,0 +1,96 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import functools
+import ipaddress
+import socket
+from collections.abc import Iterable
+from typing import Any
+
+from .intervals import IntervalSet
+
+PARSED_ADDRESS_CACHE_SIZE = 1024
+
+IPV4 = 4
+IPV6 = 6
+
+_IPV4_MAPPED_PREFIX = 0xFFFF << 32
+_IPV4_MAPPED_MASK = ~((1 << 32) - 1)
+
+
+class NetworkSet:
+    """
+    IPv4 and IPv6 networks merged into sorted, non-overlapping integer ranges
+    per IP version. Networks are parsed once; matching an address costs one
+    parse of that address and a bisect, however many networks there are.
+    """
+
+    def __init__(self, networks: Iterable[str]) -> None:
+        ranges: dict[int, list[tuple[int, int]]] = {IPV4: [], IPV6: []}
+        for network in networks:
+            parsed = ipaddress.ip_network(network, strict=False)
+            ranges[parsed.version].append((int(parsed.network_address), int(parsed.broadcast_address)))
+        self._ranges = {version: IntervalSet(intervals) for version, intervals in ranges.items()}
+
+    @classmethod
+    def from_value(cls, value: str | Iterable[str]) -> "NetworkSet":
+        if isinstance(value, NetworkSet):
+            return value
+        if isinstance(value, str):
+            return cls([value])
+        return cls(value)
+
+    def __len__(self) -> int:
+        return sum(len(ranges) for ranges in self._ranges.values())
+
+    def __contains__(self, address: Any) -> bool:
+        parsed = parse_address(address)
+        if parsed is None:
+            return False
+        version, number = parsed
+        return number in self._ranges[version]
+
+
+def parse_address(address: Any) -> tuple[int, int] | None:
+    """
+    Returns the IP version and integer value of an address, or `None` if it
+    is not a valid IPv4 or IPv6 address. IPv4-mapped IPv6 addresses count as
+    IPv4.
+    """
+    if isinstance(address, ipaddress.IPv4Address):
+        return IPV4, int(address)
+    if isinstance(address, ipaddress.IPv6Address):
+        return _unmap(int(address))
+    if not isinstance(address, str):
+        return None
+    return _parse_address_string(address)
+
+
+@functools.lru_cache(maxsize=PARSED_ADDRESS_CACHE_SIZE)
+def _parse_address_string(address: str) -> tuple[int, int] | None:
+    # inet_pton parses in C without building an ipaddress object. It raises
+    # ValueError rather than OSError for strings with an embedded NUL.
+    try:
+        return IPV4, int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+    except (OSError, ValueError):
+        pass
+    try:
+        return _unmap(int.from_bytes(socket.inet_pton(socket.AF_INET6, address.partition("%")[0]), "big"))
+    except (OSError, ValueError):
+        return None
+
+
+def _unmap(number: int) -> tuple[int, int]:
+    if number & _IPV4_MAPPED_MASK == _IPV4_MAPPED_PREFIX:
+        return IPV4, number & 0xFFFFFFFF
+    return IPV6, number
@@ -0,0 +1,30 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from typing import Any
+
+from flipper.conditions.bloom import BloomFilter
+
+from .interface import PreparedOperator
+
+
+class BloomFilterMembershipOperator(PreparedOperator):
+    SYMBOL = "in_bloom"
+
+    def _compile(self, actual: dict[str, Any] | BloomFilter) -> BloomFilter:
+        if isinstance(actual, BloomFilter):
+            return actual
+        return BloomFilter.from_dict(actual)
+
+    def _match(self, expected: Any, prepared: BloomFilter) -> bool:
+        return expected in prepared
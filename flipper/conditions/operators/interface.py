@@ -24,3 +24,43 @@ class AbstractOperator(metaclass=ABCMeta):
     @abstractmethod
     def compare(self, expected: Any, actual: Any) -> bool:
         pass
+
+    def prepare(self, actual: Any) -> None:  # noqa: B027
+        """
+        Called once with the check value when a `Check` is built, so operators
+        can do any expensive parsing up front instead of on every compare.
+        """
+
+
+class PreparedOperator(AbstractOperator):
+    """
+    Base for operators whose check value must be compiled (decoded, parsed,
+    indexed) before it can be matched. The compiled form is kept for the
+    check value it was built from and reused on every compare.
+    """
+
+    def __init__(self) -> None:
+        self._source: Any = None
+        self._prepared: Any = None
+        self._is_prepared = False
+
+    def prepare(self, actual: Any) -> None:
+        self._get_prepared(actual)
+
+    def compare(self, expected: Any, actual: Any) -> bool:
+        return self._match(expected, self._get_prepared(actual))
+
+    def _get_prepared(self, actual: Any) -> Any:
+        if not self._is_prepared or self._source is not actual:
+            self._prepared = self._compile(actual)
+            self._source = actual
+            self._is_prepared = True
+        return self._prepared
+
+    @abstractmethod
+    def _compile(self, actual: Any) -> Any:
+        pass
+
+    @abstractmethod
+    def _match(self, expected: Any, prepared: Any) -> bool:
+        pass
@@ -0,0 +1,28 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from typing import Any
+
+from flipper.conditions.intervals import IntervalSet
+
+from .interface import PreparedOperator
+
+
+class NegatedBetweenOperator(PreparedOperator):
+    SYMBOL = "not_between"
+
+    def _compile(self, actual: Any) -> IntervalSet:
+        return IntervalSet.from_value(actual)
+
+    def _match(self, expected: Any, prepared: IntervalSet) -> bool:
+        return expected not in prepared
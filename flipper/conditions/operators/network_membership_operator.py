@@ -0,0 +1,29 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from collections.abc import Iterable
+from typing import Any
+
+from flipper.conditions.networks import NetworkSet
+
+from .interface import PreparedOperator
+
+
+class NetworkMembershipOperator(PreparedOperator):
+    SYMBOL = "in_network"
+
+    def _compile(self, actual: str | Iterable[str]) -> NetworkSet:
+        return NetworkSet.from_value(actual)
+
+    def _match(self, expected: Any, prepared: NetworkSet) -> bool:
+        return expected in prepared
@@ -11,15 +11,28 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
-
+from .all_set_membership_operator import AllSetMembershipOperator
+from .any_set_membership_operator import AnySetMembershipOperator
+from .between_operator import BetweenOperator
+from .bloom_filter_membership_operator import BloomFilterMembershipOperator
+from .ends_with_operator import EndsWithOperator
 from .equality_operator import EqualityOperator
 from .greater_than_operator import GreaterThanOperator
 from .greater_than_or_equal_to_operator import GreaterThanOrEqualToOperator
 from .less_than_operator import LessThanOperator
 from .less_than_or_equal_to_operator import LessThanOrEqualToOperator
+from .negated_between_operator import NegatedBetweenOperator
 from .negated_set_membership_operator import NegatedSetMembershipOperator
 from .negation_operator import NegationOperator
+from .network_membership_operator import NetworkMembershipOperator
+from .no_set_membership_operator import NoSetMembershipOperator
+from .regex_operator import RegexOperator
 from .set_membership_operator import SetMembershipOperator
+from .starts_with_operator import StartsWithOperator
+from .version_greater_than_operator import VersionGreaterThanOperator
+from .version_greater_than_or_equal_to_operator import VersionGreaterThanOrEqualToOperator
+from .version_less_than_operator import VersionLessThanOperator
+from .version_less_than_or_equal_to_operator import VersionLessThanOrEqualToOperator
 
 
 class Operator:
@@ -32,6 +45,20 @@ class Operator:
         NegationOperator.SYMBOL: NegationOperator,
         SetMembershipOperator.SYMBOL: SetMembershipOperator,
         NegatedSetMembershipOperator.SYMBOL: NegatedSetMembershipOperator,
+        AnySetMembershipOperator.SYMBOL: AnySetMembershipOperator,
+        AllSetMembershipOperator.SYMBOL: AllSetMembershipOperator,
+        NoSetMembershipOperator.SYMBOL: NoSetMembershipOperator,
+        BloomFilterMembershipOperator.SYMBOL: BloomFilterMembershipOperator,
+        BetweenOperator.SYMBOL: BetweenOperator,
+        NegatedBetweenOperator.SYMBOL: NegatedBetweenOperator,
+        NetworkMembershipOperator.SYMBOL: NetworkMembershipOperator,
+        StartsWithOperator.SYMBOL: StartsWithOperator,
+        EndsWithOperator.SYMBOL: EndsWithOperator,
+        RegexOperator.SYMBOL: RegexOperator,
+        VersionGreaterThanOperator.SYMBOL: VersionGreaterThanOperator,
+        VersionGreaterThanOrEqualToOperator.SYMBOL: VersionGreaterThanOrEqualToOperator,
+        VersionLessThanOperator.SYMBOL: VersionLessThanOperator,
+        VersionLessThanOrEqualToOperator.SYMBOL: VersionLessThanOrEqualToOperator,
     }  # Dict[Optional[str], Any]
 
     class InvalidSymbolError(Exception):
@@ -0,0 +1,41 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from abc import abstractmethod
+from typing import Any
+
+from flipper.conditions.versions import VersionKey, parse_context_version, parse_version
+
+from .interface import PreparedOperator
+
+
+class SemanticVersionOperator(PreparedOperator):
+    """
+    Compares version strings by SemVer precedence. The check's version is
+    parsed once; context versions go through a shared LRU, and context
+    values that are not valid versions never match.
+    """
+
+    def _compile(self, actual: str) -> VersionKey:
+        return parse_version(actual)
+
+    def _match(self, expected: Any, prepared: VersionKey) -> bool:
+        try:
+            parsed = parse_context_version(expected)
+        except TypeError:
+            return False
+        return parsed is not None and self._compare_versions(parsed, prepared)
+
+    @abstractmethod
+    def _compare_versions(self, expected: VersionKey, actual: VersionKey) -> bool:
+        pass
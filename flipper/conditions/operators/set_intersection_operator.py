@@ -0,0 +1,47 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from abc import abstractmethod
+from collections.abc import Iterable
+from typing import Any
+
+from .interface import PreparedOperator
+
+
+class SetIntersectionOperator(PreparedOperator):
+    """
+    Compares a multi-valued context value, such as a user's roles, against
+    the check's values. The check's values are frozen into a set once, and
+    the comparison is a single set operation, which iterates the smaller
+    side when the context value is also a set. A single string or scalar,
+    on either side, counts as one value, and unhashable values never match.
+    """
+
+    def _compile(self, actual: Any) -> frozenset:
+        return frozenset(as_members(actual))
+
+    def _match(self, expected: Any, prepared: frozenset) -> bool:
+        try:
+            return self._compare_sets(as_members(expected), prepared)
+        except TypeError:
+            return False
+
+    @abstractmethod
+    def _compare_sets(self, expected: Iterable, actual: frozenset) -> bool:
+        pass
+
+
+def as_members(value: Any) -> Iterable:
+    if isinstance(value, str | bytes) or not isinstance(value, Iterable):
+        return (value,)
+    return value
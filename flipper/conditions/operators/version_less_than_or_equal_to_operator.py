@@ -0,0 +1,23 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from flipper.conditions.versions import VersionKey
+
+from .semantic_version_operator import SemanticVersionOperator
+
+
+class VersionLessThanOrEqualToOperator(SemanticVersionOperator):
+    SYMBOL = "version_lte"
+
+    def _compare_versions(self, expected: VersionKey, actual: VersionKey) -> bool:
+        return expected <= actual
@@ -0,0 +1,76 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import operator
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+PATH_DELIMITER = "."
+
+# What a getter raises when some part of the path does not exist.
+PATH_ERRORS = (AttributeError, LookupError, TypeError)
+
+PathGetter = Callable[[Any], Any]
+
+
+def split_variable(variable: str) -> tuple[str, str | None]:
+    """
+    Splits `user.company.plan` into the context key `user` and the path
+    `company.plan` to follow from it. Plain variables have no path.
+    """
+    root, _, path = variable.partition(PATH_DELIMITER)
+    return root, path or None
+
+
+def compile_path(path: str) -> PathGetter:
+    """
+    Compiles a dotted path into a getter that walks it segment by segment with
+    prebuilt getters, using item access for mappings (and numeric segments of
+    sequences) and attributes otherwise. Mapping keys always win, so a key
+    named like a dict method, such as `items`, reads the key.
+    """
+    segments = [_compile_segment(segment) for segment in path.split(PATH_DELIMITER)]
+    if len(segments) == 1:
+        return segments[0]
+
+    def get(value: Any) -> Any:
+        for get_segment in segments:
+            value = get_segment(value)
+        return value
+
+    return get
+
+
+def _compile_segment(segment: str) -> PathGetter:
+    get_attribute = operator.attrgetter(segment)
+    get_key = operator.itemgetter(segment)
+    get_index = operator.itemgetter(int(segment)) if segment.isdigit() else None
+    # How to read the segment depends only on the type of the value, so the
+    # getter is picked once per type rather than with ABC checks every time.
+    getters: dict[type, PathGetter] = {}
+
+    def getter_for(cls: type) -> PathGetter:
+        if issubclass(cls, Mapping):
+            return get_key
+        if get_index is not None and issubclass(cls, Sequence) and not issubclass(cls, str):
+            return get_index
+        return get_attribute
+
+    def get(value: Any) -> Any:
+        cls = type(value)
+        getter = getters.get(cls)
+        if getter is None:
+            getter = getters[cls] = getter_for(cls)
+        return getter(value)
+
+    return get
@@ -0,0 +1,228 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import functools
+from abc import ABCMeta, abstractmethod
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time
+from decimal import Decimal, InvalidOperation
+from typing import Any
+from uuid import UUID
+
+PARSED_VALUE_CACHE_SIZE = 1024
+
+
+class InvalidValueTypeError(ValueError):
+    pass
+
+
+class ValueType(metaclass=ABCMeta):
+    """
+    Declared type of a check's value.
+
+    Stored values come back from JSON as strings and numbers. A typed check
+    converts its threshold once, when it is built, and converts each context
+    value with `coerce`, which returns values that already have the right type
+    untouched and parses strings through a bounded cache.
+    """
+
+    NAME: str
+    PYTHON_TYPE: type
+
+    def coerce(self, value: Any) -> Any:
+        if type(value) is self.PYTHON_TYPE:
+            return value
+        if isinstance(value, str):
+            return self._parse_string(value)
+        return self._convert(value)
+
+    def coerce_threshold(self, value: Any) -> Any:
+        """
+        Coerces a threshold, element by element when it is a list of values
+        (`in`) or of ranges (`between`).
+        """
+        if isinstance(value, list | tuple):
+            return type(value)(self.coerce_threshold(element) for element in value)
+        return self.coerce(value)
+
+    def serialize(self, value: Any) -> Any:
+        if isinstance(value, list | tuple):
+            return [self.serialize(element) for element in value]
+        return self._serialize(value)
+
+    def _parse_string(self, value: str) -> Any:
+        return _parse_cached(self.NAME, value)
+
+    @abstractmethod
+    def _parse(self, value: str) -> Any:
+        pass
+
+    def _convert(self, value: Any) -> Any:
+        msg = f"Cannot convert {type(value).__name__} to {self.NAME}"
+        raise TypeError(msg)
+
+    def _serialize(self, value: Any) -> Any:
+        return str(value)
+
+
+class DateTimeValueType(ValueType):
+    """
+    Naive datetimes, including strings without an offset, are taken to be in
+    UTC, so that they compare with aware ones instead of raising.
+    """
+
+    NAME = "datetime"
+    PYTHON_TYPE = datetime
+
+    def coerce(self, value: Any) -> datetime:
+        value = super().coerce(value)
+        if value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
+
+    def _parse(self, value: str) -> datetime:
+        return datetime.fromisoformat(value)
+
+    def _convert(self, value: Any) -> datetime:
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime.combine(value, time())
+        return super()._convert(value)
+
+    def _serialize(self, value: datetime) -> str:
+        return value.isoformat()
+
+
+class DateValueType(ValueType):
+    NAME = "date"
+    PYTHON_TYPE = date
+
+    def _parse(self, value: str) -> date:
+        return date.fromisoformat(value)
+
+    def _convert(self, value: Any) -> date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return super()._convert(value)
+
+    def _serialize(self, value: date) -> str:
+        return value.isoformat()
+
+
+class DecimalValueType(ValueType):
+    NAME = "decimal"
+    PYTHON_TYPE = Decimal
+
+    def _parse(self, value: str) -> Decimal:
+        try:
+            return Decimal(value.strip())
+        except InvalidOperation:
+            msg = f"Invalid decimal: {value!r}"
+            raise ValueError(msg) from None
+
+    def _convert(self, value: Any) -> Decimal:
+        if isinstance(value, bool):
+            return super()._convert(value)
+        if isinstance(value, int):
+            return Decimal(value)
+        if isinstance(value, float):
+            # Going through repr keeps 0.1 as Decimal("0.1").
+            return Decimal(repr(value))
+        return super()._convert(value)
+
+
+class UUIDValueType(ValueType):
+    NAME = "uuid"
+    PYTHON_TYPE = UUID
+
+    def _parse(self, value: str) -> UUID:
+        return UUID(value)
+
+    def _convert(self, value: Any) -> UUID:
+        if isinstance(value, UUID):
+            return value
+        return super()._convert(value)
+
+
+class IntegerValueType(ValueType):
+    NAME = "int"
+    PYTHON_TYPE = int
+
+    def _parse(self, value: str) -> int:
+        return int(value)
+
+    def _convert(self, value: Any) -> Any:
+        # Other numbers already compare correctly against an int threshold.
+        if isinstance(value, float | Decimal) and not isinstance(value, bool):
+            return value
+        return super()._convert(value)
+
+    def _serialize(self, value: int) -> int:
+        return value
+
+
+VALUE_TYPES: dict[str, ValueType] = {
+    value_type.NAME: value_type
+    for value_type in (
+        DateTimeValueType(),
+        DateValueType(),
+        DecimalValueType(),
+        UUIDValueType(),
+        IntegerValueType(),
+    )
+}
+
+# Types recognised on values passed to `Condition(...)` directly. Plain ints
+# are left alone so existing checks keep their behaviour; declare "int"
+# explicitly to have string context values parsed.
+_INFERRED_TYPES = {
+    datetime: VALUE_TYPES["datetime"],
+    date: VALUE_TYPES["date"],
+    Decimal: VALUE_TYPES["decimal"],
+    UUID: VALUE_TYPES["uuid"],
+}
+
+
+def get_value_type(name: str) -> ValueType:
+    try:
+        return VALUE_TYPES[name]
+    except KeyError:
+        msg = f"Value type not supported: {name}"
+        raise InvalidValueTypeError(msg) from None
+
+
+def infer_value_type(value: Any) -> ValueType | None:
+    """
+    Returns the value type matching a threshold built from Python objects, or
+    `None` when it holds plain JSON values or a mix of types.
+    """
+    inferred = {_INFERRED_TYPES.get(type(leaf)) for leaf in _iter_leaves(value)}
+    if len(inferred) == 1:
+        return inferred.pop()
+    return None
+
+
+def _iter_leaves(value: Any) -> Iterator[Any]:
+    if isinstance(value, list | tuple):
+        for element in value:
+            yield from _iter_leaves(element)
+    else:
+        yield value
+
+
+@functools.lru_cache(maxsize=PARSED_VALUE_CACHE_SIZE)
+def _parse_cached(name: str, value: str) -> Any:
+    return VALUE_TYPES[name]._parse(value)  # noqa: SLF001
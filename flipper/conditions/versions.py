@@ -0,0 +1,76 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import functools
+import re
+from typing import Any
+
+PARSED_VERSION_CACHE_SIZE = 1024
+
+_VERSION_PATTERN = re.compile(
+    r"^v?(?P<major>0|[1-9]\d*)(?:\.(?P<minor>0|[1-9]\d*))?(?:\.(?P<patch>0|[1-9]\d*))?"
+    r"(?:-(?P<prerelease>[0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$",
+)
+
+# A release sorts after any of its pre-releases.
+_RELEASE = (1,)
+
+VersionKey = tuple[int, int, int, tuple]
+
+
+class InvalidVersionError(ValueError):
+    pass
+
+
+def parse_version(value: str) -> VersionKey:
+    """
+    Parses a semantic version into a tuple that orders by SemVer precedence.
+    Missing minor or patch components count as zero, a leading `v` is
+    allowed and build metadata is ignored.
+    """
+    if not isinstance(value, str):
+        msg = f"Version must be a string: {value!r}"
+        raise InvalidVersionError(msg)
+
+    match = _VERSION_PATTERN.match(value.strip())
+    if match is None:
+        msg = f"Invalid semantic version: {value!r}"
+        raise InvalidVersionError(msg)
+
+    prerelease = match.group("prerelease")
+    return (
+        int(match.group("major")),
+        int(match.group("minor") or 0),
+        int(match.group("patch") or 0),
+        _RELEASE if prerelease is None else (0, *map(_prerelease_identifier_key, prerelease.split("."))),
+    )
+
+
+@functools.lru_cache(maxsize=PARSED_VERSION_CACHE_SIZE)
+def parse_context_version(value: Any) -> VersionKey | None:
+    """
+    Parses a version seen in an evaluation context. The same few hundred
+    version strings repeat across calls, so results are kept in a bounded
+    LRU. Unparseable values return `None` rather than raising.
+    """
+    try:
+        return parse_version(value)
+    except InvalidVersionError:
+        return None
+
+
+def _prerelease_identifier_key(identifier: str) -> tuple[int, int | str]:
+    # Numeric identifiers sort before alphanumeric ones, and numerically.
+    if identifier.isdigit():
+        return (0, int(identifier))
+    return (1, identifier)
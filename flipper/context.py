@@ -0,0 +1,73 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from collections.abc import Hashable, Iterator, Mapping
+from typing import Any
+
+
+class EvaluationContext(Mapping[str, Any]):
+    """
+    Read-only view of the values a flag is evaluated against.
+
+    Values are looked up in the wrapped mapping only when a check or bucketer
+    reads them, and values that are callables are called at that point. Each
+    value is resolved at most once per evaluation, so expensive lookups (a
+    database query, a lazy mapping) are skipped for flags that are disabled
+    or never read that variable.
+    """
+
+    __slots__ = ("_resolved", "_source", "cache")
+
+    def __init__(self, source: Mapping[str, Any]) -> None:
+        self._source = source
+        self._resolved: dict[str, Any] = {}
+        # Values derived from the context during one evaluation, such as
+        # identity digests, shared by every flag evaluated against it.
+        self.cache: dict[Hashable, Any] = {}
+
+    @classmethod
+    def of(cls, context: Mapping[str, Any]) -> "EvaluationContext":
+        return context if isinstance(context, cls) else cls(context)
+
+    @classmethod
+    def wrap(cls, context: Mapping[str, Any]) -> Mapping[str, Any]:
+        """
+        Returns a mapping that is safe to read lazily. Plain dicts without
+        callables need no resolving and are returned untouched, which keeps
+        the common case free of any wrapper overhead.
+        """
+        if isinstance(context, cls):
+            return context
+        if type(context) is dict and not any(map(callable, context.values())):
+            return context
+        return cls(context)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        value = self._source[key]
+        if callable(value):
+            value = value()
+        self._resolved[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._resolved or key in self._source
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._source)
+
+    def __len__(self) -> int:
+        return len(self._source)
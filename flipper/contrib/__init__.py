@@ -11,8 +11,14 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+from flipper.contrib.cache_stats import CacheEvent, CacheStats
 from flipper.contrib.cached import CachedFeatureFlagStore
 from flipper.contrib.consul import ConsulFeatureFlagStore
+from flipper.contrib.invalidation import (
+    AbstractInvalidationBus,
+    LoopbackInvalidationBus,
+    RedisInvalidationBus,
+)
 from flipper.contrib.memory import MemoryFeatureFlagStore
 from flipper.contrib.postgresql import PostgreSQLFeatureFlagStore
 from flipper.contrib.redis import RedisFeatureFlagStore
@@ -20,11 +26,16 @@ from flipper.contrib.replicated import ReplicatedFeatureFlagStore
 from flipper.contrib.s3 import S3FeatureFlagStore
 
 __all__ = [
+    "AbstractInvalidationBus",
+    "CacheEvent",
+    "CacheStats",
     "CachedFeatureFlagStore",
     "ConsulFeatureFlagStore",
+    "LoopbackInvalidationBus",
     "MemoryFeatureFlagStore",
     "PostgreSQLFeatureFlagStore",
     "RedisFeatureFlagStore",
+    "RedisInvalidationBus",
     "ReplicatedFeatureFlagStore",
     "S3FeatureFlagStore",
 ]
@@ -0,0 +1,166 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from bisect import bisect_left
+from collections.abc import Iterable
+
+# Event kinds.
+HIT = "hit"
+NEGATIVE_HIT = "negative_hit"
+MISS = "miss"
+LOAD = "load"
+LOAD_ERROR = "load_error"
+EVICTION = "eviction"
+
+# Eviction causes.
+SIZE = "size"
+EXPIRED = "expired"
+INVALIDATED = "invalidated"
+OVERSIZED = "oversized"
+EVICTION_CAUSES = (SIZE, EXPIRED, INVALIDATED, OVERSIZED)
+
+# Upper bounds, in seconds, of the load latency buckets.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CacheEvent:
+    """
+    Passed to the `on_event` hook of `CachedFeatureFlagStore`. `cause` is
+    set for evictions, and `duration`, in seconds, for loads and load errors.
+    """
+
+    __slots__ = ("cause", "duration", "feature_name", "kind")
+
+    def __init__(
+        self,
+        kind: str,
+        feature_name: str,
+        cause: str | None = None,
+        duration: float | None = None,
+    ) -> None:
+        self.kind = kind
+        self.feature_name = feature_name
+        self.cause = cause
+        self.duration = duration
+
+    def __repr__(self) -> str:
+        return f"CacheEvent({self.kind!r}, {self.feature_name!r}, cause={self.cause!r}, duration={self.duration!r})"
+
+
+class LatencyHistogram:
+    """
+    Counts observations into buckets by upper bound; the last bucket holds
+    everything above the highest bound.
+    """
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._bounds = tuple(sorted(bounds))
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._counts[bisect_left(self._bounds, seconds)] += 1
+        self._sum += seconds
+
+    def copy(self) -> "LatencyHistogram":
+        histogram = LatencyHistogram(self._bounds)
+        histogram._counts = list(self._counts)
+        histogram._sum = self._sum
+        return histogram
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """
+        `(upper bound, count)` pairs, cumulative as in Prometheus, ending
+        with an infinite bound.
+        """
+        total = 0
+        buckets = []
+        for bound, count in zip((*self._bounds, float("inf")), self._counts, strict=True):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Upper bound of the bucket holding the `q` quantile, or None if
+        nothing was observed.
+        """
+        count = self.count
+        if not count:
+            return None
+        rank = q * count
+        for bound, total in self.buckets():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class CacheStats:
+    """
+    Snapshot of the counters of a `CachedFeatureFlagStore`. Negative hits,
+    reads answered from a cached None, are also counted as hits.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        hits: int,
+        negative_hits: int,
+        misses: int,
+        loads: int,
+        load_errors: int,
+        evictions: dict[str, int],
+        load_latency: LatencyHistogram,
+        currsize: float,
+    ) -> None:
+        self.hits = hits
+        self.negative_hits = negative_hits
+        self.misses = misses
+        self.loads = loads
+        self.load_errors = load_errors
+        self.evictions = evictions
+        self.load_latency = load_latency
+        self.currsize = currsize
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "evictions": dict(self.evictions),
+            "load_latency": {
+                "count": self.load_latency.count,
+                "sum": self.load_latency.sum,
+                "buckets": self.load_latency.buckets(),
+            },
+            "currsize": self.currsize,
+        }
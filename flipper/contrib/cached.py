@@ -11,30 +11,256 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
-from collections.abc import Iterator
+import logging
+import math
+import random
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import monotonic, perf_counter
+from typing import Any
+from uuid import uuid4
 
-from cachetools import LRUCache, TTLCache
+from cachetools import Cache, LFUCache, LRUCache
 
+from flipper.contrib.cache_stats import (
+    EVICTION,
+    EVICTION_CAUSES,
+    EXPIRED,
+    HIT,
+    INVALIDATED,
+    LOAD,
+    LOAD_ERROR,
+    MISS,
+    NEGATIVE_HIT,
+    OVERSIZED,
+    SIZE,
+    CacheEvent,
+    CacheStats,
+    LatencyHistogram,
+)
 from flipper.contrib.interface import AbstractFeatureFlagStore
+from flipper.contrib.invalidation import AbstractInvalidationBus
 from flipper.contrib.storage import FeatureFlagStoreItem, FeatureFlagStoreMeta
+from flipper.contrib.util.single_flight import SingleFlight
+from flipper.contrib.util.striped_cache import DEFAULT_SEGMENTS, StripedCache
+from flipper.contrib.util.tinylfu import WTinyLFUCache
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_SIZE = 5000
 DEFAULT_TTL = None
+DEFAULT_REFRESH_WORKERS = 2
+# Added to each item's serialized length in max_bytes mode, for the key, the
+# entry and the dict slot holding it.
+ENTRY_OVERHEAD_BYTES = 100
 
+EVICT = "evict"
+REFRESH = "refresh"
+
+LRU = "lru"
+LFU = "lfu"
+W_TINYLFU = "w-tinylfu"
+EVICTION_POLICIES: dict[str, Callable[[int], Cache]] = {
+    LRU: LRUCache,
+    LFU: LFUCache,
+    W_TINYLFU: WTinyLFUCache,
+}
+
+# Write generations are kept per slot of a fixed table rather than per
+# flag, so that the table stays bounded; two flags sharing a slot only cost
+# a load that is returned but not cached.
+GENERATION_SLOTS = 4096
+
+_MISSING = object()
+# Single-flight key for the bulk read; never equal to a feature name.
+_CATALOG = object()
+
+
+class _Entry:
+    """
+    A cached item and the monotonic times at which it should be refreshed in
+    the background, at which it expires, and after which it is too stale to
+    serve at all.
+    """
+
+    __slots__ = ("expires_at", "item", "refresh_at", "refreshing", "stale_until")
 
-class CachedFeatureFlagStore(AbstractFeatureFlagStore):
     def __init__(
+        self,
+        item: FeatureFlagStoreItem | None,
+        refresh_at: float,
+        expires_at: float,
+        stale_until: float,
+    ) -> None:
+        self.item = item
+        self.refresh_at = refresh_at
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.refreshing = False
+
+
+class _Counters:
+    __slots__ = ("evictions", "hits", "load_errors", "loads", "misses", "negative_hits")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.evictions = dict.fromkeys(EVICTION_CAUSES, 0)
+
+
+class _Catalog:
+    """
+    Every item in the store, in the order `store.list()` returned them, and
+    the monotonic time at which the list expires.
+    """
+
+    __slots__ = ("expires_at", "items", "positions")
+
+    def __init__(self, items: list[FeatureFlagStoreItem], expires_at: float) -> None:
+        self.items = items
+        self.positions = {item.feature_name: i for i, item in enumerate(items)}
+        self.expires_at = expires_at
+
+
+class CachedFeatureFlagStore(AbstractFeatureFlagStore):
+    """
+    Keeps the items read from `store` in a local cache, with an optional TTL
+    in seconds.
+
+    `eviction_policy` picks what is evicted once `size` items are cached:
+    `"lru"` (the default), `"lfu"`, or `"w-tinylfu"`, which keeps frequently
+    read flags cached through scans of cold ones. It can also be any
+    callable that takes a size and returns a `cachetools.Cache`.
+
+    With `max_bytes`, the cache is bounded by weight instead of by `size`:
+    each entry weighs its item's serialized length plus
+    `ENTRY_OVERHEAD_BYTES`, and `currsize` reports the current total. Items
+    heavier than `max_entry_bytes`, or than a whole segment of a concurrent
+    cache, are not cached at all and are read from `store` every time. A
+    callable `eviction_policy` is then also passed `getsizeof`.
+
+    The default cache is not thread-safe. Pass `concurrent=True` when the
+    store is shared between threads: the cache is then split into
+    `segments` independently locked parts and reads take no lock.
+
+    With a TTL, reads never have to block on the store for a hot flag:
+
+    - `refresh_ahead` is a fraction of the TTL. Once an entry is older than
+      that, the next read returns it and reloads it in the background.
+    - `max_stale` is how many seconds past its TTL an entry may still be
+      returned while a background reload runs. Older entries are reloaded
+      before returning.
+    - `ttl_jitter` shortens each entry's TTL by a random fraction up to this
+      much, so flags cached together do not all expire together.
+
+    Background reloads run on a pool of `refresh_workers` threads and
+    imply the concurrent cache.
+
+    With an `invalidation_bus`, every write through this store is announced
+    to the caches of other processes, and announcements from them are applied
+    here: `on_invalidate="evict"` drops the local copy, and `"refresh"`
+    reloads it in the background if it is cached. The bus delivers from its
+    own thread, so it implies the concurrent cache.
+
+    Concurrent misses for the same flag share a single load from `store`.
+    The other callers wait up to `load_timeout` seconds for it, then raise
+    `TimeoutError`, and get the loader's exception if it fails.
+
+    With `cache_catalog=True`, `list` is served from a copy of the whole
+    catalog, read with one `store.list()` call and kept for `catalog_ttl`
+    seconds (the item TTL by default). The same read warms the per-flag
+    entries. `create` and `delete`, and invalidations from other processes,
+    drop the catalog; `set` and `set_meta` update it in place.
+
+    `stats()` returns counts of hits, misses, loads from `store` and
+    evictions by cause, with a histogram of load latencies. The counters are
+    not locked, so under heavy concurrency they can undercount slightly.
+    `on_event`, if given, is called with a `CacheEvent` for each of these.
+    It runs inline, at times under a cache lock, so it should be quick and
+    must not call back into this store.
+    """
+
+    def __init__(  # noqa: PLR0913
         self,
         store: AbstractFeatureFlagStore,
         size: int = DEFAULT_SIZE,
-        ttl: int | None = None,
+        ttl: float | None = None,
+        *,
+        max_bytes: int | None = None,
+        max_entry_bytes: int | None = None,
+        eviction_policy: str | Callable[[int], Cache] = LRU,
+        concurrent: bool = False,
+        segments: int = DEFAULT_SEGMENTS,
+        refresh_ahead: float | None = None,
+        max_stale: float = 0.0,
+        ttl_jitter: float = 0.0,
+        refresh_workers: int = DEFAULT_REFRESH_WORKERS,
+        load_timeout: float | None = None,
+        invalidation_bus: AbstractInvalidationBus | None = None,
+        on_invalidate: str = EVICT,
+        cache_catalog: bool = False,
+        catalog_ttl: float | None = None,
+        on_event: Callable[[CacheEvent], None] | None = None,
     ) -> None:
-        if ttl is not None:
-            self._cache = TTLCache(size, ttl)
-        else:
-            self._cache = LRUCache(size)
+        if ttl is None and (refresh_ahead is not None or max_stale or ttl_jitter):
+            msg = "refresh_ahead, max_stale and ttl_jitter require a ttl"
+            raise ValueError(msg)
+        if refresh_ahead is not None and not 0 < refresh_ahead <= 1:
+            msg = "refresh_ahead must be a fraction of the ttl, between 0 and 1"
+            raise ValueError(msg)
+        if not 0 <= ttl_jitter < 1:
+            msg = "ttl_jitter must be between 0 and 1"
+            raise ValueError(msg)
+        if on_invalidate not in (EVICT, REFRESH):
+            msg = f"on_invalidate must be {EVICT!r} or {REFRESH!r}"
+            raise ValueError(msg)
+        if catalog_ttl is not None and not cache_catalog:
+            msg = "catalog_ttl requires cache_catalog"
+            raise ValueError(msg)
+
+        self._max_entry_bytes = max_entry_bytes
+        self._counters = _Counters()
+        self._load_latency = LatencyHistogram()
+        self._on_event = on_event
+        # Background reloads and invalidations write to the cache from
+        # another thread.
+        striped = concurrent or refresh_ahead is not None or max_stale or invalidation_bus is not None
+        self._cache = self._make_cache(
+            size,
+            eviction_policy,
+            max_bytes,
+            max_entry_bytes,
+            segments=segments if striped else None,
+        )
         self._store = store
         self._ttl = ttl
+        self._refresh_ahead = refresh_ahead
+        self._max_stale = max_stale
+        self._ttl_jitter = ttl_jitter
+        self._refresh_workers = refresh_workers
+        self._single_flight = SingleFlight()
+        self._load_timeout = load_timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._origin = uuid4().hex
+        self._on_invalidate = on_invalidate
+        self._invalidation_bus = invalidation_bus
+        self._cache_catalog = cache_catalog
+        self._catalog_ttl = ttl if catalog_ttl is None else catalog_ttl
+        self._catalog: _Catalog | None = None
+        # Writes and invalidations bump the flag's generation, and the global
+        # one, under this lock. Loads only cache their item if the flag's
+        # generation has not moved since they started, and bulk reads of the
+        # catalog only if no generation has, so neither can undo a write.
+        self._write_lock = threading.Lock()
+        self._generation = 0
+        self._generations = [0] * GENERATION_SLOTS
+        self._unsubscribe = invalidation_bus.subscribe(self._invalidate) if invalidation_bus is not None else None
 
     def create(
         self,
@@ -47,35 +273,354 @@ class CachedFeatureFlagStore(AbstractFeatureFlagStore):
             is_enabled=is_enabled,
             client_data=client_data,
         )
-        self._cache[feature_name] = item
+        self._write(feature_name, item)
+        self._drop_catalog()
+        self._publish(feature_name)
         return item
 
     def get(self, feature_name: str) -> FeatureFlagStoreItem | None:
-        try:
-            return self._cache[feature_name]
-        except KeyError:
-            pass
-
-        item = self._store.get(feature_name)
-        self._cache[feature_name] = item
+        item = self._cached(feature_name)
+        if item is _MISSING:
+            self._record_miss(feature_name)
+            return self._single_flight.do(feature_name, partial(self._load, feature_name), self._load_timeout)
+        # Kept inline: this is the hot path.
+        self._counters.hits += 1
+        if item is None or self._on_event is not None:
+            self._record_hit(feature_name, item)
+        return item
 
+    async def aget(self, feature_name: str) -> FeatureFlagStoreItem | None:
+        """
+        Same as `get`, for asyncio code. A miss loads the item in the event
+        loop's default executor, coalesced with loads already in flight from
+        other threads or coroutines.
+        """
+        item = self._cached(feature_name)
+        if item is _MISSING:
+            self._record_miss(feature_name)
+            return await self._single_flight.ado(feature_name, partial(self._load, feature_name), self._load_timeout)
+        self._counters.hits += 1
+        if item is None or self._on_event is not None:
+            self._record_hit(feature_name, item)
         return item
 
     def set(self, feature_name: str, is_enabled: bool) -> None:
         self._store.set(feature_name, is_enabled)
-        self._cache[feature_name] = self._store.get(feature_name)
+        self._update(feature_name, self._store.get(feature_name))
+        self._publish(feature_name)
 
     def delete(self, feature_name: str) -> None:
         self._store.delete(feature_name)
-        self._cache.pop(feature_name, None)
+        self._write(feature_name, _MISSING)
+        self._drop_catalog()
+        self._publish(feature_name)
 
     def list(
         self,
         limit: int | None = None,
         offset: int = 0,
     ) -> Iterator[FeatureFlagStoreItem]:
-        return self._store.list(limit=limit, offset=offset)
+        if not self._cache_catalog:
+            return self._store.list(limit=limit, offset=offset)
+
+        catalog = self._catalog
+        if catalog is None or (self._catalog_ttl is not None and monotonic() >= catalog.expires_at):
+            catalog = self._single_flight.do(_CATALOG, self._load_catalog, self._load_timeout)
+        stop = None if limit is None else offset + limit
+        return iter(catalog.items[offset:stop])
 
     def set_meta(self, feature_name: str, meta: FeatureFlagStoreMeta) -> None:
         self._store.set_meta(feature_name, meta)
-        self._cache[feature_name] = self._store.get(feature_name)
+        self._update(feature_name, self._store.get(feature_name))
+        self._publish(feature_name)
+
+    def stats(self) -> CacheStats:
+        counters = self._counters
+        return CacheStats(
+            hits=counters.hits,
+            negative_hits=counters.negative_hits,
+            misses=counters.misses,
+            loads=counters.loads,
+            load_errors=counters.load_errors,
+            evictions=dict(counters.evictions),
+            load_latency=self._load_latency.copy(),
+            currsize=self._cache.currsize,
+        )
+
+    @property
+    def currsize(self) -> float:
+        """
+        Number of cached entries, or their total weight in bytes with
+        `max_bytes`.
+        """
+        return self._cache.currsize
+
+    def close(self) -> None:
+        """
+        Stops listening for invalidations and releases the refresh threads.
+        """
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _make_cache(
+        self,
+        size: int,
+        eviction_policy: str | Callable[[int], Cache],
+        max_bytes: int | None,
+        max_entry_bytes: int | None,
+        segments: int | None,
+    ) -> Cache | StripedCache:
+        if callable(eviction_policy):
+            cache_factory = eviction_policy
+        elif eviction_policy in EVICTION_POLICIES:
+            cache_factory = EVICTION_POLICIES[eviction_policy]
+        else:
+            msg = f"eviction_policy must be a callable or one of {', '.join(map(repr, EVICTION_POLICIES))}"
+            raise ValueError(msg)
+        if max_bytes is not None and max_bytes <= 0:
+            msg = "max_bytes must be positive"
+            raise ValueError(msg)
+        if max_entry_bytes is not None and max_bytes is None:
+            msg = "max_entry_bytes requires max_bytes"
+            raise ValueError(msg)
+
+        if max_bytes is not None:
+            cache_factory = partial(cache_factory, getsizeof=self._weigh)
+            size = max_bytes
+        cache_factory = partial(self._counting_evictions, cache_factory)
+        if segments is None:
+            return cache_factory(size)
+        return StripedCache(size, segments=segments, cache_factory=cache_factory)
+
+    def _counting_evictions(self, cache_factory: Callable[..., Cache], *args: Any, **kwargs: Any) -> Cache:
+        cache = cache_factory(*args, **kwargs)
+        popitem = cache.popitem
+
+        def counted_popitem() -> tuple[Any, Any]:
+            key, value = popitem()
+            self._record_eviction(key, SIZE)
+            return key, value
+
+        # `Cache.__setitem__` evicts through `self.popitem()`, which finds
+        # this instance attribute first, whatever the policy.
+        cache.popitem = counted_popitem
+        return cache
+
+    def _cached(self, feature_name: str) -> Any:
+        if self._ttl is None:
+            try:
+                return self._cache[feature_name]
+            except KeyError:
+                return _MISSING
+
+        try:
+            entry = self._cache[feature_name]
+        except KeyError:
+            return _MISSING
+
+        now = monotonic()
+        if now < entry.refresh_at:
+            return entry.item
+        if now < entry.stale_until:
+            self._refresh_in_background(feature_name, entry)
+            return entry.item
+        self._expire(feature_name, entry)
+        return _MISSING
+
+    def _expire(self, feature_name: str, entry: _Entry) -> None:
+        # Only the reader that removes the entry counts it, so an entry that
+        # stays expired, or is read by several threads at once, counts once.
+        with self._write_lock:
+            if self._cache.get(feature_name) is not entry:
+                return
+            self._cache.pop(feature_name, None)
+        self._record_eviction(feature_name, EXPIRED)
+
+    def _load(self, feature_name: str) -> FeatureFlagStoreItem | None:
+        generation = self._generation
+        item = self._fetch(feature_name)
+        self._put_unless_written(feature_name, item, generation)
+        return item
+
+    def _write(self, feature_name: str, item: Any) -> None:
+        """
+        Caches `item`, or drops the entry if it is `_MISSING`, after a write
+        or an invalidation, and marks the flag as written.
+        """
+        with self._write_lock:
+            self._mark_written(feature_name)
+            if item is _MISSING:
+                self._cache.pop(feature_name, None)
+            else:
+                self._put(feature_name, item)
+
+    def _mark_written(self, feature_name: str) -> None:
+        # Must hold the write lock.
+        self._generation += 1
+        self._generations[hash(feature_name) % GENERATION_SLOTS] = self._generation
+
+    def _put_unless_written(self, feature_name: str, item: FeatureFlagStoreItem | None, generation: int) -> bool:
+        """
+        Caches `item`, read from the store once `generation` was current,
+        unless the flag was written or invalidated since.
+        """
+        with self._write_lock:
+            if self._generations[hash(feature_name) % GENERATION_SLOTS] > generation:
+                return False
+            self._put(feature_name, item)
+            return True
+
+    def _fetch(self, feature_name: str) -> FeatureFlagStoreItem | None:
+        started = perf_counter()
+        try:
+            item = self._store.get(feature_name)
+        except Exception:
+            self._counters.load_errors += 1
+            if self._on_event is not None:
+                self._emit(CacheEvent(LOAD_ERROR, feature_name, duration=perf_counter() - started))
+            raise
+        duration = perf_counter() - started
+        self._counters.loads += 1
+        self._load_latency.observe(duration)
+        if self._on_event is not None:
+            self._emit(CacheEvent(LOAD, feature_name, duration=duration))
+        return item
+
+    def _put(self, feature_name: str, item: FeatureFlagStoreItem | None) -> None:
+        try:
+            self._cache[feature_name] = item if self._ttl is None else self._entry(item)
+        except ValueError:
+            # Too heavy to cache; drop the previous copy so that reads go to
+            # the store instead of returning it.
+            self._cache.pop(feature_name, None)
+            self._record_eviction(feature_name, OVERSIZED)
+
+    def _weigh(self, value: Any) -> float:
+        item = value.item if isinstance(value, _Entry) else value
+        weight = ENTRY_OVERHEAD_BYTES + (0 if item is None else len(item.serialize()))
+        if self._max_entry_bytes is not None and weight > self._max_entry_bytes:
+            # Heavier than any cache, so that it refuses the entry.
+            return math.inf
+        return weight
+
+    def _update(self, feature_name: str, item: FeatureFlagStoreItem | None) -> None:
+        self._write(feature_name, item)
+        catalog = self._catalog
+        if catalog is None:
+            return
+        if item is not None and feature_name in catalog.positions:
+            catalog.items[catalog.positions[feature_name]] = item
+        else:
+            # set() creates missing flags, which the catalog cannot place.
+            self._drop_catalog()
+
+    def _load_catalog(self) -> _Catalog:
+        generation = self._generation
+        items = list(self._store.list())
+        expires_at = float("inf") if self._catalog_ttl is None else monotonic() + self._catalog_ttl
+        catalog = _Catalog(items, expires_at)
+        with self._write_lock:
+            # Anything written since the read started may be missing from or
+            # outdated in it; it is returned to this caller only.
+            if generation == self._generation:
+                for item in items:
+                    self._put(item.feature_name, item)
+                self._catalog = catalog
+        return catalog
+
+    def _drop_catalog(self) -> None:
+        self._catalog = None
+
+    def _entry(self, item: FeatureFlagStoreItem | None) -> _Entry:
+        ttl = self._ttl * (1 - self._ttl_jitter * random.random())  # noqa: S311
+        now = monotonic()
+        expires_at = now + ttl
+        refresh_at = expires_at if self._refresh_ahead is None else now + ttl * self._refresh_ahead
+        return _Entry(item, refresh_at, expires_at, expires_at + self._max_stale)
+
+    def _refresh_in_background(self, feature_name: str, entry: _Entry) -> None:
+        if entry.refreshing:
+            return
+        entry.refreshing = True
+        self._get_executor().submit(self._refresh, feature_name, entry)
+
+    def _refresh(self, feature_name: str, entry: _Entry) -> None:
+        generation = self._generation
+        try:
+            item = self._single_flight.do(feature_name, partial(self._fetch, feature_name))
+        except Exception:
+            # The stale entry keeps being served until it is too old, and the
+            # next read schedules another attempt.
+            logger.exception("Failed to refresh cached feature flag %s", feature_name)
+            entry.refreshing = False
+            return
+        # A write or invalidation since the refresh started wins.
+        if self._cache.get(feature_name) is entry and not self._put_unless_written(feature_name, item, generation):
+            entry.refreshing = False
+
+    def _publish(self, feature_name: str) -> None:
+        if self._invalidation_bus is not None:
+            self._invalidation_bus.publish(feature_name, origin=self._origin)
+
+    def _invalidate(self, feature_name: str, origin: str | None) -> None:
+        if origin == self._origin:
+            # Our own write, already applied to this cache.
+            return
+        # The announcement does not say whether the flag was created or
+        # deleted, so the list has to be read again.
+        self._drop_catalog()
+        if self._on_invalidate == REFRESH and feature_name in self._cache:
+            # The cached copy is served until the reload replaces it; loads
+            # that started before now will not cache what they read.
+            with self._write_lock:
+                self._mark_written(feature_name)
+            self._get_executor().submit(self._reload, feature_name)
+            return
+        cached = feature_name in self._cache
+        self._write(feature_name, _MISSING)
+        if cached:
+            self._record_eviction(feature_name, INVALIDATED)
+
+    def _reload(self, feature_name: str) -> None:
+        try:
+            self._single_flight.do(feature_name, partial(self._load, feature_name))
+        except Exception:
+            # Drop the copy we know to be outdated; the next read retries.
+            logger.exception("Failed to reload invalidated feature flag %s", feature_name)
+            self._cache.pop(feature_name, None)
+
+    def _record_hit(self, feature_name: str, item: FeatureFlagStoreItem | None) -> None:
+        # `hits` is counted by the caller.
+        if item is None:
+            self._counters.negative_hits += 1
+        if self._on_event is not None:
+            self._emit(CacheEvent(HIT if item is not None else NEGATIVE_HIT, feature_name))
+
+    def _record_miss(self, feature_name: str) -> None:
+        self._counters.misses += 1
+        if self._on_event is not None:
+            self._emit(CacheEvent(MISS, feature_name))
+
+    def _record_eviction(self, feature_name: str, cause: str) -> None:
+        self._counters.evictions[cause] += 1
+        if self._on_event is not None:
+            self._emit(CacheEvent(EVICTION, feature_name, cause=cause))
+
+    def _emit(self, event: CacheEvent) -> None:
+        try:
+            self._on_event(event)
+        except Exception:
+            logger.exception("Cache event hook failed for %r", event)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._refresh_workers,
+                        thread_name_prefix="flipper-cache-refresh",
+                    )
+        return self._executor
@@ -0,0 +1,197 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from abc import ABCMeta, abstractmethod
+from collections.abc import Callable
+
+from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = "flipper:invalidations"
+DEFAULT_RECONNECT_INTERVAL = 1.0
+
+# Called with the feature name and the origin the publisher passed.
+InvalidationCallback = Callable[[str, str | None], None]
+
+
+class AbstractInvalidationBus(metaclass=ABCMeta):
+    """
+    Channel over which caches announce that a flag changed, so that caches
+    in other processes drop or reload their copy.
+    """
+
+    @abstractmethod
+    def publish(self, feature_name: str, origin: str | None = None) -> None:
+        pass
+
+    @abstractmethod
+    def subscribe(self, callback: InvalidationCallback) -> Callable[[], None]:
+        """
+        Calls `callback` for every published invalidation until the returned
+        function is called.
+        """
+
+    def close(self) -> None:  # noqa: B027
+        pass
+
+
+class LoopbackInvalidationBus(AbstractInvalidationBus):
+    """
+    In-process bus that delivers each invalidation synchronously, in the
+    publishing thread. Stands in for a real bus in tests and single-process
+    deployments.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._callbacks: list[InvalidationCallback] = []
+
+    def publish(self, feature_name: str, origin: str | None = None) -> None:
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            _deliver(callback, feature_name, origin)
+
+    def subscribe(self, callback: InvalidationCallback) -> Callable[[], None]:
+        with self._lock:
+            self._callbacks.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+        return unsubscribe
+
+
+class RedisInvalidationBus(AbstractInvalidationBus):
+    """
+    Bus over Redis pub/sub. Invalidations are published as JSON on `channel`,
+    and a daemon thread, started with the first subscription, listens for
+    them. Pub/sub does not store messages, so invalidations sent while a
+    process is disconnected are lost; keep a TTL on the cache as a backstop.
+
+    When the connection fails, the listener logs the error and subscribes
+    again every `reconnect_interval` seconds until it succeeds. A forked
+    child, such as a preloaded gunicorn worker, starts its own listener.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        channel: str = DEFAULT_CHANNEL,
+        poll_interval: float = 0.01,
+        reconnect_interval: float = DEFAULT_RECONNECT_INTERVAL,
+    ) -> None:
+        self._redis = redis
+        self._channel = channel
+        self._poll_interval = poll_interval
+        self._reconnect_interval = reconnect_interval
+        self._lock = threading.Lock()
+        self._callbacks: list[InvalidationCallback] = []
+        self._thread = None
+        _buses.add(self)
+
+    def publish(self, feature_name: str, origin: str | None = None) -> None:
+        self._redis.publish(self._channel, json.dumps({"feature_name": feature_name, "origin": origin}))
+
+    def subscribe(self, callback: InvalidationCallback) -> Callable[[], None]:
+        with self._lock:
+            self._callbacks.append(callback)
+            if self._thread is None:
+                self._thread = self._listen()
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+        return unsubscribe
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.stop()
+            thread.join()
+
+    def _listen(self):  # noqa: ANN202
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self._channel: self._on_message})
+        return pubsub.run_in_thread(
+            sleep_time=self._poll_interval,
+            daemon=True,
+            exception_handler=self._on_listener_error,
+        )
+
+    def _on_listener_error(self, error: BaseException, pubsub, thread) -> None:  # noqa: ANN001, ARG002
+        # Runs in the listener thread, which polls again afterwards. Without
+        # the pause, a dead connection would spin the thread.
+        logger.warning("Invalidation listener on %s failed: %r; reconnecting", self._channel, error)
+        time.sleep(self._reconnect_interval)
+        try:
+            # The pubsub's connect callback subscribes to the channel again.
+            pubsub.connection.disconnect()
+            pubsub.connection.connect()
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Failed to reconnect invalidation listener on %s: %r", self._channel, e)
+
+    def _after_fork(self) -> None:
+        # The parent's listener thread does not exist in the child, and the
+        # lock may have been held at the time of the fork.
+        self._lock = threading.Lock()
+        self._thread = None
+        if self._callbacks:
+            self._thread = self._listen()
+
+    def _on_message(self, message: dict) -> None:
+        try:
+            data = json.loads(message["data"])
+            feature_name, origin = data["feature_name"], data.get("origin")
+        except (TypeError, ValueError, KeyError):
+            logger.warning("Ignoring malformed invalidation message: %r", message.get("data"))
+            return
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            _deliver(callback, feature_name, origin)
+
+
+_buses: "weakref.WeakSet[RedisInvalidationBus]" = weakref.WeakSet()
+
+
+def _restart_listeners_after_fork() -> None:
+    for bus in list(_buses):
+        try:
+            bus._after_fork()  # noqa: SLF001
+        except Exception:
+            logger.exception("Failed to restart invalidation listener after fork")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+
+
+def _deliver(callback: InvalidationCallback, feature_name: str, origin: str | None) -> None:
+    # One subscriber failing must not keep the others from hearing about it.
+    try:
+        callback(feature_name, origin)
+    except Exception:
+        logger.exception("Invalidation subscriber failed for %s", feature_name)
@@ -11,7 +11,8 @@
 # CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+from .index import FeatureFlagRuleIndex
 from .item import FeatureFlagStoreItem
 from .meta import FeatureFlagStoreMeta
 
-__all__ = ["FeatureFlagStoreItem", "FeatureFlagStoreMeta"]
+__all__ = ["FeatureFlagRuleIndex", "FeatureFlagStoreItem", "FeatureFlagStoreMeta"]
@@ -0,0 +1,113 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import json
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from flipper.bucketing import ConsistentHashPercentageBucketer, VariantBucketer
+from flipper.context import EvaluationContext
+
+from .item import FeatureFlagStoreItem
+
+if TYPE_CHECKING:
+    from flipper.conditions.check import Check
+
+HASHING_BUCKETERS = (ConsistentHashPercentageBucketer, VariantBucketer)
+
+
+class _IndexedFlag:
+    __slots__ = ("checks", "item", "name")
+
+    def __init__(self, item: FeatureFlagStoreItem, checks: list[tuple[str, str | None, int]]) -> None:
+        self.name = item.feature_name
+        self.item = item
+        self.checks = checks
+
+
+class FeatureFlagRuleIndex:
+    """
+    Snapshot of many flags, indexed so they can all be evaluated against one
+    context cheaply.
+
+    Identical checks (same variable, operator and value) are shared across
+    flags, so each distinct check runs at most once per context no matter how
+    many flags use it. Results match calling `is_enabled` on each item.
+    """
+
+    def __init__(self, items: Iterable[FeatureFlagStoreItem]) -> None:
+        self._checks: list[Check] = []
+        self._check_ids: dict[tuple[str, str | None, str], int] = {}
+        self._flags = [_IndexedFlag(item, self._index_checks(item)) for item in items]
+        # Hash-bucketed flags share one identity digest per context, which
+        # needs the context wrapped; otherwise plain dicts are read directly.
+        self._shares_identity = sum(isinstance(flag.item.bucketer, HASHING_BUCKETERS) for flag in self._flags) > 1
+
+    def _index_checks(self, item: FeatureFlagStoreItem) -> list[tuple[str, str | None, int]]:
+        indexed = []
+        for condition in item.conditions:
+            for check in condition.iter_checks():
+                key = (check.variable, check.operator.SYMBOL, _value_key(check))
+                check_id = self._check_ids.get(key)
+                if check_id is None:
+                    check_id = self._check_ids[key] = len(self._checks)
+                    self._checks.append(check)
+                # The root is only read when the variable is a dotted path.
+                indexed.append((check.variable, check.root if check.has_path else None, check_id))
+        return indexed
+
+    @property
+    def feature_names(self) -> list[str]:
+        return [flag.name for flag in self._flags]
+
+    @property
+    def distinct_check_count(self) -> int:
+        return len(self._checks)
+
+    def evaluate(self, **conditions) -> dict[str, bool]:  # noqa: ANN003
+        return self.evaluate_context(conditions)
+
+    def evaluate_context(self, context: Mapping[str, Any]) -> dict[str, bool]:
+        context = EvaluationContext.of(context) if self._shares_identity else EvaluationContext.wrap(context)
+        results: list[bool | None] = [None] * len(self._checks)
+        return {flag.name: self._evaluate_flag(flag, context, results) for flag in self._flags}
+
+    def _evaluate_flag(
+        self,
+        flag: _IndexedFlag,
+        context: Mapping[str, Any],
+        results: list[bool | None],
+    ) -> bool:
+        item = flag.item
+        if item.raw_is_enabled is False:
+            return False
+
+        if context and flag.checks:
+            for variable, root, check_id in flag.checks:
+                if variable not in context and (root is None or root not in context):
+                    continue
+                passed = results[check_id]
+                if passed is None:
+                    passed = results[check_id] = self._checks[check_id].check_context(context) is not False
+                if not passed:
+                    return False
+            return True
+
+        return item.is_enabled_context(context)
+
+
+def _value_key(check: "Check") -> str:
+    # JSON keeps 1, 1.0 and True apart, unlike hashing the values themselves,
+    # and the value type keeps an "int" check apart from an untyped one.
+    value_type = check.value_type.NAME if check.value_type is not None else None
+    return json.dumps([value_type, check.value], sort_keys=True, default=repr)
@@ -12,13 +12,26 @@
 # language governing permissions and limitations under the License.
 
 import json
+from collections.abc import Mapping
+from typing import Any
 
-from flipper.bucketing import NoOpBucketer
+from flipper.bucketing import NoOpBucketer, VariantBucketer
+from flipper.bucketing.base import AbstractBucketer
+from flipper.conditions import AdaptiveOrdering, CompiledConditions, Condition
+from flipper.context import EvaluationContext
 
 from .meta import FeatureFlagStoreMeta
 
+# Conditions are compiled on an item's Nth evaluation, once it is reused.
+# Compiling costs a few linear evaluations, so an item deserialized for a
+# single check, as by stores without a cache, keeps evaluating each
+# `Condition` in turn.
+COMPILE_AFTER_EVALUATIONS = 2
+
 
 class FeatureFlagStoreItem:
+    _adaptive_ordering: AdaptiveOrdering | None = None
+
     def __init__(
         self,
         feature_name: str,
@@ -28,6 +41,17 @@ class FeatureFlagStoreItem:
         self.feature_name = feature_name
         self._is_enabled = is_enabled
         self._meta = meta
+        self._compiled_conditions: CompiledConditions | None = None
+        self._evaluations = 0
+
+    @classmethod
+    def configure_adaptive_ordering(cls, adaptive_ordering: AdaptiveOrdering | None) -> None:
+        """
+        Turns sampled, selectivity-based reordering of condition checks on (or
+        off with `None`) for every item compiled from now on. Each item keeps
+        its own statistics.
+        """
+        cls._adaptive_ordering = adaptive_ordering
 
     def to_dict(self):  # noqa: ANN201
         return {
@@ -54,19 +78,71 @@ class FeatureFlagStoreItem:
         return self._is_enabled
 
     def is_enabled(self, **conditions) -> bool:  # noqa: ANN003
+        return self.is_enabled_context(conditions)
+
+    def is_enabled_context(self, context: Mapping[str, Any]) -> bool:
+        """
+        Same as `is_enabled`, for a context given as a mapping. Values may be
+        zero-argument callables or come from a lazy mapping; each one is
+        resolved only if a check or the bucketer reads it.
+        """
         if self._is_enabled is False:
             return False
 
-        if conditions and self._has_conditions():
-            return self._all_conditions_satisfied(**conditions)
+        # Only wrapped on the branches that read it, which plain flags skip.
+        if context and self._has_conditions():
+            return self._conditions_satisfied(EvaluationContext.wrap(context))
 
         if self._has_bucketer():
-            return self._meta.bucketer.check(**conditions)
+            context = EvaluationContext.wrap(context)
+            if isinstance(context, EvaluationContext):
+                return self._meta.bucketer.check_context(context)
+            return self._meta.bucketer.check(**context)
 
         return True
 
-    def _all_conditions_satisfied(self, **conditions) -> bool:  # noqa: ANN003
-        return all(c.check(**conditions) for c in self._meta.conditions)
+    def get_variant(self, **conditions) -> str | None:  # noqa: ANN003
+        return self.get_variant_context(conditions)
+
+    def get_variant_context(self, context: Mapping[str, Any]) -> str | None:
+        """
+        Returns the variant a `VariantBucketer` assigns to the context, or
+        `None` when the flag is disabled, a condition fails, the context falls
+        outside every variant, or the flag has no variant bucketer.
+        """
+        bucketer = self._meta.bucketer
+        if self._is_enabled is False or not isinstance(bucketer, VariantBucketer):
+            return None
+
+        context = EvaluationContext.wrap(context)
+
+        if context and self._has_conditions() and not self._conditions_satisfied(context):
+            return None
+        return bucketer.variant_context(context)
+
+    @property
+    def conditions(self) -> list[Condition]:
+        return self._meta.conditions
+
+    @property
+    def bucketer(self) -> AbstractBucketer:
+        return self._meta.bucketer
+
+    @property
+    def compiled_conditions(self) -> CompiledConditions:
+        if self._compiled_conditions is None:
+            self._compiled_conditions = CompiledConditions(
+                self._meta.conditions,
+                adaptive_ordering=self._adaptive_ordering,
+            )
+        return self._compiled_conditions
+
+    def _conditions_satisfied(self, context: Mapping[str, Any]) -> bool:
+        if self._compiled_conditions is None:
+            self._evaluations += 1
+            if self._evaluations < COMPILE_AFTER_EVALUATIONS:
+                return all(condition.check_context(context) for condition in self._meta.conditions)
+        return self.compiled_conditions.check_context(context)
 
     def _has_bucketer(self) -> bool:
         return self._meta.bucketer.get_type() != NoOpBucketer.get_type()
@@ -0,0 +1,72 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import asyncio
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    function, and callers that arrive while it runs wait for its result, or
+    its exception, instead of running it again.
+
+    Waiters give up with `TimeoutError` after `timeout` seconds; the call
+    itself carries on. Coroutines can join the same calls through `ado`, which
+    runs the function in the event loop's default executor.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: float | None = None) -> Any:
+        call, leader = self._join(key)
+        if leader:
+            self._run(key, call, fn)
+        return call.result(timeout)
+
+    async def ado(self, key: Hashable, fn: Callable[[], Any], timeout: float | None = None) -> Any:
+        call, leader = self._join(key)
+        if leader:
+            asyncio.get_running_loop().run_in_executor(None, self._run, key, call, fn)
+        # Shielded, so that a waiter timing out or being cancelled does not
+        # cancel the call for everyone else.
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(call)), timeout)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = Future()
+            call.set_running_or_notify_cancel()
+            return call, True
+
+    def _run(self, key: Hashable, call: Future, fn: Callable[[], Any]) -> None:
+        try:
+            result = fn()
+        except BaseException as e:  # noqa: BLE001
+            # Raised to every waiter, the caller that ran it included.
+            call.set_exception(e)
+        else:
+            call.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,132 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+import math
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from cachetools import Cache, LRUCache
+
+DEFAULT_SEGMENTS = 16
+# Recorded reads are applied to a segment's LRU order once this many are
+# pending, if its lock is free; older reads are dropped when the buffer is full.
+# For policies other than LRU, replaying a read records the access.
+READ_BUFFER_DRAIN = 32
+READ_BUFFER_SIZE = 128
+
+# The base class lookup is a single dict read: it neither takes a lock nor
+# touches the LRU order, so it is safe while another thread writes.
+_peek = Cache.__getitem__
+
+
+class _Segment:
+    __slots__ = ("cache", "lock", "reads")
+
+    def __init__(self, cache: Cache) -> None:
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.reads: deque[Hashable] = deque(maxlen=READ_BUFFER_SIZE)
+
+    def try_drain(self) -> None:
+        if self.lock.acquire(blocking=False):
+            try:
+                self.drain()
+            finally:
+                self.lock.release()
+
+    def drain(self) -> None:
+        # Must hold the lock.
+        cache = self.cache
+        reads = self.reads
+        while True:
+            try:
+                key = reads.popleft()
+            except IndexError:
+                return
+            if key in cache:
+                # Reading through the cache moves the key to the front.
+                cache[key]
+
+
+class StripedCache:
+    """
+    Thread-safe LRU cache for concurrent readers.
+
+    Keys are spread by hash over independently locked segments, so writers
+    to different segments never wait on each other. Reads take no lock at
+    all: values are treated as immutable and read straight from the
+    segment's dict, and each hit is recorded in a small buffer that is
+    applied to the segment's LRU order the next time its lock is taken.
+    Eviction is per segment, so the whole cache holds about `maxsize` items.
+
+    Each segment is a `cachetools.Cache` made by `cache_factory`, called with
+    the segment's share of `maxsize`, which decides what to evict.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        segments: int = DEFAULT_SEGMENTS,
+        cache_factory: Callable[[int], Cache] = LRUCache,
+    ) -> None:
+        count = 1 << max(0, math.ceil(math.log2(max(1, segments))))
+        self._mask = count - 1
+        self._segments = [_Segment(cache_factory(max(1, math.ceil(maxsize / count)))) for _ in range(count)]
+
+    @property
+    def segments(self) -> int:
+        return len(self._segments)
+
+    @property
+    def currsize(self) -> float:
+        return sum(segment.cache.currsize for segment in self._segments)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        segment = self._segments[hash(key) & self._mask]
+        value = _peek(segment.cache, key)
+        reads = segment.reads
+        reads.append(key)
+        if len(reads) >= READ_BUFFER_DRAIN:
+            segment.try_drain()
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        segment = self._segments[hash(key) & self._mask]
+        with segment.lock:
+            segment.drain()
+            segment.cache[key] = value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._segments[hash(key) & self._mask].cache
+
+    def __len__(self) -> int:
+        return sum(len(segment.cache) for segment in self._segments)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        segment = self._segments[hash(key) & self._mask]
+        with segment.lock:
+            return segment.cache.pop(key, default)
+
+    def clear(self) -> None:
+        for segment in self._segments:
+            with segment.lock:
+                segment.cache.clear()
+                segment.reads.clear()
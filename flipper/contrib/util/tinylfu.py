@@ -0,0 +1,190 @@
+# Copyright 2018 eShares, Inc. dba Carta, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from cachetools import Cache
+
+DEFAULT_WINDOW = 0.01
+DEFAULT_PROTECTED = 0.8
+
+SKETCH_DEPTH = 4
+# Counters per row for each cached item; fewer means more collisions.
+SKETCH_WIDTH_FACTOR = 4
+# Counters saturate here, which is plenty to tell hot keys from cold ones.
+SKETCH_MAX_COUNT = 15
+# All counters are halved once this many increments per cached item have
+# been recorded, so that keys which stopped being popular fade out.
+SKETCH_SAMPLE_FACTOR = 10
+
+_SEEDS = (0x97CB3127, 0xB492B66F, 0x9AE16A3B, 0xCBF29CE4)
+_HALVE = bytes(count >> 1 for count in range(256))
+_MASK_64 = (1 << 64) - 1
+
+
+class CountMinSketch:
+    """
+    Approximate access counts in a fixed amount of memory: `SKETCH_DEPTH`
+    rows of small counters, each row indexed by a different hash of the key.
+    A key's frequency is its smallest counter, which can overestimate but
+    never underestimates until the periodic halving.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        width = 1 << max(4, (SKETCH_WIDTH_FACTOR * max(1, capacity) - 1).bit_length())
+        self._width = width
+        self._mask = width - 1
+        self._table = bytearray(SKETCH_DEPTH * width)
+        self._sample_size = SKETCH_SAMPLE_FACTOR * max(1, capacity)
+        self._additions = 0
+
+    def frequency(self, key: Hashable) -> int:
+        table = self._table
+        return min(table[index] for index in self._indexes(key))
+
+    def increment(self, key: Hashable) -> None:
+        table = self._table
+        for index in self._indexes(key):
+            if table[index] < SKETCH_MAX_COUNT:
+                table[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._table = table.translate(_HALVE)
+            self._additions //= 2
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        h = hash(key)
+        width, mask = self._width, self._mask
+        return [
+            row * width + ((((h ^ seed) * 0x9E3779B97F4A7C15) & _MASK_64) >> 32 & mask)
+            for row, seed in enumerate(_SEEDS)
+        ]
+
+
+class WTinyLFUCache(Cache):
+    """
+    Cache with the W-TinyLFU policy, which keeps frequently used keys through
+    bursts of one-off reads, such as a scan over every flag.
+
+    New keys enter a small LRU admission window of `window` of the cache.
+    When the cache is full, the oldest key in the window only moves on to the
+    main cache if a count-min sketch of recent accesses says it is used more
+    often than the key the main cache would evict; otherwise it is dropped.
+    The main cache is a segmented LRU, with `protected` of it reserved for
+    keys read at least twice.
+    """
+
+    def __init__(
+        self,
+        maxsize: float,
+        getsizeof: Callable[[Any], float] | None = None,
+        window: float = DEFAULT_WINDOW,
+        protected: float = DEFAULT_PROTECTED,
+    ) -> None:
+        Cache.__init__(self, maxsize, getsizeof)
+        self._window_max = max(1, round(maxsize * window))
+        self._protected_max = (maxsize - self._window_max) * protected
+        # Keys in LRU order, mapped to their size.
+        self._window: OrderedDict[Hashable, float] = OrderedDict()
+        self._probation: OrderedDict[Hashable, float] = OrderedDict()
+        self._protected: OrderedDict[Hashable, float] = OrderedDict()
+        self._window_size = 0
+        self._protected_size = 0
+        self._sketch = CountMinSketch(int(maxsize))
+
+    def __getitem__(self, key: Hashable, cache_getitem: Callable = Cache.__getitem__) -> Any:
+        value = cache_getitem(self, key)
+        if key in self:  # __missing__ may not store item
+            self._sketch.increment(key)
+            self._touch(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any, cache_setitem: Callable = Cache.__setitem__) -> None:
+        cache_setitem(self, key, value)
+        self._sketch.increment(key)
+        # An updated key stays in its segment; a new one enters the window.
+        segment, _ = self._unlink(key)
+        self._link(segment, key, self.getsizeof(value))
+        self._rebalance()
+
+    def __delitem__(self, key: Hashable, cache_delitem: Callable = Cache.__delitem__) -> None:
+        cache_delitem(self, key)
+        self._unlink(key)
+
+    def frequency(self, key: Hashable) -> int:
+        return self._sketch.frequency(key)
+
+    def popitem(self) -> tuple[Hashable, Any]:
+        """
+        Remove and return the `(key, value)` pair that loses admission: the
+        oldest key in the window or the main cache's victim, whichever is
+        used less often.
+        """
+        victim = next(iter(self._probation or self._protected), None)
+        if not self._window or (victim is not None and self._window_size < self._window_max):
+            key = victim
+        else:
+            candidate = next(iter(self._window))
+            if victim is None or self._sketch.frequency(candidate) <= self._sketch.frequency(victim):
+                key = candidate
+            else:
+                self._link(self._probation, candidate, self._unlink(candidate)[1])
+                key = victim
+        if key is None:
+            msg = f"{type(self).__name__} is empty"
+            raise KeyError(msg)
+        value = Cache.__getitem__(self, key)
+        del self[key]
+        return key, value
+
+    def _touch(self, key: Hashable) -> None:
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            self._link(self._protected, key, self._unlink(key)[1])
+            self._rebalance()
+        else:
+            self._protected.move_to_end(key)
+
+    def _link(self, segment: OrderedDict, key: Hashable, size: float) -> None:
+        segment[key] = size
+        if segment is self._window:
+            self._window_size += size
+        elif segment is self._protected:
+            self._protected_size += size
+
+    def _unlink(self, key: Hashable) -> tuple[OrderedDict, float]:
+        # Returns the segment the key was in, the window if none, and its size.
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                size = segment.pop(key)
+                if segment is self._window:
+                    self._window_size -= size
+                elif segment is self._protected:
+                    self._protected_size -= size
+                return segment, size
+        return self._window, 0
+
+    def _rebalance(self) -> None:
+        # Overflow from the window and the protected segment goes on
+        # probation; the total size is already bounded by `Cache`.
+        while self._window_size > self._window_max and len(self._window) > 1:
+            key, size = self._window.popitem(last=False)
+            self._window_size -= size
+            self._probation[key] = size
+        while self._protected_size > self._protected_max and len(self._protected) > 1:
+            key, size = self._protected.popitem(last=False)
+            self._protected_size -= size
+            self._probation[key] = size
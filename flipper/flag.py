@@ -28,6 +28,9 @@ class FeatureFlag:
     def is_enabled(self, default=False, **conditions) -> bool:  # noqa: ANN001, ANN003
         return self._client.is_enabled(self.name, default=default, **conditions)
 
+    def get_variant(self, default: str | None = None, **conditions) -> str | None:  # noqa: ANN003
+        return self._client.get_variant(self.name, default=default, **conditions)
+
     def exists(self):  # noqa: ANN201
         return self._client.exists(self.name)
 
@@ -0,0 +1,95 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from flipper.bucketing.percentage import (
+    CoarseClock,
+    FakeClock,
+    SystemClock,
+    get_default_clock,
+    set_default_clock,
+)
+from flipper.bucketing.percentage.clock import _reset_clocks_after_fork
+
+
+class TestSystemClock(unittest.TestCase):
+    def test_returns_current_time(self) -> None:
+        before = time.time()
+        now = SystemClock().now()
+        assert before <= now <= time.time()
+
+
+class TestCoarseClock(unittest.TestCase):
+    def test_refreshes_on_call_count(self) -> None:
+        with patch("flipper.bucketing.percentage.clock.time.time", return_value=100.0):
+            clock = CoarseClock(refresh_every=3)
+
+        with patch("flipper.bucketing.percentage.clock.time.time", return_value=200.0):
+            readings = [clock.now() for _ in range(4)]
+
+        assert readings == [100.0, 100.0, 200.0, 200.0]
+
+    def test_refreshes_in_background(self) -> None:
+        clock = CoarseClock(resolution=0.001)
+        first = clock.now()
+        time.sleep(0.05)
+        assert clock.now() > first
+
+    def test_close_stops_the_thread(self) -> None:
+        clock = CoarseClock(resolution=0.001)
+        clock.now()
+        thread = clock._thread  # noqa: SLF001
+
+        clock.close()
+
+        assert not thread.is_alive()
+        assert clock._thread is None  # noqa: SLF001
+
+    def test_restarts_after_close(self) -> None:
+        clock = CoarseClock(resolution=0.001)
+        clock.now()
+        clock.close()
+
+        first = clock.now()
+        time.sleep(0.05)
+        assert clock.now() > first
+        clock.close()
+
+    def test_restarts_in_forked_child(self) -> None:
+        clock = CoarseClock(resolution=0.001)
+        clock.now()
+        parent_stopped = clock._stopped  # noqa: SLF001
+
+        _reset_clocks_after_fork()
+        parent_stopped.set()
+
+        assert clock._thread is None  # noqa: SLF001
+        first = clock.now()
+        time.sleep(0.05)
+        assert clock.now() > first
+        clock.close()
+
+
+class TestFakeClock(unittest.TestCase):
+    def test_moves_only_when_told_to(self) -> None:
+        clock = FakeClock(10)
+        assert clock.now() == 10  # noqa: PLR2004
+
+        clock.advance(5)
+        assert clock.now() == 15  # noqa: PLR2004
+
+        clock.set(3)
+        assert clock.now() == 3  # noqa: PLR2004
+
+
+class TestDefaultClock(unittest.TestCase):
+    def test_set_returns_previous_clock(self) -> None:
+        clock = FakeClock()
+        previous = set_default_clock(clock)
+        try:
+            assert get_default_clock() is clock
+        finally:
+            assert set_default_clock(previous) is clock
+
+    def test_is_system_clock_by_default(self) -> None:
+        assert isinstance(get_default_clock(), SystemClock)
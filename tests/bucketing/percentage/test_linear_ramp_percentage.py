@@ -1,8 +1,10 @@
 import unittest
 from datetime import datetime, timedelta
-from unittest.mock import patch
+
+import pytest
 
 from flipper.bucketing import LinearRampPercentage
+from flipper.bucketing.percentage import FakeClock, set_default_clock
 
 
 class TestGetType(unittest.TestCase):
@@ -27,16 +29,9 @@ class TestValue(unittest.TestCase):
         )
         assert final_value == percentage.value
 
-    @patch("flipper.bucketing.percentage.linear_ramp_percentage.datetime")
-    def test_returns_a_value_that_is_linearly_interpolated_between_initial_and_final_value_by_time(
-        self,
-        mock_datetime,
-    ) -> None:
+    def test_returns_a_value_that_is_linearly_interpolated_between_initial_and_final_value_by_time(self) -> None:
         now = datetime(2018, 1, 1)  # noqa: DTZ001
 
-        mock_datetime.now.return_value = now
-        mock_datetime.fromtimestamp = datetime.fromtimestamp
-
         initial_value = 0.2
         final_value = 0.6
         ramp_duration = 60
@@ -50,23 +45,19 @@ class TestValue(unittest.TestCase):
             final_value=final_value,
             ramp_duration=ramp_duration,
             initial_time=initial_time,
+            clock=FakeClock(now.timestamp()),
         )
 
         value_delta = final_value - initial_value
         expected = value_delta * expected_percentage + initial_value
 
-        assert expected == percentage.value
+        assert expected == pytest.approx(percentage.value)
 
-    @patch("flipper.bucketing.percentage.linear_ramp_percentage.datetime")
     def test_when_ramp_duration_is_longer_than_one_hour_and_ramp_has_completed_it_computes_value_correctly(
         self,
-        mock_datetime,
     ) -> None:
         now = datetime(2020, 10, 28)  # noqa: DTZ001
 
-        mock_datetime.now.return_value = now
-        mock_datetime.fromtimestamp = datetime.fromtimestamp
-
         initial_value = 0.1
         final_value = 1
         ramp_duration = 1601314960
@@ -80,6 +71,7 @@ class TestValue(unittest.TestCase):
             final_value=final_value,
             ramp_duration=ramp_duration,
             initial_time=initial_time,
+            clock=FakeClock(now.timestamp()),
         )
 
         value_delta = final_value - initial_value
@@ -87,6 +79,27 @@ class TestValue(unittest.TestCase):
 
         assert expected == percentage.value
 
+    def test_follows_the_clock(self) -> None:
+        clock = FakeClock(1000)
+        percentage = LinearRampPercentage(initial_value=0.0, final_value=1.0, ramp_duration=100, clock=clock)
+        assert percentage.value == 0.0
+
+        clock.advance(25)
+        assert percentage.value == 0.25  # noqa: PLR2004
+
+        clock.advance(500)
+        assert percentage.value == 1.0
+
+    def test_defaults_to_process_wide_clock(self) -> None:
+        clock = FakeClock(1000)
+        previous = set_default_clock(clock)
+        try:
+            percentage = LinearRampPercentage(ramp_duration=100)
+            clock.advance(50)
+            assert percentage.value == 0.5  # noqa: PLR2004
+        finally:
+            set_default_clock(previous)
+
 
 class TestToDict(unittest.TestCase):
     def test_returns_correct_values(self) -> None:
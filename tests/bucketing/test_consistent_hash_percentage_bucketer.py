@@ -1,6 +1,13 @@
 import unittest
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+from uuid import UUID
 
+import pytest
+
+from flipper import EvaluationContext
 from flipper.bucketing import ConsistentHashPercentageBucketer, Percentage
+from flipper.bucketing.hashing import DIGEST_RANGE, digest, encode_identity
 
 
 class TestGetType(unittest.TestCase):
@@ -75,6 +82,102 @@ class TestCheck(unittest.TestCase):
             )
 
 
+class TestCheckContext(unittest.TestCase):
+    def test_matches_check(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(key_whitelist=["foo"], percentage=Percentage(value=0.5))
+        for value in range(20):
+            assert bucketer.check_context({"foo": value, "bar": 1}) == bucketer.check(foo=value, bar=1)
+
+    def test_reads_only_whitelisted_keys(self) -> None:
+        context = MagicMock()
+        context.__contains__.return_value = True
+        context.__getitem__.return_value = "bar"
+        bucketer = ConsistentHashPercentageBucketer(key_whitelist=["foo"], percentage=Percentage(value=0.5))
+
+        assert bucketer.check_context(context) == bucketer.check(foo="bar")
+        context.__getitem__.assert_called_once_with("foo")
+
+
+class TestHashVersion(unittest.TestCase):
+    def test_legacy_version_keeps_existing_assignments(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(percentage=Percentage(value=0.5), hash_version=1)
+        assert bucketer.score(foo="bar") == 0.79  # noqa: PLR2004
+        assert bucketer.score() == 0.32  # noqa: PLR2004
+
+    def test_binary_version_has_fine_resolution(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(key_whitelist=["user_id"], hash_version=2)
+        scores = {bucketer.score(user_id=user_id) for user_id in range(1000)}
+        assert len(scores) == 1000  # noqa: PLR2004
+        assert all(0 <= score < 1 for score in scores)
+
+    def test_binary_version_is_consistent(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(key_whitelist=["user_id"], hash_version=2)
+        assert bucketer.score(user_id=42) == bucketer.score(user_id=42, plan="pro")
+
+    def test_binary_version_accepts_non_json_values(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(percentage=Percentage(value=1.0), hash_version=2)
+        assert bucketer.check(user_id=UUID(int=1), signed_up=datetime(2024, 1, 1, tzinfo=UTC))
+
+    def test_binary_version_distinguishes_value_types(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(hash_version=2)
+        scores = {bucketer.score(user_id=value) for value in (1, 1.0, True, "1")}
+        assert len(scores) == 4  # noqa: PLR2004
+
+    def test_binary_version_respects_percentage_bounds(self) -> None:
+        none = ConsistentHashPercentageBucketer(percentage=Percentage(value=0.0), hash_version=2)
+        everyone = ConsistentHashPercentageBucketer(percentage=Percentage(value=1.0), hash_version=2)
+        for user_id in range(100):
+            assert not none.check(user_id=user_id)
+            assert everyone.check(user_id=user_id)
+
+    def test_binary_version_assigns_buckets_uniformly(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(percentage=Percentage(value=0.2), hash_version=2)
+        enabled = sum(bucketer.check(user_id=user_id) for user_id in range(20000))
+        assert 3700 < enabled < 4300  # noqa: PLR2004
+
+    def test_raises_for_unknown_version(self) -> None:
+        with pytest.raises(ValueError, match="Hash version not supported"):
+            ConsistentHashPercentageBucketer(hash_version=3)
+
+
+class TestSalt(unittest.TestCase):
+    def test_requires_binary_hash_version(self) -> None:
+        with pytest.raises(ValueError, match="salt requires hash_version 2"):
+            ConsistentHashPercentageBucketer(salt="flag")
+
+    def test_is_consistent(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(key_whitelist=["user_id"], hash_version=2, salt="flag")
+        assert bucketer.score(user_id=7) == bucketer.score(user_id=7)
+
+    def test_decorrelates_assignments_across_flags(self) -> None:
+        first, second = (
+            ConsistentHashPercentageBucketer(percentage=Percentage(0.1), hash_version=2, salt=salt)
+            for salt in ("first", "second")
+        )
+        both = sum(first.check(user_id=user_id) and second.check(user_id=user_id) for user_id in range(20000))
+        # Independent 10% rollouts overlap on about 1% of users, not 10%.
+        assert 100 < both < 300  # noqa: PLR2004
+
+    def test_unsalted_binary_scores_are_unchanged(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(hash_version=2)
+        assert bucketer.score(user_id=1) == digest(encode_identity([("user_id", 1)])) / DIGEST_RANGE
+
+    def test_hashes_identity_once_per_evaluation_context(self) -> None:
+        bucketers = [
+            ConsistentHashPercentageBucketer(key_whitelist=["user_id"], hash_version=2, salt=str(i)) for i in range(5)
+        ]
+        context = EvaluationContext({"user_id": 1})
+
+        with patch(
+            "flipper.bucketing.hashing.encode_identity",
+            wraps=encode_identity,
+        ) as encode:
+            scores = [bucketer.score_context(context) for bucketer in bucketers]
+
+        assert encode.call_count == 1
+        assert scores == [bucketer.score(user_id=1) for bucketer in bucketers]
+
+
 class TestToDict(unittest.TestCase):
     def test_returns_correct_data(self) -> None:
         percentage = Percentage(value=0.5)
@@ -87,6 +190,8 @@ class TestToDict(unittest.TestCase):
             "type": ConsistentHashPercentageBucketer.get_type(),
             "key_whitelist": key_whitelist,
             "percentage": percentage.to_dict(),
+            "hash_version": 1,
+            "salt": None,
         }
         assert expected == bucketer.to_dict()
 
@@ -99,6 +204,13 @@ class TestFromDict(unittest.TestCase):
             "type": ConsistentHashPercentageBucketer.get_type(),
             "key_whitelist": key_whitelist,
             "percentage": percentage.to_dict(),
+            "hash_version": 2,
+            "salt": "flag",
         }
         bucketer = ConsistentHashPercentageBucketer.from_dict(data)
         assert data == bucketer.to_dict()
+
+    def test_defaults_to_legacy_hash_version(self) -> None:
+        data = {"type": ConsistentHashPercentageBucketer.get_type(), "key_whitelist": ["foo"]}
+        bucketer = ConsistentHashPercentageBucketer.from_dict(data)
+        assert bucketer.hash_version == 1
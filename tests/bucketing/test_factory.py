@@ -8,6 +8,7 @@ from flipper.bucketing import (
     NoOpBucketer,
     Percentage,
     PercentageBucketer,
+    VariantBucketer,
 )
 
 
@@ -26,6 +27,10 @@ class TestCreate(unittest.TestCase):
         bucketer = BucketerFactory.create({"type": NoOpBucketer.get_type()})
         assert isinstance(bucketer, NoOpBucketer)
 
+    def test_creates_variant_bucketer(self) -> None:
+        bucketer = BucketerFactory.create({"type": VariantBucketer.get_type()})
+        assert isinstance(bucketer, VariantBucketer)
+
     def test_raises_exception_when_given_an_unrecognized_type(self) -> None:
         with pytest.raises(BucketerFactory.InvalidBucketerTypeError):
             BucketerFactory.create({"type": "xyz"})
@@ -0,0 +1,46 @@
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from flipper.bucketing.hashing import DIGEST_RANGE, digest, encode_identity, mix, salt_key
+
+
+class TestEncodeIdentity(unittest.TestCase):
+    def test_is_independent_of_key_order(self) -> None:
+        assert encode_identity([("a", 1), ("b", 2)]) == encode_identity([("b", 2), ("a", 1)])
+
+    def test_tags_values_by_type(self) -> None:
+        encoded = {encode_identity([("a", value)]) for value in (1, 1.0, True, "1", b"1", None, [1])}
+        assert len(encoded) == 7  # noqa: PLR2004
+
+    def test_length_prefixes_values(self) -> None:
+        assert encode_identity([("a", "bc"), ("d", "")]) != encode_identity([("a", "b"), ("d", "c")])
+
+    def test_encodes_non_json_values(self) -> None:
+        values = [UUID(int=1), datetime(2024, 1, 1), date(2024, 1, 1), Decimal("1.5"), {"b": 1, "a": [2]}]  # noqa: DTZ001
+        for value in values:
+            assert encode_identity([("a", value)])
+
+    def test_raises_for_unsupported_types(self) -> None:
+        with pytest.raises(TypeError, match="Cannot hash identity value"):
+            encode_identity([("a", object())])
+
+
+class TestDigest(unittest.TestCase):
+    def test_returns_integer_within_range(self) -> None:
+        value = digest(b"user")
+        assert 0 <= value < DIGEST_RANGE
+        assert value == digest(b"user")
+
+
+class TestMix(unittest.TestCase):
+    def test_depends_on_key(self) -> None:
+        identity = digest(b"user")
+        assert mix(identity, salt_key("a")) != mix(identity, salt_key("b"))
+
+    def test_returns_integer_within_range(self) -> None:
+        for identity in (0, 1, DIGEST_RANGE - 1):
+            assert 0 <= mix(identity, salt_key("flag")) < DIGEST_RANGE
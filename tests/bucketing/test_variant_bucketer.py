@@ -0,0 +1,97 @@
+import unittest
+from collections import Counter
+
+import pytest
+
+from flipper import EvaluationContext
+from flipper.bucketing import BucketerFactory, VariantBucketer
+
+
+class TestInit(unittest.TestCase):
+    def test_rejects_weights_above_one(self) -> None:
+        with pytest.raises(ValueError, match="add up to at most 1"):
+            VariantBucketer(variants={"a": 0.6, "b": 0.5})
+
+    def test_rejects_negative_weights(self) -> None:
+        with pytest.raises(ValueError, match="must not be negative"):
+            VariantBucketer(variants={"a": -0.1})
+
+    def test_tolerates_float_rounding(self) -> None:
+        VariantBucketer(variants={"a": 0.1, "b": 0.2, "c": 0.7})
+
+
+class TestVariant(unittest.TestCase):
+    def test_is_consistent(self) -> None:
+        bucketer = VariantBucketer(variants={"a": 0.5, "b": 0.5}, key_whitelist=["user_id"])
+        assert bucketer.variant(user_id=1, page="x") == bucketer.variant(user_id=1, page="y")
+
+    def test_assigns_every_identity_when_weights_add_up_to_one(self) -> None:
+        bucketer = VariantBucketer(variants={"a": 0.1, "b": 0.2, "c": 0.7})
+        assert all(bucketer.variant(user_id=user_id) is not None for user_id in range(1000))
+
+    def test_assigns_variants_in_proportion_to_weights(self) -> None:
+        bucketer = VariantBucketer(variants={"a": 0.2, "b": 0.3, "c": 0.1}, salt="experiment")
+        counts = Counter(bucketer.variant(user_id=user_id) for user_id in range(20000))
+
+        assert 3700 < counts["a"] < 4300  # noqa: PLR2004
+        assert 5600 < counts["b"] < 6400  # noqa: PLR2004
+        assert 1800 < counts["c"] < 2200  # noqa: PLR2004
+        assert 7600 < counts[None] < 8400  # noqa: PLR2004
+
+    def test_never_assigns_zero_weight_variants(self) -> None:
+        bucketer = VariantBucketer(variants={"a": 0.5, "off": 0.0, "b": 0.5})
+        assert "off" not in {bucketer.variant(user_id=user_id) for user_id in range(1000)}
+
+    def test_growing_the_last_variant_keeps_existing_assignments(self) -> None:
+        before = VariantBucketer(variants={"a": 0.1, "b": 0.1})
+        after = VariantBucketer(variants={"a": 0.1, "b": 0.3})
+        for user_id in range(1000):
+            variant = before.variant(user_id=user_id)
+            if variant is not None:
+                assert after.variant(user_id=user_id) == variant
+
+    def test_salt_changes_assignments(self) -> None:
+        first = VariantBucketer(variants={"a": 0.5, "b": 0.5}, salt="first")
+        second = VariantBucketer(variants={"a": 0.5, "b": 0.5}, salt="second")
+        assert any(first.variant(user_id=u) != second.variant(user_id=u) for u in range(100))
+
+    def test_reads_context_once_per_evaluation_context(self) -> None:
+        bucketer = VariantBucketer(variants={"a": 1.0}, key_whitelist=["user_id"])
+        context = EvaluationContext({"user_id": 1})
+        bucketer.variant_context(context)
+        assert ("identity", frozenset({"user_id"})) in context.cache
+
+
+class TestCheck(unittest.TestCase):
+    def test_is_true_when_a_variant_is_assigned(self) -> None:
+        bucketer = VariantBucketer(variants={"a": 0.5})
+        for user_id in range(100):
+            assert bucketer.check(user_id=user_id) == (bucketer.variant(user_id=user_id) is not None)
+
+    def test_is_false_without_variants(self) -> None:
+        assert VariantBucketer().check(user_id=1) is False
+
+
+class TestToDict(unittest.TestCase):
+    def test_returns_correct_data(self) -> None:
+        bucketer = VariantBucketer(variants={"a": 0.25, "b": 0.75}, key_whitelist=["user_id"], salt="flag")
+        expected = {
+            "type": VariantBucketer.get_type(),
+            "variants": [{"name": "a", "weight": 0.25}, {"name": "b", "weight": 0.75}],
+            "key_whitelist": ["user_id"],
+            "salt": "flag",
+        }
+        assert expected == bucketer.to_dict()
+
+
+class TestFromDict(unittest.TestCase):
+    def test_sets_correct_data(self) -> None:
+        data = {
+            "type": VariantBucketer.get_type(),
+            "variants": [{"name": "b", "weight": 0.5}, {"name": "a", "weight": 0.25}],
+            "key_whitelist": ["user_id"],
+            "salt": "flag",
+        }
+        bucketer = BucketerFactory.create(data)
+        assert isinstance(bucketer, VariantBucketer)
+        assert data == bucketer.to_dict()
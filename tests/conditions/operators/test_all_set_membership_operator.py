@@ -0,0 +1,31 @@
+import unittest
+
+from flipper.conditions.operators.all_set_membership_operator import AllSetMembershipOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_returns_true_when_every_value_is_in_set(self) -> None:
+        operator = AllSetMembershipOperator()
+
+        assert operator.compare({"admin", "owner"}, ["admin", "owner", "viewer"])
+
+    def test_returns_false_when_a_value_is_not_in_set(self) -> None:
+        operator = AllSetMembershipOperator()
+
+        assert not operator.compare(["admin", "intern"], ["admin", "owner"])
+
+    def test_returns_true_for_empty_values(self) -> None:
+        operator = AllSetMembershipOperator()
+
+        assert operator.compare([], ["admin"])
+
+    def test_accepts_scalar_values(self) -> None:
+        operator = AllSetMembershipOperator()
+
+        assert operator.compare(3, [1, 2, 3])
+
+    def test_treats_a_string_threshold_as_a_single_value(self) -> None:
+        operator = AllSetMembershipOperator()
+
+        assert operator.compare(["admin"], "admin")
+        assert not operator.compare(["a", "d"], "admin")
@@ -0,0 +1,37 @@
+import unittest
+
+from flipper.conditions.operators.any_set_membership_operator import AnySetMembershipOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_returns_true_when_any_value_is_in_set(self) -> None:
+        operator = AnySetMembershipOperator()
+
+        assert operator.compare(["viewer", "admin"], ["admin", "owner"])
+
+    def test_returns_false_when_no_value_is_in_set(self) -> None:
+        operator = AnySetMembershipOperator()
+
+        assert not operator.compare({"viewer", "editor"}, ["admin", "owner"])
+
+    def test_returns_false_for_empty_values(self) -> None:
+        operator = AnySetMembershipOperator()
+
+        assert not operator.compare([], ["admin"])
+
+    def test_treats_a_string_as_a_single_value(self) -> None:
+        operator = AnySetMembershipOperator()
+
+        assert operator.compare("admin", ["admin"])
+        assert not operator.compare("ad", ["a", "d"])
+
+    def test_returns_false_for_unhashable_values(self) -> None:
+        operator = AnySetMembershipOperator()
+
+        assert not operator.compare([["admin"]], ["admin"])
+
+    def test_treats_a_string_threshold_as_a_single_value(self) -> None:
+        operator = AnySetMembershipOperator()
+
+        assert operator.compare(["admin"], "admin")
+        assert not operator.compare("a", "admin")
@@ -0,0 +1,21 @@
+import unittest
+
+from flipper.conditions.operators.between_operator import BetweenOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_returns_true_when_expected_is_in_range(self) -> None:
+        operator = BetweenOperator()
+
+        assert operator.compare(5, [1, 10])
+
+    def test_returns_false_when_expected_is_outside_range(self) -> None:
+        operator = BetweenOperator()
+
+        assert not operator.compare(11, [1, 10])
+
+    def test_checks_every_range_in_list(self) -> None:
+        operator = BetweenOperator()
+
+        assert operator.compare(25, [[1, 10], [20, 30]])
+        assert not operator.compare(15, [[1, 10], [20, 30]])
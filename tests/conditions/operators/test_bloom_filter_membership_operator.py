@@ -0,0 +1,30 @@
+import unittest
+
+from flipper.conditions import BloomFilter
+from flipper.conditions.operators.bloom_filter_membership_operator import (
+    BloomFilterMembershipOperator,
+)
+
+
+class TestCompare(unittest.TestCase):
+    def setUp(self) -> None:
+        self.payload = BloomFilter.from_iterable(["1", "2", "3"], 3, false_positive_rate=0.0001).to_dict()
+
+    def test_returns_true_when_expected_is_in_filter(self) -> None:
+        operator = BloomFilterMembershipOperator()
+
+        assert operator.compare(2, self.payload)
+
+    def test_returns_false_when_expected_is_not_in_filter(self) -> None:
+        operator = BloomFilterMembershipOperator()
+
+        assert not operator.compare("not-a-member", self.payload)
+
+    def test_decodes_payload_once_when_prepared(self) -> None:
+        operator = BloomFilterMembershipOperator()
+        operator.prepare(self.payload)
+        prepared = operator._get_prepared(self.payload)  # noqa: SLF001
+
+        operator.compare(1, self.payload)
+
+        assert operator._get_prepared(self.payload) is prepared  # noqa: SLF001
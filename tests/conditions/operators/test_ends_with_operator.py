@@ -0,0 +1,20 @@
+import unittest
+
+from flipper.conditions.operators.ends_with_operator import EndsWithOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_returns_true_when_expected_ends_with_actual(self) -> None:
+        operator = EndsWithOperator()
+
+        assert operator.compare("me@example.com", "@example.com")
+
+    def test_returns_false_when_expected_does_not_end_with_actual(self) -> None:
+        operator = EndsWithOperator()
+
+        assert not operator.compare("me@example.org", "@example.com")
+
+    def test_returns_true_when_expected_ends_with_any_of_actual(self) -> None:
+        operator = EndsWithOperator()
+
+        assert operator.compare("me@example.org", ["@example.com", "@example.org"])
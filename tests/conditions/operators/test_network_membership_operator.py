@@ -0,0 +1,30 @@
+import unittest
+
+from flipper.conditions.operators.network_membership_operator import NetworkMembershipOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_returns_true_when_address_is_in_a_network(self) -> None:
+        operator = NetworkMembershipOperator()
+
+        assert operator.compare("10.1.2.3", ["192.168.0.0/16", "10.0.0.0/8"])
+
+    def test_returns_false_when_address_is_in_no_network(self) -> None:
+        operator = NetworkMembershipOperator()
+
+        assert not operator.compare("11.1.2.3", ["192.168.0.0/16", "10.0.0.0/8"])
+
+    def test_accepts_a_single_network(self) -> None:
+        operator = NetworkMembershipOperator()
+
+        assert operator.compare("2001:db8::1", "2001:db8::/32")
+
+    def test_compiles_networks_once(self) -> None:
+        operator = NetworkMembershipOperator()
+        networks = ["10.0.0.0/8"]
+        operator.prepare(networks)
+        prepared = operator._prepared  # noqa: SLF001
+
+        operator.compare("10.0.0.1", networks)
+
+        assert operator._prepared is prepared  # noqa: SLF001
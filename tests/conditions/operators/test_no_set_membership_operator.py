@@ -0,0 +1,26 @@
+import unittest
+
+from flipper.conditions.operators.no_set_membership_operator import NoSetMembershipOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_returns_true_when_no_value_is_in_set(self) -> None:
+        operator = NoSetMembershipOperator()
+
+        assert operator.compare(("viewer", "editor"), ["banned"])
+
+    def test_returns_false_when_any_value_is_in_set(self) -> None:
+        operator = NoSetMembershipOperator()
+
+        assert not operator.compare(["viewer", "banned"], ["banned"])
+
+    def test_returns_true_for_empty_values(self) -> None:
+        operator = NoSetMembershipOperator()
+
+        assert operator.compare(frozenset(), ["banned"])
+
+    def test_treats_a_string_threshold_as_a_single_value(self) -> None:
+        operator = NoSetMembershipOperator()
+
+        assert operator.compare("d", "admin")
+        assert not operator.compare(["admin"], "admin")
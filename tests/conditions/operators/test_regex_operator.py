@@ -0,0 +1,30 @@
+import unittest
+
+from flipper.conditions.operators.regex_operator import RegexOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_returns_true_when_expected_matches_pattern(self) -> None:
+        operator = RegexOperator()
+
+        assert operator.compare("beta-tester-7", r"^beta-tester-\d+$")
+
+    def test_returns_false_when_expected_does_not_match_pattern(self) -> None:
+        operator = RegexOperator()
+
+        assert not operator.compare("alpha", r"^beta")
+
+    def test_returns_false_when_expected_is_not_a_string(self) -> None:
+        operator = RegexOperator()
+
+        assert not operator.compare(7, r"\d")
+
+    def test_compiles_pattern_once_when_prepared(self) -> None:
+        operator = RegexOperator()
+        pattern = r"^beta"
+        operator.prepare(pattern)
+        compiled = operator._get_prepared(pattern)  # noqa: SLF001
+
+        operator.compare("beta", pattern)
+
+        assert operator._get_prepared(pattern) is compiled  # noqa: SLF001
@@ -0,0 +1,20 @@
+import unittest
+
+from flipper.conditions.operators.starts_with_operator import StartsWithOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_returns_true_when_expected_starts_with_actual(self) -> None:
+        operator = StartsWithOperator()
+
+        assert operator.compare("/admin/users", "/admin")
+
+    def test_returns_false_when_expected_does_not_start_with_actual(self) -> None:
+        operator = StartsWithOperator()
+
+        assert not operator.compare("/home", "/admin")
+
+    def test_returns_true_when_expected_starts_with_any_of_actual(self) -> None:
+        operator = StartsWithOperator()
+
+        assert operator.compare("/api/v1", ["/admin", "/api"])
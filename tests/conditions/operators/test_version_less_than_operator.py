@@ -0,0 +1,20 @@
+import unittest
+
+from flipper.conditions.operators.version_less_than_operator import VersionLessThanOperator
+
+
+class TestCompare(unittest.TestCase):
+    def test_compares_by_version_precedence(self) -> None:
+        operator = VersionLessThanOperator()
+
+        assert operator.compare("5.9.3", "5.10.0")
+
+    def test_returns_false_when_comparison_does_not_hold(self) -> None:
+        operator = VersionLessThanOperator()
+
+        assert not operator.compare("5.12.0", "5.10.0")
+
+    def test_returns_false_when_expected_is_not_a_version(self) -> None:
+        operator = VersionLessThanOperator()
+
+        assert not operator.compare("latest", "5.10.0")
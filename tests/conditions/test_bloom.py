@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from flipper.conditions import BloomFilter
+
+
+class TestForCapacity(unittest.TestCase):
+    def test_lower_false_positive_rate_uses_more_bits(self) -> None:
+        loose = BloomFilter.for_capacity(1000, false_positive_rate=0.1)
+        tight = BloomFilter.for_capacity(1000, false_positive_rate=0.001)
+        assert tight.num_bits > loose.num_bits
+
+    def test_raises_for_invalid_false_positive_rate(self) -> None:
+        with pytest.raises(ValueError, match="false_positive_rate"):
+            BloomFilter.for_capacity(1000, false_positive_rate=1.5)
+
+
+class TestContains(unittest.TestCase):
+    def test_has_no_false_negatives(self) -> None:
+        bloom = BloomFilter.from_iterable(range(5000), 5000)
+        assert all(i in bloom for i in range(5000))
+
+    def test_normalizes_members_with_str(self) -> None:
+        bloom = BloomFilter.from_iterable([42], 1)
+        assert "42" in bloom
+
+    def test_false_positive_rate_is_close_to_target(self) -> None:
+        bloom = BloomFilter.from_iterable(range(10000), 10000, false_positive_rate=0.01)
+        false_positives = sum(1 for i in range(10000, 30000) if i in bloom)
+        assert false_positives / 20000 < 0.02  # noqa: PLR2004
+
+
+class TestFromFile(unittest.TestCase):
+    def test_adds_each_non_empty_line(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "ids.txt"
+            path.write_text("a\nb\n\nc\n")
+
+            bloom = BloomFilter.from_file(path)
+
+        assert all(member in bloom for member in ("a", "b", "c"))
+
+
+class TestSerialization(unittest.TestCase):
+    def test_round_trips_through_dict(self) -> None:
+        bloom = BloomFilter.from_iterable(["foo", "bar"], 2)
+
+        deserialized = BloomFilter.from_dict(bloom.to_dict())
+
+        assert "foo" in deserialized
+        assert deserialized.to_dict() == bloom.to_dict()
@@ -3,11 +3,25 @@ isort:skip_file
 See: https://github.com/ambv/black/issues/250
 """
 
+import json
 import unittest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from uuid import uuid4
 
+import pytest
+
+from flipper.conditions import BloomFilter
 from flipper.conditions.check import OPERATOR_DELIMITER, Check
+from flipper.conditions.operators.all_set_membership_operator import AllSetMembershipOperator
+from flipper.conditions.operators.any_set_membership_operator import AnySetMembershipOperator
+from flipper.conditions.operators.between_operator import BetweenOperator
+from flipper.conditions.operators.bloom_filter_membership_operator import (
+    BloomFilterMembershipOperator,
+)
+from flipper.conditions.operators.ends_with_operator import EndsWithOperator
 from flipper.conditions.operators.equality_operator import EqualityOperator
 from flipper.conditions.operators.greater_than_operator import GreaterThanOperator
 from flipper.conditions.operators.greater_than_or_equal_to_operator import (
@@ -17,11 +31,21 @@ from flipper.conditions.operators.less_than_operator import LessThanOperator
 from flipper.conditions.operators.less_than_or_equal_to_operator import (
     LessThanOrEqualToOperator,
 )
+from flipper.conditions.operators.negated_between_operator import NegatedBetweenOperator
 from flipper.conditions.operators.negated_set_membership_operator import (
     NegatedSetMembershipOperator,
 )
 from flipper.conditions.operators.negation_operator import NegationOperator
+from flipper.conditions.operators.network_membership_operator import NetworkMembershipOperator
+from flipper.conditions.operators.no_set_membership_operator import NoSetMembershipOperator
+from flipper.conditions.operators.regex_operator import RegexOperator
 from flipper.conditions.operators.set_membership_operator import SetMembershipOperator
+from flipper.conditions.operators.starts_with_operator import StartsWithOperator
+from flipper.conditions.operators.version_greater_than_or_equal_to_operator import (
+    VersionGreaterThanOrEqualToOperator,
+)
+from flipper.conditions.value_types import InvalidValueTypeError
+from flipper.conditions.versions import InvalidVersionError
 
 
 class BaseTest(unittest.TestCase):
@@ -82,6 +106,54 @@ class TestFactory(BaseTest):
         check = Check.factory("foo__in", [1])
         assert isinstance(check.operator, SetMembershipOperator)
 
+    def test_returns_instance_of_bloom_filter_membership_operator(self) -> None:
+        check = Check.factory("foo__in_bloom", BloomFilter.for_capacity(1).to_dict())
+        assert isinstance(check.operator, BloomFilterMembershipOperator)
+
+    def test_returns_instance_of_between_operator(self) -> None:
+        check = Check.factory("foo__between", [1, 2])
+        assert isinstance(check.operator, BetweenOperator)
+
+    def test_returns_instance_of_negated_between_operator(self) -> None:
+        check = Check.factory("foo__not_between", [1, 2])
+        assert isinstance(check.operator, NegatedBetweenOperator)
+
+    def test_returns_instance_of_any_set_membership_operator(self) -> None:
+        check = Check.factory("foo__any_in", ["a"])
+        assert isinstance(check.operator, AnySetMembershipOperator)
+
+    def test_returns_instance_of_all_set_membership_operator(self) -> None:
+        check = Check.factory("foo__all_in", ["a"])
+        assert isinstance(check.operator, AllSetMembershipOperator)
+
+    def test_returns_instance_of_no_set_membership_operator(self) -> None:
+        check = Check.factory("foo__none_in", ["a"])
+        assert isinstance(check.operator, NoSetMembershipOperator)
+
+    def test_returns_instance_of_network_membership_operator(self) -> None:
+        check = Check.factory("foo__in_network", ["10.0.0.0/8"])
+        assert isinstance(check.operator, NetworkMembershipOperator)
+
+    def test_returns_instance_of_starts_with_operator(self) -> None:
+        check = Check.factory("foo__startswith", "a")
+        assert isinstance(check.operator, StartsWithOperator)
+
+    def test_returns_instance_of_ends_with_operator(self) -> None:
+        check = Check.factory("foo__endswith", "a")
+        assert isinstance(check.operator, EndsWithOperator)
+
+    def test_returns_instance_of_regex_operator(self) -> None:
+        check = Check.factory("foo__regex", "^a")
+        assert isinstance(check.operator, RegexOperator)
+
+    def test_returns_instance_of_version_operator(self) -> None:
+        check = Check.factory("foo__version_gte", "1.2.3")
+        assert isinstance(check.operator, VersionGreaterThanOrEqualToOperator)
+
+    def test_raises_when_version_threshold_is_invalid(self) -> None:
+        with pytest.raises(InvalidVersionError):
+            Check.factory("foo__version_gte", "latest")
+
 
 class TestToDict(BaseTest):
     def test_includes_expected_fields(self) -> None:
@@ -91,6 +163,14 @@ class TestToDict(BaseTest):
 
         assert {"variable": variable, "value": value, "operator": operator.SYMBOL} == check.to_dict()
 
+    def test_serializes_bloom_filters_to_their_payload(self) -> None:
+        bloom = BloomFilter.from_iterable(["1", "2"], 2, false_positive_rate=0.0001)
+
+        fields = json.loads(json.dumps(Check.factory("uid__in_bloom", bloom).to_dict()))
+
+        assert fields["value"] == bloom.to_dict()
+        assert Check.from_dict(fields).check("2")
+
 
 class TestFromDict(BaseTest):
     def test_includes_expected_fields(self) -> None:
@@ -103,6 +183,110 @@ class TestFromDict(BaseTest):
         assert json == check.to_dict()
 
 
+class TestValueType(BaseTest):
+    def test_coerces_threshold_when_built(self) -> None:
+        check = Check.factory("signed_up_at__gte", "2024-01-01", value_type="date")
+        assert check.value == date(2024, 1, 1)
+
+    def test_coerces_context_values(self) -> None:
+        check = Check.factory("signed_up_at__gte", "2024-01-01", value_type="date")
+        assert check.check("2024-03-01")
+        assert not check.check("2023-12-31")
+        assert check.check(date(2024, 1, 1))
+
+    def test_compares_naive_and_aware_datetimes(self) -> None:
+        aware = Check.factory("signed_up_at__gte", "2024-01-01T00:00:00+00:00", value_type="datetime")
+        naive = Check.factory("signed_up_at__lt", datetime(2024, 1, 1))  # noqa: DTZ001
+        assert aware.check(datetime(2024, 1, 1, 1))  # noqa: DTZ001
+        assert not aware.check("2023-12-31T23:00:00")
+        assert naive.check(datetime(2024, 1, 1, 1, tzinfo=timezone(timedelta(hours=2))))
+
+    def test_compares_decimals_numerically(self) -> None:
+        check = Check.factory("balance__gt", "9.5", value_type="decimal")
+        assert check.check("10.25")
+        assert not check.check("9.50")
+
+    def test_compares_uuids_regardless_of_format(self) -> None:
+        value = uuid4()
+        check = Check.factory("company_id__in", [str(value)], value_type="uuid")
+        assert check.check(value.hex.upper())
+
+    def test_coerces_each_member_for_set_intersections(self) -> None:
+        first, second = uuid4(), uuid4()
+        assert Check.factory("roles__any_in", [first, second]).check([first])
+        assert Check.factory("roles__all_in", [str(first), str(second)], value_type="uuid").check([second.hex])
+        assert Check.factory("roles__none_in", [first]).check({second})
+        assert not Check.factory("roles__none_in", [first]).check((second, str(first)))
+
+    def test_coerces_a_single_value_as_one_member(self) -> None:
+        check = Check.factory("released_on__any_in", [date(2024, 1, 1)])
+        assert check.check("2024-01-01")
+
+    def test_set_intersections_fail_when_a_member_cannot_be_coerced(self) -> None:
+        check = Check.factory("prices__all_in", [Decimal("1.5")])
+        assert check.check([Decimal("1.5"), object()]) is False
+
+    def test_returns_false_when_context_value_cannot_be_coerced(self) -> None:
+        check = Check.factory("seats__gte", 10, value_type="int")
+        assert check.check("not a number") is False
+        assert check.check(None) is False
+
+    def test_infers_value_type_from_python_objects(self) -> None:
+        check = Check.factory("price__lt", Decimal("2.50"))
+        assert check.value_type.NAME == "decimal"
+        assert check.check("2.49")
+
+    def test_raises_for_unknown_value_type(self) -> None:
+        with pytest.raises(InvalidValueTypeError):
+            Check.factory("foo", 1, value_type="money")
+
+    def test_to_dict_includes_value_type_and_serialized_value(self) -> None:
+        value = uuid4()
+        check = Check.factory("company_id", value)
+        expected = {"variable": "company_id", "value": str(value), "operator": None, "value_type": "uuid"}
+        assert expected == check.to_dict()
+
+    def test_round_trips_through_dict(self) -> None:
+        check = Check.from_dict(Check.factory("released_on__between", ["2024-01-01", "2024-06-30"], "date").to_dict())
+        assert check.value == [date(2024, 1, 1), date(2024, 6, 30)]
+        assert check.check("2024-03-01")
+
+    def test_untyped_checks_keep_their_values(self) -> None:
+        check = Check.factory("company_id", "2024-01-01")
+        assert check.value_type is None
+        assert check.value == "2024-01-01"
+
+
+class TestCheckRoot(BaseTest):
+    def test_root_is_the_variable_for_plain_checks(self) -> None:
+        check = Check.factory("plan", "pro")
+        assert check.root == "plan"
+        assert check.check_root("pro")
+
+    def test_root_is_the_first_segment_of_a_dotted_path(self) -> None:
+        check = Check.factory("user.company.plan__in", ["pro"])
+        assert check.variable == "user.company.plan"
+        assert check.root == "user"
+
+    def test_follows_path_from_root_value(self) -> None:
+        check = Check.factory("user.company.plan__in", ["pro"])
+        assert check.check_root(SimpleNamespace(company=SimpleNamespace(plan="pro")))
+        assert not check.check_root({"company": {"plan": "free"}})
+
+    def test_reads_mapping_keys_named_like_dict_methods(self) -> None:
+        assert Check.factory("user.values", "admin").check_root({"values": "admin"})
+        assert Check.factory("order.items__gte", 2).check_root({"items": 5})
+
+    def test_fails_when_path_cannot_be_followed(self) -> None:
+        check = Check.factory("user.company.plan__ne", "free")
+        assert check.check_root(SimpleNamespace(company=None)) is False
+
+    def test_round_trips_dotted_variable_through_dict(self) -> None:
+        check = Check.from_dict(Check.factory("user.seats__gte", 10).to_dict())
+        assert check.root == "user"
+        assert check.check_root({"seats": 12})
+
+
 class TestMakeCheckKey(BaseTest):
     def test_returns_variable_and_operator_with_delimiter(self) -> None:
         variable, operator = self.txt(), "gt"
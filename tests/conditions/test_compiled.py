@@ -0,0 +1,293 @@
+import random
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from flipper import Condition
+from flipper.conditions import AdaptiveOrdering, CompiledConditions
+from flipper.conditions.check import Check
+
+
+class TestCheck(unittest.TestCase):
+    def test_returns_true_when_there_are_no_conditions(self) -> None:
+        compiled = CompiledConditions([])
+
+        assert compiled.check(foo=1)
+
+    def test_ignores_variables_not_in_context(self) -> None:
+        compiled = CompiledConditions([Condition(foo=1), Condition(bar=2)])
+
+        assert compiled.check(foo=1)
+
+    def test_ignores_context_variables_without_checks(self) -> None:
+        compiled = CompiledConditions([Condition(foo=1)])
+
+        assert compiled.check(foo=1, baz=3)
+
+    def test_requires_every_condition_to_pass(self) -> None:
+        compiled = CompiledConditions([Condition(foo=1), Condition(bar__gt=2)])
+
+        assert not compiled.check(foo=1, bar=2)
+
+    def test_distinct_equality_values_on_one_variable_never_pass(self) -> None:
+        compiled = CompiledConditions([Condition(company_id=1), Condition(company_id=2)])
+
+        assert not compiled.check(company_id=1)
+        assert not compiled.check(company_id=2)
+
+    def test_repeated_equality_value_on_one_variable_passes(self) -> None:
+        compiled = CompiledConditions([Condition(company_id=1, plan="pro"), Condition(company_id=1)])
+
+        assert compiled.check(company_id=1, plan="pro")
+
+    def test_supports_unhashable_equality_values(self) -> None:
+        compiled = CompiledConditions([Condition(tags=["a", "b"])])
+
+        assert compiled.check(tags=["a", "b"])
+        assert not compiled.check(tags=["a"])
+
+    def test_merges_equality_with_other_checks(self) -> None:
+        compiled = CompiledConditions([Condition(age=30), Condition(age__gte=18)])
+
+        assert compiled.check(age=30)
+        assert not compiled.check(age=31)
+
+    def test_intersects_between_checks_across_conditions(self) -> None:
+        compiled = CompiledConditions([Condition(id__between=[[1, 10], [20, 30]]), Condition(id__between=[5, 25])])
+
+        assert compiled.check(id=7)
+        assert compiled.check(id=22)
+        assert not compiled.check(id=15)
+        assert not compiled.check(id=2)
+
+    def test_clips_between_checks_with_inclusive_bounds(self) -> None:
+        compiled = CompiledConditions([Condition(id__between=[1, 100], id__gte=10, id__lte=20)])
+
+        assert compiled.check(id=10)
+        assert not compiled.check(id=21)
+
+    def test_unions_not_between_checks(self) -> None:
+        compiled = CompiledConditions([Condition(id__not_between=[1, 5]), Condition(id__not_between=[10, 15])])
+
+        assert compiled.check(id=7)
+        assert not compiled.check(id=12)
+
+    def test_keeps_range_checks_that_cannot_be_merged(self) -> None:
+        compiled = CompiledConditions([Condition(id__between=[1, 10]), Condition(id__gte="a")])
+
+        with pytest.raises(TypeError):
+            compiled.check(id=5)
+
+    def test_coerces_context_values_for_typed_checks(self) -> None:
+        compiled = CompiledConditions(
+            [
+                Condition(signed_up_on__between=[date(2024, 1, 1), date(2024, 12, 31)]),
+                Condition.from_checks([Check.factory("signed_up_on__gte", "2024-06-01", value_type="date")]),
+            ],
+        )
+
+        assert compiled.check(signed_up_on="2024-07-01")
+        assert compiled.check(signed_up_on=date(2024, 7, 1))
+        assert not compiled.check(signed_up_on="2024-03-01")
+        assert not compiled.check(signed_up_on="not a date")
+
+    def test_keeps_typed_and_untyped_equality_checks_apart(self) -> None:
+        compiled = CompiledConditions(
+            [Condition(seats=10), Condition.from_checks([Check.factory("seats", "10", value_type="int")])],
+        )
+
+        assert compiled.check(seats=10)
+        assert not compiled.check(seats="10")
+
+
+class TestSetIntersections(unittest.TestCase):
+    def test_intersects_all_in_checks_across_conditions(self) -> None:
+        compiled = CompiledConditions(
+            [Condition(roles__all_in=["admin", "editor", "viewer"]), Condition(roles__all_in=["editor", "viewer"])],
+        )
+
+        assert compiled.check(roles=["editor", "viewer"])
+        assert not compiled.check(roles=["admin", "viewer"])
+        assert len(compiled.statistics) == 1
+
+    def test_unions_none_in_checks_across_conditions(self) -> None:
+        compiled = CompiledConditions([Condition(groups__none_in=["banned"]), Condition(groups__none_in=["churned"])])
+
+        assert compiled.check(groups={"beta"})
+        assert not compiled.check(groups={"beta", "churned"})
+        assert len(compiled.statistics) == 1
+
+    def test_coerces_each_member_of_typed_sets(self) -> None:
+        first, second, third = uuid4(), uuid4(), uuid4()
+        compiled = CompiledConditions(
+            [
+                Condition(roles__any_in=[first, second]),
+                Condition(roles__none_in=[third]),
+                Condition(roles__all_in=[first]),
+            ]
+        )
+
+        assert compiled.check(roles=[first])
+        assert compiled.check(roles=str(first))
+        assert not compiled.check(roles=[first, str(third)])
+        assert not compiled.check(roles=[second])
+
+    def test_treats_a_string_threshold_as_a_single_value(self) -> None:
+        compiled = CompiledConditions(
+            [Condition(roles__any_in="admin"), Condition(roles__all_in="admin"), Condition(groups__none_in="banned")]
+        )
+
+        assert compiled.check(roles=["admin"], groups=["b"])
+        assert not compiled.check(roles="a")
+        assert not compiled.check(roles="admin", groups="banned")
+
+    def test_keeps_any_in_checks_separate(self) -> None:
+        compiled = CompiledConditions([Condition(roles__any_in=["admin"]), Condition(roles__any_in=["billing"])])
+
+        assert compiled.check(roles=["admin", "billing"])
+        assert not compiled.check(roles=["admin"])
+
+
+class TestDottedPaths(unittest.TestCase):
+    def test_follows_paths_from_context_objects(self) -> None:
+        compiled = CompiledConditions([Condition(**{"user.company.plan__in": ["pro"], "user.seats__gte": 5})])
+
+        assert compiled.check(user={"company": {"plan": "pro"}, "seats": 5})
+        assert not compiled.check(user={"company": {"plan": "pro"}, "seats": 4})
+
+    def test_merges_checks_on_the_same_path(self) -> None:
+        compiled = CompiledConditions([Condition(**{"user.plan": "pro"}), Condition(**{"user.plan": "free"})])
+
+        assert not compiled.check(user=SimpleNamespace(plan="pro"))
+
+    def test_fails_when_path_cannot_be_followed(self) -> None:
+        compiled = CompiledConditions([Condition(**{"user.company.plan__ne": "free"})])
+
+        assert not compiled.check(user=SimpleNamespace(company=None))
+
+    def test_reads_flat_dotted_keys_before_paths(self) -> None:
+        compiled = CompiledConditions([Condition(**{"app.version": "1.0"})])
+
+        assert not compiled.check(**{"app.version": "2.0"})
+        assert compiled.check(**{"app.version": "1.0", "app": {"version": "2.0"}})
+        assert compiled.check(app={"version": "1.0"})
+
+    def test_samples_flat_dotted_keys(self) -> None:
+        compiled = CompiledConditions(
+            [Condition(**{"app.version": "1.0"})], adaptive_ordering=AdaptiveOrdering(sample_every=1)
+        )
+
+        assert not compiled.check(**{"app.version": "2.0"})
+
+    def test_skips_paths_whose_root_is_missing(self) -> None:
+        compiled = CompiledConditions([Condition(**{"user.company.plan": "pro"})])
+
+        assert compiled.check(account=1)
+
+
+class TestMatchesConditions(unittest.TestCase):
+    def test_agrees_with_checking_each_condition(self) -> None:
+        rng = random.Random(7)  # noqa: S311
+        operators = ["", "__gt", "__gte", "__lt", "__lte", "__ne", "__in", "__not_in", "__between", "__not_between"]
+
+        for _ in range(300):
+            conditions = []
+            for _ in range(rng.randint(1, 6)):
+                checks = {}
+                for variable in rng.sample(["a", "b", "c"], rng.randint(1, 3)):
+                    operator = rng.choice(operators)
+                    if operator.endswith("between"):
+                        value = [sorted(rng.sample(range(5), 2)) for _ in range(rng.randint(1, 2))]
+                    elif operator.endswith("in"):
+                        value = rng.sample(range(5), 2)
+                    else:
+                        value = rng.randint(0, 4)
+                    checks[variable + operator] = value
+                conditions.append(Condition(**checks))
+
+            compiled = CompiledConditions(conditions)
+            context = {v: rng.randint(0, 4) for v in rng.sample(["a", "b", "c", "d"], rng.randint(1, 4))}
+
+            expected = all(c.check(**context) for c in conditions)
+            assert compiled.check(**context) == expected
+
+    def test_agrees_with_checking_each_condition_for_set_operators(self) -> None:
+        rng = random.Random(11)  # noqa: S311
+        operators = ["__any_in", "__all_in", "__none_in"]
+
+        for _ in range(300):
+            conditions = [
+                Condition(**{"roles" + rng.choice(operators): rng.sample(range(6), rng.randint(1, 4))})
+                for _ in range(rng.randint(1, 4))
+            ]
+
+            compiled = CompiledConditions(conditions)
+            roles = rng.sample(range(6), rng.randint(0, 3))
+
+            assert compiled.check(roles=roles) == all(c.check(roles=roles) for c in conditions)
+
+
+class TestAdaptiveOrdering(unittest.TestCase):
+    def test_moves_selective_cheap_check_first(self) -> None:
+        compiled = CompiledConditions(
+            [Condition(plan__in=list(range(10000)), is_staff=True)],
+            adaptive_ordering=AdaptiveOrdering(sample_every=1, reorder_every=20),
+        )
+
+        for _ in range(40):
+            compiled.check(plan=9999, is_staff=False)
+
+        assert compiled.variables == ["is_staff", "plan"]
+
+    def test_does_not_change_results(self) -> None:
+        rng = random.Random(3)  # noqa: S311
+        conditions = [Condition(a__gt=1, b__in=[1, 2]), Condition(c__ne=0, a__lte=3)]
+        plain = CompiledConditions(conditions)
+        adaptive = CompiledConditions(conditions, adaptive_ordering=AdaptiveOrdering(sample_every=2, reorder_every=5))
+
+        for _ in range(500):
+            context = {v: rng.randint(0, 4) for v in "abc"}
+            assert adaptive.check(**context) == plain.check(**context)
+
+    def test_records_statistics_per_check(self) -> None:
+        compiled = CompiledConditions(
+            [Condition(foo=1)],
+            adaptive_ordering=AdaptiveOrdering(sample_every=1, reorder_every=100),
+        )
+
+        compiled.check(foo=1)
+        compiled.check(foo=2)
+
+        [(variable, statistics)] = compiled.statistics
+        assert variable == "foo"
+        assert statistics.samples == 2  # noqa: PLR2004
+        assert statistics.passes == 1
+
+    def test_keeps_checks_that_raised_last(self) -> None:
+        compiled = CompiledConditions(
+            [Condition(a=1), Condition(b__gt=1)],
+            adaptive_ordering=AdaptiveOrdering(sample_every=1, reorder_every=5),
+        )
+
+        for _ in range(10):
+            assert not compiled.check(a=2, b="x")
+
+        assert compiled.variables == ["a", "b"]
+
+    def test_retries_in_original_order_when_a_reordered_check_raises(self) -> None:
+        compiled = CompiledConditions(
+            [Condition(b=1), Condition(a__gt=5)],
+            adaptive_ordering=AdaptiveOrdering(sample_every=2, reorder_every=5),
+        )
+        for _ in range(20):
+            compiled.check(a=0, b=1)
+        assert compiled.variables == ["a", "b"]
+
+        # One call takes the plain path and the next one is sampled.
+        assert compiled.check(a="x", b=2) is False
+        assert compiled.check(a="x", b=2) is False
+        with pytest.raises(TypeError):
+            compiled.check(a="x", b=1)
@@ -1,7 +1,10 @@
 import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 from uuid import uuid4
 
 from flipper import Condition
+from flipper.conditions.check import Check
 
 
 class BaseTest(unittest.TestCase):
@@ -144,6 +147,51 @@ class TestCheck(BaseTest):
         assert not condition.check(foo=True, bar=False, baz=101, herp=21, derp=5)
 
 
+class TestCheckContext(BaseTest):
+    def test_resolves_only_variables_with_checks(self) -> None:
+        foo, bar = MagicMock(return_value=True), MagicMock()
+        condition = Condition(foo=True)
+
+        assert condition.check(foo=foo, bar=bar)
+        foo.assert_called_once_with()
+        bar.assert_not_called()
+
+    def test_reads_only_referenced_attributes(self) -> None:
+        class Company:
+            plan = "pro"
+
+            @property
+            def seats(self) -> int:
+                raise AssertionError
+
+        condition = Condition(**{"user.company.plan": "pro"})
+
+        assert condition.check(user=SimpleNamespace(company=Company()))
+        assert not condition.check(user=SimpleNamespace(company=SimpleNamespace(plan="free")))
+
+    def test_reads_flat_dotted_keys_before_paths(self) -> None:
+        condition = Condition(**{"app.version": "1.0"})
+
+        assert not condition.check(**{"app.version": "2.0"})
+        assert condition.check(**{"app.version": "1.0", "app": {"version": "2.0"}})
+        assert condition.check(app={"version": "1.0"})
+
+    def test_does_not_record_unknown_variables(self) -> None:
+        condition = Condition(foo=True)
+
+        condition.check(foo=True, bar=1)
+
+        assert list(condition.to_dict()) == ["foo"]
+
+
+class TestRegex(BaseTest):
+    def test_accepts_patterns_with_global_flags(self) -> None:
+        condition = Condition.from_dict(Condition(ua__regex=["(?i)^bot", "crawler"]).to_dict())
+
+        assert condition.check(ua="Bot/2.1")
+        assert not condition.check(ua="Mozilla")
+
+
 class TestToDict(BaseTest):
     def test_includes_all_checks(self) -> None:
         condition = Condition(
@@ -212,3 +260,27 @@ class TestFromDict(BaseTest):
         for key, checks in expected.items():
             for check in checks:
                 assert check in actual[key]
+
+    def test_keeps_value_types(self) -> None:
+        input = {  # noqa: A001
+            "signed_up_on": [
+                {"variable": "signed_up_on", "value": "2024-01-01", "operator": "gte", "value_type": "date"},
+            ],
+        }
+
+        condition = Condition.from_dict(input)
+
+        assert condition.to_dict() == input
+        assert condition.check(signed_up_on="2024-02-01")
+        assert not condition.check(signed_up_on="2023-02-01")
+
+
+class TestFromChecks(BaseTest):
+    def test_groups_checks_by_variable(self) -> None:
+        condition = Condition.from_checks(
+            [Check.factory("seats__gte", "10", value_type="int"), Check.factory("seats__lt", "100", value_type="int")],
+        )
+
+        assert condition.check(seats="20")
+        assert not condition.check(seats="5")
+        assert len(condition.checks["seats"]) == 2  # noqa: PLR2004
@@ -0,0 +1,60 @@
+import unittest
+
+from flipper.conditions.intervals import IntervalSet
+
+
+class TestInit(unittest.TestCase):
+    def test_merges_overlapping_intervals(self) -> None:
+        intervals = IntervalSet([(5, 10), (1, 3), (2, 6)])
+        assert intervals.intervals == [(1, 10)]
+
+    def test_keeps_disjoint_intervals_sorted(self) -> None:
+        intervals = IntervalSet([(20, 30), (1, 3)])
+        assert intervals.intervals == [(1, 3), (20, 30)]
+
+    def test_drops_empty_intervals(self) -> None:
+        intervals = IntervalSet([(5, 1)])
+        assert len(intervals) == 0
+
+
+class TestFromValue(unittest.TestCase):
+    def test_accepts_single_pair(self) -> None:
+        assert IntervalSet.from_value([1, 5]).intervals == [(1, 5)]
+
+    def test_accepts_list_of_pairs(self) -> None:
+        assert IntervalSet.from_value([[1, 5], [7, 9]]).intervals == [(1, 5), (7, 9)]
+
+
+class TestContains(unittest.TestCase):
+    def test_bounds_are_inclusive(self) -> None:
+        intervals = IntervalSet([(1, 5)])
+        assert 1 in intervals
+        assert 5 in intervals  # noqa: PLR2004
+
+    def test_returns_false_between_intervals(self) -> None:
+        intervals = IntervalSet([(1, 5), (10, 20)])
+        assert 7 not in intervals  # noqa: PLR2004
+
+    def test_returns_false_below_first_interval(self) -> None:
+        intervals = IntervalSet([(1, 5)])
+        assert 0 not in intervals
+
+    def test_supports_strings(self) -> None:
+        intervals = IntervalSet([("2024-01-01", "2024-01-31")])
+        assert "2024-01-15" in intervals
+
+
+class TestSetOperations(unittest.TestCase):
+    def test_intersection(self) -> None:
+        left = IntervalSet([(1, 10), (20, 30)])
+        right = IntervalSet([(5, 25)])
+        assert left.intersection(right).intervals == [(5, 10), (20, 25)]
+
+    def test_union(self) -> None:
+        left = IntervalSet([(1, 5)])
+        right = IntervalSet([(4, 8), (10, 12)])
+        assert left.union(right).intervals == [(1, 8), (10, 12)]
+
+    def test_clip(self) -> None:
+        intervals = IntervalSet([(1, 5), (10, 20)])
+        assert intervals.clip(low=3, high=15).intervals == [(3, 5), (10, 15)]
@@ -0,0 +1,68 @@
+import unittest
+
+from flipper.conditions.matchers import TRIE_THRESHOLD, PrefixMatcher, SuffixMatcher, compile_pattern
+
+
+class TestPrefixMatcher(unittest.TestCase):
+    def test_matches_single_prefix(self) -> None:
+        matcher = PrefixMatcher.from_value("/admin")
+        assert matcher.matches("/admin/users")
+
+    def test_does_not_match_other_prefix(self) -> None:
+        matcher = PrefixMatcher.from_value(["/admin", "/api"])
+        assert not matcher.matches("/home")
+
+    def test_does_not_match_non_strings(self) -> None:
+        matcher = PrefixMatcher.from_value("1")
+        assert not matcher.matches(123)
+
+    def test_matches_with_trie_for_large_prefix_lists(self) -> None:
+        prefixes = [f"/tenant/{i}/" for i in range(TRIE_THRESHOLD * 10)]
+        matcher = PrefixMatcher(prefixes)
+
+        assert matcher.matches("/tenant/42/settings")
+        assert not matcher.matches("/tenant/9999/settings")
+        assert not matcher.matches("/tenant/4")
+
+    def test_trie_matches_same_values_as_startswith(self) -> None:
+        prefixes = [f"p{i}" for i in range(TRIE_THRESHOLD * 2)]
+        values = [f"p{i}x" for i in range(100)] + ["", "p", "q1"]
+
+        matcher = PrefixMatcher(prefixes)
+
+        assert [matcher.matches(v) for v in values] == [v.startswith(tuple(prefixes)) for v in values]
+
+
+class TestSuffixMatcher(unittest.TestCase):
+    def test_matches_single_suffix(self) -> None:
+        matcher = SuffixMatcher.from_value("@example.com")
+        assert matcher.matches("me@example.com")
+
+    def test_does_not_match_other_suffix(self) -> None:
+        matcher = SuffixMatcher.from_value(["@example.com"])
+        assert not matcher.matches("me@example.org")
+
+    def test_matches_with_trie_for_large_suffix_lists(self) -> None:
+        suffixes = [f"@customer{i}.com" for i in range(TRIE_THRESHOLD * 10)]
+        matcher = SuffixMatcher(suffixes)
+
+        assert matcher.matches("me@customer17.com")
+        assert not matcher.matches("me@customer17.org")
+
+
+class TestCompilePattern(unittest.TestCase):
+    def test_compiles_single_pattern(self) -> None:
+        assert compile_pattern("^a+$").search("aaa")
+
+    def test_combines_patterns_into_alternation(self) -> None:
+        pattern = compile_pattern(["^foo$", "^bar$"])
+
+        assert pattern.search("bar")
+        assert not pattern.search("foobar")
+
+    def test_searches_patterns_with_global_flags_one_by_one(self) -> None:
+        pattern = compile_pattern(["(?i)^bot", "crawler"])
+
+        assert pattern.search("BOT/1.0")
+        assert pattern.search("a crawler")
+        assert not pattern.search("Crawler")
@@ -0,0 +1,76 @@
+import ipaddress
+import unittest
+
+import pytest
+
+from flipper.conditions.networks import IPV4, IPV6, NetworkSet, parse_address
+
+
+class TestNetworkSet(unittest.TestCase):
+    def test_matches_addresses_inside_any_network(self) -> None:
+        networks = NetworkSet(["10.0.0.0/8", "192.168.1.0/24"])
+
+        assert "10.20.30.40" in networks
+        assert "192.168.1.255" in networks
+        assert "192.168.2.1" not in networks
+
+    def test_matches_ipv6_networks(self) -> None:
+        networks = NetworkSet(["2001:db8::/32"])
+
+        assert "2001:db8:ffff::1" in networks
+        assert "2001:db9::1" not in networks
+
+    def test_keeps_ip_versions_apart(self) -> None:
+        networks = NetworkSet(["0.0.0.0/0"])
+
+        assert "::1" not in networks
+
+    def test_matches_ipv4_mapped_ipv6_addresses(self) -> None:
+        networks = NetworkSet(["10.0.0.0/8"])
+
+        assert "::ffff:10.1.2.3" in networks
+
+    def test_accepts_single_addresses_and_host_bits(self) -> None:
+        networks = NetworkSet(["10.0.0.7", "172.16.5.4/12"])
+
+        assert "10.0.0.7" in networks
+        assert "10.0.0.8" not in networks
+        assert "172.31.0.1" in networks
+
+    def test_merges_overlapping_networks(self) -> None:
+        networks = NetworkSet(["10.0.0.0/8", "10.1.0.0/16", "10.2.3.0/24"])
+
+        assert len(networks) == 1
+
+    def test_accepts_ipaddress_objects(self) -> None:
+        networks = NetworkSet(["10.0.0.0/8"])
+
+        assert ipaddress.ip_address("10.0.0.1") in networks
+
+    def test_never_matches_invalid_addresses(self) -> None:
+        networks = NetworkSet(["0.0.0.0/0"])
+
+        assert "not an address" not in networks
+        assert None not in networks
+        assert 167772161 not in networks  # noqa: PLR2004
+
+    def test_raises_for_invalid_networks(self) -> None:
+        with pytest.raises(ValueError):  # noqa: PT011
+            NetworkSet(["10.0.0.0/33"])
+
+    def test_from_value_accepts_a_single_network(self) -> None:
+        assert "10.0.0.1" in NetworkSet.from_value("10.0.0.0/8")
+
+
+class TestParseAddress(unittest.TestCase):
+    def test_returns_version_and_integer(self) -> None:
+        assert parse_address("10.0.0.1") == (IPV4, 167772161)
+        assert parse_address("::1") == (IPV6, 1)
+
+    def test_returns_none_for_strings_with_nul(self) -> None:
+        assert parse_address("10.0.0.1\x00") is None
+        assert parse_address("::1\x00") is None
+        assert "10.0.0.1\x00" not in NetworkSet(["0.0.0.0/0"])
+
+    def test_ignores_ipv6_zone(self) -> None:
+        assert parse_address("fe80::1%eth0") == parse_address("fe80::1")
@@ -0,0 +1,43 @@
+import unittest
+from types import SimpleNamespace
+
+import pytest
+
+from flipper.conditions.paths import compile_path, split_variable
+
+
+class TestSplitVariable(unittest.TestCase):
+    def test_splits_root_from_path(self) -> None:
+        assert split_variable("user.company.plan") == ("user", "company.plan")
+
+    def test_plain_variables_have_no_path(self) -> None:
+        assert split_variable("plan") == ("plan", None)
+
+
+class TestCompilePath(unittest.TestCase):
+    def test_reads_attributes(self) -> None:
+        user = SimpleNamespace(company=SimpleNamespace(plan="pro"))
+        assert compile_path("company.plan")(user) == "pro"
+
+    def test_reads_mapping_keys(self) -> None:
+        assert compile_path("company.plan")({"company": {"plan": "pro"}}) == "pro"
+
+    def test_reads_keys_named_like_mapping_methods(self) -> None:
+        assert compile_path("values")({"values": "admin"}) == "admin"
+        assert compile_path("order.items")({"order": {"items": 5}}) == 5  # noqa: PLR2004
+        assert compile_path("settings.get")(SimpleNamespace(settings={"get": True}))
+
+    def test_mixes_attributes_and_keys(self) -> None:
+        user = SimpleNamespace(settings={"theme": SimpleNamespace(name="dark")})
+        assert compile_path("settings.theme.name")(user) == "dark"
+
+    def test_reads_sequence_indexes(self) -> None:
+        user = SimpleNamespace(emails=["a@example.com", "b@example.com"])
+        assert compile_path("emails.1")(user) == "b@example.com"
+
+    def test_raises_when_path_does_not_exist(self) -> None:
+        get = compile_path("company.plan")
+        with pytest.raises(AttributeError):
+            get(SimpleNamespace(company=None))
+        with pytest.raises(KeyError):
+            get({"company": {}})
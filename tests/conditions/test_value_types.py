@@ -0,0 +1,90 @@
+import unittest
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+
+from flipper.conditions.value_types import (
+    InvalidValueTypeError,
+    get_value_type,
+    infer_value_type,
+)
+
+
+class TestGetValueType(unittest.TestCase):
+    def test_returns_registered_types(self) -> None:
+        for name in ("datetime", "date", "decimal", "uuid", "int"):
+            assert name == get_value_type(name).NAME
+
+    def test_raises_for_unknown_type(self) -> None:
+        with pytest.raises(InvalidValueTypeError, match="Value type not supported"):
+            get_value_type("money")
+
+
+class TestInferValueType(unittest.TestCase):
+    def test_infers_from_python_objects(self) -> None:
+        assert infer_value_type(datetime(2024, 1, 1, tzinfo=UTC)).NAME == "datetime"
+        assert infer_value_type(date(2024, 1, 1)).NAME == "date"
+        assert infer_value_type(Decimal("1.5")).NAME == "decimal"
+        assert infer_value_type(uuid4()).NAME == "uuid"
+
+    def test_infers_from_list_elements(self) -> None:
+        assert infer_value_type([uuid4(), uuid4()]).NAME == "uuid"
+        assert infer_value_type([[date(2024, 1, 1), date(2024, 2, 1)]]).NAME == "date"
+
+    def test_leaves_json_values_untyped(self) -> None:
+        assert infer_value_type(1) is None
+        assert infer_value_type("2024-01-01") is None
+        assert infer_value_type([1, 2]) is None
+
+    def test_leaves_mixed_lists_untyped(self) -> None:
+        assert infer_value_type([uuid4(), "a"]) is None
+
+
+class TestCoerce(unittest.TestCase):
+    def test_returns_values_of_the_declared_type_unchanged(self) -> None:
+        value = uuid4()
+        assert get_value_type("uuid").coerce(value) is value
+
+    def test_parses_strings(self) -> None:
+        assert get_value_type("datetime").coerce("2024-01-01T10:00:00+00:00") == datetime(2024, 1, 1, 10, tzinfo=UTC)
+        assert get_value_type("date").coerce("2024-01-01") == date(2024, 1, 1)
+        assert get_value_type("decimal").coerce("1.10") == Decimal("1.10")
+        assert get_value_type("int").coerce("42") == 42  # noqa: PLR2004
+
+    def test_converts_related_types(self) -> None:
+        assert get_value_type("date").coerce(datetime(2024, 1, 1, 10)) == date(2024, 1, 1)  # noqa: DTZ001
+        assert get_value_type("datetime").coerce(date(2024, 1, 1)) == datetime(2024, 1, 1, tzinfo=UTC)
+        assert get_value_type("decimal").coerce(0.1) == Decimal("0.1")
+        assert get_value_type("decimal").coerce(3) == Decimal(3)
+
+    def test_treats_naive_datetimes_as_utc(self) -> None:
+        value_type = get_value_type("datetime")
+        assert value_type.coerce(datetime(2024, 1, 1, 10)) == datetime(2024, 1, 1, 10, tzinfo=UTC)  # noqa: DTZ001
+        assert value_type.coerce("2024-01-01T10:00:00") == datetime(2024, 1, 1, 10, tzinfo=UTC)
+
+    def test_raises_value_error_for_unparseable_strings(self) -> None:
+        for name in ("datetime", "date", "decimal", "uuid", "int"):
+            with pytest.raises(ValueError):  # noqa: PT011
+                get_value_type(name).coerce("not a value")
+
+    def test_raises_type_error_for_unsupported_types(self) -> None:
+        with pytest.raises(TypeError, match="Cannot convert"):
+            get_value_type("uuid").coerce(1.5)
+
+
+class TestThresholds(unittest.TestCase):
+    def test_coerces_each_element_of_a_list(self) -> None:
+        value = str(uuid4())
+        assert get_value_type("uuid").coerce_threshold([value]) == [UUID(value)]
+
+    def test_coerces_nested_ranges(self) -> None:
+        coerced = get_value_type("date").coerce_threshold([["2024-01-01", "2024-02-01"]])
+        assert coerced == [[date(2024, 1, 1), date(2024, 2, 1)]]
+
+    def test_serializes_to_json_values(self) -> None:
+        value_type = get_value_type("date")
+        assert value_type.serialize([date(2024, 1, 1), date(2024, 2, 1)]) == ["2024-01-01", "2024-02-01"]
+        assert get_value_type("decimal").serialize(Decimal("1.10")) == "1.10"
+        assert get_value_type("int").serialize(3) == 3  # noqa: PLR2004
@@ -0,0 +1,55 @@
+import unittest
+
+import pytest
+
+from flipper.conditions.versions import InvalidVersionError, parse_context_version, parse_version
+
+
+class TestParseVersion(unittest.TestCase):
+    def test_orders_components_numerically(self) -> None:
+        assert parse_version("5.12.0") > parse_version("5.9.3")
+
+    def test_treats_missing_components_as_zero(self) -> None:
+        assert parse_version("5.12") == parse_version("5.12.0")
+
+    def test_allows_leading_v(self) -> None:
+        assert parse_version("v1.2.3") == parse_version("1.2.3")
+
+    def test_ignores_build_metadata(self) -> None:
+        assert parse_version("1.2.3+build.7") == parse_version("1.2.3")
+
+    def test_orders_prerelease_before_release(self) -> None:
+        assert parse_version("1.0.0-rc.1") < parse_version("1.0.0")
+
+    def test_follows_semver_prerelease_precedence(self) -> None:
+        ordered = [
+            "1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha.beta",
+            "1.0.0-beta",
+            "1.0.0-beta.2",
+            "1.0.0-beta.11",
+            "1.0.0-rc.1",
+            "1.0.0",
+        ]
+        assert sorted(ordered, key=parse_version) == ordered
+
+    def test_raises_for_invalid_version(self) -> None:
+        with pytest.raises(InvalidVersionError):
+            parse_version("not-a-version")
+
+
+class TestParseContextVersion(unittest.TestCase):
+    def test_returns_none_for_invalid_version(self) -> None:
+        assert parse_context_version("garbage") is None
+
+    def test_returns_none_for_non_strings(self) -> None:
+        assert parse_context_version(5) is None
+
+    def test_caches_parsed_versions(self) -> None:
+        parse_context_version.cache_clear()
+
+        parse_context_version("3.4.5")
+        parse_context_version("3.4.5")
+
+        assert parse_context_version.cache_info().hits == 1
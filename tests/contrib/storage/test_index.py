@@ -0,0 +1,145 @@
+import random
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from flipper import Condition
+from flipper.bucketing import ConsistentHashPercentageBucketer, Percentage
+from flipper.bucketing.hashing import encode_identity
+from flipper.conditions.check import Check
+from flipper.contrib.storage import FeatureFlagRuleIndex, FeatureFlagStoreItem, FeatureFlagStoreMeta
+
+
+class BaseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = int(datetime.now().timestamp())  # noqa: DTZ005
+
+    def item(self, name, is_enabled=True, conditions=None, bucketer=None):
+        return FeatureFlagStoreItem(
+            name,
+            is_enabled,
+            FeatureFlagStoreMeta(self.now, conditions=conditions, bucketer=bucketer),
+        )
+
+
+class TestEvaluate(BaseTest):
+    def test_returns_false_for_disabled_flags(self) -> None:
+        index = FeatureFlagRuleIndex([self.item("a", is_enabled=False)])
+
+        assert index.evaluate(foo=1) == {"a": False}
+
+    def test_shares_identical_checks_across_flags(self) -> None:
+        items = [self.item(str(i), conditions=[Condition(is_staff=True, plan__in=["pro"])]) for i in range(10)]
+
+        index = FeatureFlagRuleIndex(items)
+
+        assert index.distinct_check_count == 2  # noqa: PLR2004
+
+    def test_keeps_checks_with_equal_but_differently_typed_values_apart(self) -> None:
+        items = [self.item("a", conditions=[Condition(foo=1)]), self.item("b", conditions=[Condition(foo=True)])]
+
+        index = FeatureFlagRuleIndex(items)
+
+        assert index.distinct_check_count == 2  # noqa: PLR2004
+
+    def test_keeps_typed_and_untyped_checks_apart(self) -> None:
+        typed = Condition.from_checks([Check.factory("seats", 10, value_type="int")])
+        items = [self.item("a", conditions=[Condition(seats=10)]), self.item("b", conditions=[typed])]
+
+        index = FeatureFlagRuleIndex(items)
+
+        assert index.evaluate(seats="10") == {"a": False, "b": True}
+
+    def test_runs_each_distinct_check_once_per_context(self) -> None:
+        condition = Condition(is_staff=True)
+        check = next(condition.iter_checks())
+        check.check = MagicMock(return_value=True)
+        items = [self.item(str(i), conditions=[condition]) for i in range(5)]
+
+        FeatureFlagRuleIndex(items).evaluate(is_staff=True)
+
+        check.check.assert_called_once_with(True)
+
+    def test_resolves_lazy_values_once_across_flags(self) -> None:
+        seats = MagicMock(return_value=20)
+        items = [
+            self.item("a", conditions=[Condition(seats__gte=10)]),
+            self.item("b", conditions=[Condition(seats__lt=5)]),
+        ]
+
+        index = FeatureFlagRuleIndex(items)
+
+        assert index.evaluate(seats=seats, plan=MagicMock()) == {"a": True, "b": False}
+        seats.assert_called_once_with()
+
+    def test_follows_dotted_paths(self) -> None:
+        items = [
+            self.item("a", conditions=[Condition(**{"user.plan": "pro"})]),
+            self.item("b", conditions=[Condition(**{"user.seats__gt": 10})]),
+        ]
+
+        index = FeatureFlagRuleIndex(items)
+
+        assert index.evaluate(user={"plan": "pro", "seats": 3}) == {"a": True, "b": False}
+
+    def test_reads_flat_dotted_keys_before_paths(self) -> None:
+        index = FeatureFlagRuleIndex([self.item("a", conditions=[Condition(**{"app.version": "1.0"})])])
+
+        assert index.evaluate(**{"app.version": "2.0"}) == {"a": False}
+        assert index.evaluate(app={"version": "1.0"}) == {"a": True}
+
+    def test_hashes_identity_once_for_salted_bucketers(self) -> None:
+        items = [
+            self.item(
+                str(i),
+                bucketer=ConsistentHashPercentageBucketer(
+                    key_whitelist=["user_id"],
+                    percentage=Percentage(0.5),
+                    hash_version=2,
+                    salt=str(i),
+                ),
+            )
+            for i in range(10)
+        ]
+        index = FeatureFlagRuleIndex(items)
+
+        with patch(
+            "flipper.bucketing.hashing.encode_identity",
+            wraps=encode_identity,
+        ) as encode:
+            results = index.evaluate(user_id=42)
+
+        assert encode.call_count == 1
+        assert results == {item.feature_name: item.is_enabled(user_id=42) for item in items}
+
+    def test_falls_back_to_bucketer_without_conditions(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(key_whitelist=["user_id"], percentage=Percentage(0.5))
+        item = self.item("a", bucketer=bucketer)
+
+        index = FeatureFlagRuleIndex([item])
+
+        for user_id in range(20):
+            assert index.evaluate(user_id=user_id)["a"] == item.is_enabled(user_id=user_id)
+
+
+class TestMatchesItems(BaseTest):
+    def test_agrees_with_is_enabled_per_item(self) -> None:
+        rng = random.Random(11)  # noqa: S311
+        operators = ["", "__gt", "__lte", "__ne", "__in", "__not_in"]
+
+        items = []
+        for i in range(200):
+            conditions = []
+            for _ in range(rng.randint(0, 3)):
+                variable = rng.choice(["is_staff", "plan", "seats"])
+                operator = rng.choice(operators)
+                value = rng.sample(range(4), 2) if operator.endswith("in") else rng.randint(0, 3)
+                conditions.append(Condition(**{variable + operator: value}))
+            is_enabled = rng.random() > 0.2  # noqa: PLR2004
+            items.append(self.item(str(i), is_enabled=is_enabled, conditions=conditions))
+
+        index = FeatureFlagRuleIndex(items)
+
+        for _ in range(50):
+            context = {v: rng.randint(0, 3) for v in rng.sample(["is_staff", "plan", "seats"], rng.randint(0, 3))}
+            assert index.evaluate(**context) == {item.feature_name: item.is_enabled(**context) for item in items}
@@ -1,11 +1,15 @@
 import json
 import unittest
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
 from flipper import Condition
+from flipper.bucketing import ConsistentHashPercentageBucketer, Percentage
+from flipper.conditions import AdaptiveOrdering
+from flipper.context import EvaluationContext
 from flipper.contrib.storage import FeatureFlagStoreItem, FeatureFlagStoreMeta
+from flipper.contrib.storage.item import COMPILE_AFTER_EVALUATIONS
 
 
 class BaseTest(unittest.TestCase):
@@ -197,3 +201,101 @@ class TestIsEnabled(BaseTest):
         meta = FeatureFlagStoreMeta(self.now, bucketer=bucketer, conditions=[condition])
         item = FeatureFlagStoreItem(self.txt(), True, meta)
         assert not item.is_enabled(is_admin=False)
+
+
+class TestLazyContext(BaseTest):
+    def test_does_not_resolve_values_when_disabled(self) -> None:
+        loader = MagicMock(return_value=True)
+        meta = FeatureFlagStoreMeta(self.now, conditions=[Condition(foo=True)])
+        item = FeatureFlagStoreItem(self.txt(), False, meta)
+
+        assert not item.is_enabled(foo=loader)
+        loader.assert_not_called()
+
+    def test_does_not_wrap_context_for_plain_flags(self) -> None:
+        item = FeatureFlagStoreItem(self.txt(), True, FeatureFlagStoreMeta(self.now))
+
+        with patch.object(EvaluationContext, "wrap") as wrap:
+            assert item.is_enabled(foo=MagicMock())
+        wrap.assert_not_called()
+
+    def test_resolves_only_variables_with_checks(self) -> None:
+        foo, bar = MagicMock(return_value=True), MagicMock(return_value=1)
+        meta = FeatureFlagStoreMeta(self.now, conditions=[Condition(foo=True)])
+        item = FeatureFlagStoreItem(self.txt(), True, meta)
+
+        assert item.is_enabled(foo=foo, bar=bar)
+        foo.assert_called_once_with()
+        bar.assert_not_called()
+
+    def test_resolves_each_value_once_across_conditions(self) -> None:
+        seats = MagicMock(return_value=20)
+        meta = FeatureFlagStoreMeta(self.now, conditions=[Condition(seats__gte=10), Condition(seats__lt=100)])
+        item = FeatureFlagStoreItem(self.txt(), True, meta)
+
+        assert item.is_enabled(seats=seats)
+        seats.assert_called_once_with()
+
+    def test_bucketer_resolves_only_whitelisted_keys(self) -> None:
+        user_id, plan = MagicMock(return_value=1), MagicMock(return_value="pro")
+        bucketer = ConsistentHashPercentageBucketer(key_whitelist=["user_id"], percentage=Percentage(0.5))
+        meta = FeatureFlagStoreMeta(self.now, bucketer=bucketer)
+        item = FeatureFlagStoreItem(self.txt(), True, meta)
+
+        assert item.is_enabled(user_id=user_id, plan=plan) == bucketer.check(user_id=1)
+        user_id.assert_called_once_with()
+        plan.assert_not_called()
+
+    def test_accepts_lazy_mappings(self) -> None:
+        source = MagicMock()
+        source.__len__.return_value = 2
+        source.__contains__.side_effect = lambda key: key == "foo"
+        source.__getitem__.return_value = True
+        meta = FeatureFlagStoreMeta(self.now, conditions=[Condition(foo=True, bar=1)])
+        item = FeatureFlagStoreItem(self.txt(), True, meta)
+
+        assert item.is_enabled_context(source)
+        source.__getitem__.assert_called_once_with("foo")
+
+
+class TestCompileConditions(BaseTest):
+    def test_does_not_compile_for_a_single_evaluation(self) -> None:
+        meta = FeatureFlagStoreMeta(self.now, conditions=[Condition(foo=True)])
+        item = FeatureFlagStoreItem(self.txt(), True, meta)
+
+        assert item.is_enabled(foo=True)
+        assert item._compiled_conditions is None  # noqa: SLF001
+
+    def test_compiles_once_reused(self) -> None:
+        meta = FeatureFlagStoreMeta(self.now, conditions=[Condition(foo=True), Condition(bar__gt=1)])
+        item = FeatureFlagStoreItem(self.txt(), True, meta)
+
+        results = [item.is_enabled(foo=True, bar=value) for value in range(COMPILE_AFTER_EVALUATIONS + 1)]
+
+        assert item._compiled_conditions is not None  # noqa: SLF001
+        assert results == [value > 1 for value in range(COMPILE_AFTER_EVALUATIONS + 1)]
+
+
+class TestConfigureAdaptiveOrdering(BaseTest):
+    def tearDown(self) -> None:
+        FeatureFlagStoreItem.configure_adaptive_ordering(None)
+
+    def test_compiles_conditions_with_adaptive_ordering(self) -> None:
+        FeatureFlagStoreItem.configure_adaptive_ordering(AdaptiveOrdering(sample_every=1))
+        meta = FeatureFlagStoreMeta(self.now, conditions=[Condition(foo=True)])
+        item = FeatureFlagStoreItem(self.txt(), True, meta)
+
+        for _ in range(COMPILE_AFTER_EVALUATIONS):
+            item.is_enabled(foo=True)
+
+        [(_, statistics)] = item.compiled_conditions.statistics
+        assert statistics.samples == 1
+
+    def test_does_not_sample_by_default(self) -> None:
+        meta = FeatureFlagStoreMeta(self.now, conditions=[Condition(foo=True)])
+        item = FeatureFlagStoreItem(self.txt(), True, meta)
+
+        item.is_enabled(foo=True)
+
+        [(_, statistics)] = item.compiled_conditions.statistics
+        assert statistics.samples == 0
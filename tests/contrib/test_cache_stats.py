@@ -0,0 +1,62 @@
+import unittest
+
+import pytest
+
+from flipper.contrib.cache_stats import CacheStats, LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_counts_observations_into_cumulative_buckets(self) -> None:
+        histogram = LatencyHistogram([0.01, 0.1])
+        for seconds in (0.005, 0.05, 0.05, 3.0):
+            histogram.observe(seconds)
+
+        assert histogram.buckets() == [(0.01, 1), (0.1, 3), (float("inf"), 4)]
+        assert histogram.count == 4  # noqa: PLR2004
+        assert histogram.sum == pytest.approx(3.105)
+
+    def test_counts_bound_in_its_own_bucket(self) -> None:
+        histogram = LatencyHistogram([0.01, 0.1])
+        histogram.observe(0.01)
+
+        assert histogram.buckets()[0] == (0.01, 1)
+
+    def test_estimates_quantiles_by_bucket(self) -> None:
+        histogram = LatencyHistogram([0.01, 0.1, 1.0])
+        for seconds in [0.005] * 90 + [0.5] * 10:
+            histogram.observe(seconds)
+
+        assert histogram.quantile(0.5) == 0.01  # noqa: PLR2004
+        assert histogram.quantile(0.99) == 1.0
+        assert LatencyHistogram().quantile(0.5) is None
+
+    def test_copy_is_independent(self) -> None:
+        histogram = LatencyHistogram([0.01])
+        copy = histogram.copy()
+        histogram.observe(0.001)
+
+        assert copy.count == 0
+
+
+class TestCacheStats(unittest.TestCase):
+    def stats(self, hits: int, misses: int) -> CacheStats:
+        return CacheStats(
+            hits=hits,
+            negative_hits=0,
+            misses=misses,
+            loads=misses,
+            load_errors=0,
+            evictions={},
+            load_latency=LatencyHistogram(),
+            currsize=misses,
+        )
+
+    def test_computes_hit_rate(self) -> None:
+        stats = self.stats(3, 1)
+
+        assert stats.requests == 4  # noqa: PLR2004
+        assert stats.hit_rate == 0.75  # noqa: PLR2004
+        assert stats.to_dict()["hit_rate"] == 0.75  # noqa: PLR2004
+
+    def test_hit_rate_is_zero_without_requests(self) -> None:
+        assert self.stats(0, 0).hit_rate == 0.0
@@ -1,11 +1,18 @@
+import asyncio
+import threading
 import unittest
 from datetime import datetime
 from time import sleep
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
+import pytest
+from cachetools import LFUCache, LRUCache
+
 from flipper import CachedFeatureFlagStore, Condition, MemoryFeatureFlagStore
+from flipper.contrib.cached import ENTRY_OVERHEAD_BYTES
 from flipper.contrib.storage import FeatureFlagStoreItem, FeatureFlagStoreMeta
+from flipper.contrib.util.tinylfu import WTinyLFUCache
 
 
 class BaseTest(unittest.TestCase):
@@ -152,6 +159,493 @@ class TestGet(BaseTest):
         slow.get.assert_called_once_with(feature_name)
 
 
+class TestConcurrent(BaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.fast = CachedFeatureFlagStore(self.slow, concurrent=True, segments=4)
+
+    def test_returns_cached_value(self) -> None:
+        feature_name = self.txt()
+
+        self.fast.create(feature_name, is_enabled=True)
+        self.slow.set(feature_name, False)
+
+        assert self.fast.get(feature_name).is_enabled()
+
+    def test_writes_through_to_cache(self) -> None:
+        feature_name = self.txt()
+
+        self.fast.create(feature_name)
+        self.fast.set(feature_name, True)
+
+        assert self.fast.get(feature_name).is_enabled()
+
+        self.fast.delete(feature_name)
+
+        assert self.fast.get(feature_name) is None
+
+    def test_reloads_after_ttl_expired(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, ttl=-10, concurrent=True)
+        feature_name = self.txt()
+
+        fast.create(feature_name, is_enabled=True)
+        self.slow.set(feature_name, False)
+
+        assert not fast.get(feature_name).is_enabled()
+
+    def test_caches_flags_that_do_not_exist(self) -> None:
+        slow = MagicMock()
+        slow.get.return_value = None
+        fast = CachedFeatureFlagStore(slow, concurrent=True)
+        feature_name = self.txt()
+
+        fast.get(feature_name)
+        fast.get(feature_name)
+
+        slow.get.assert_called_once_with(feature_name)
+
+    def test_handles_concurrent_gets_and_sets(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, size=16, concurrent=True, segments=4)
+        feature_names = [self.txt() for _ in range(64)]
+        for name in feature_names:
+            self.slow.create(name, is_enabled=True)
+        errors = []
+
+        def hammer(offset: int) -> None:
+            try:
+                for i in range(2000):
+                    name = feature_names[(offset + i) % len(feature_names)]
+                    if i % 10 == 0:
+                        fast.set(name, True)
+                    assert fast.get(name).is_enabled()
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+
+        threads = [threading.Thread(target=hammer, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+
+class TestEvictionPolicy(BaseTest):
+    def test_uses_lru_by_default(self) -> None:
+        assert isinstance(self.fast._cache, LRUCache)  # noqa: SLF001
+
+    def test_builds_cache_for_named_policy(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, eviction_policy="w-tinylfu")
+
+        assert isinstance(fast._cache, WTinyLFUCache)  # noqa: SLF001
+
+    def test_accepts_cache_factory(self) -> None:
+        factory = MagicMock(side_effect=LFUCache)
+
+        fast = CachedFeatureFlagStore(self.slow, size=100, eviction_policy=factory)
+
+        factory.assert_called_once_with(100)
+        assert isinstance(fast._cache, LFUCache)  # noqa: SLF001
+
+    def test_applies_policy_to_concurrent_segments(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, eviction_policy="w-tinylfu", concurrent=True)
+        feature_name = self.txt()
+        fast.create(feature_name, is_enabled=True)
+
+        assert fast.get(feature_name).is_enabled()
+        assert all(isinstance(segment.cache, WTinyLFUCache) for segment in fast._cache._segments)  # noqa: SLF001
+
+    def test_keeps_hot_flags_through_scan(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, size=100, eviction_policy="w-tinylfu")
+        hot = [self.txt() for _ in range(20)]
+        for feature_name in hot:
+            self.slow.create(feature_name)
+            for _ in range(5):
+                fast.get(feature_name)
+        fast.get(self.txt())
+
+        for _ in range(500):
+            fast.get(self.txt())
+
+        self.slow.get = MagicMock()
+        for feature_name in hot:
+            fast.get(feature_name)
+        assert self.slow.get.call_count <= 2  # noqa: PLR2004
+
+    def test_rejects_unknown_policy(self) -> None:
+        with pytest.raises(ValueError, match="eviction_policy"):
+            CachedFeatureFlagStore(self.slow, eviction_policy="fifo")
+
+
+class TestMaxBytes(BaseTest):
+    def create(self, fast: CachedFeatureFlagStore, payload_bytes: int) -> str:
+        feature_name = self.txt()
+        fast.create(feature_name, client_data={"payload": "x" * payload_bytes})
+        return feature_name
+
+    def weight(self, feature_name: str) -> int:
+        return ENTRY_OVERHEAD_BYTES + len(self.slow.get(feature_name).serialize())
+
+    def test_reports_weight_of_cached_entries(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, max_bytes=100_000)
+        first = self.create(fast, 1000)
+        second = self.create(fast, 5000)
+
+        assert fast.currsize == self.weight(first) + self.weight(second)
+
+    def test_counts_cached_misses(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, max_bytes=100_000)
+
+        fast.get(self.txt())
+
+        assert fast.currsize == ENTRY_OVERHEAD_BYTES
+
+    def test_evicts_by_weight(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, max_bytes=10_000)
+        feature_names = [self.create(fast, 3000) for _ in range(4)]
+
+        assert fast.currsize <= 10_000  # noqa: PLR2004
+        assert feature_names[0] not in fast._cache  # noqa: SLF001
+        assert feature_names[-1] in fast._cache  # noqa: SLF001
+
+    def test_does_not_cache_entries_over_max_entry_bytes(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, max_bytes=100_000, max_entry_bytes=2000)
+        small = self.create(fast, 100)
+        large = self.create(fast, 5000)
+
+        assert small in fast._cache  # noqa: SLF001
+        assert large not in fast._cache  # noqa: SLF001
+        assert fast.get(large)._meta.client_data == {"payload": "x" * 5000}  # noqa: SLF001
+
+    def test_drops_previous_copy_when_entry_grows_too_large(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, max_bytes=100_000, max_entry_bytes=2000)
+        feature_name = self.create(fast, 100)
+
+        meta = fast.get(feature_name)._meta  # noqa: SLF001
+        meta.client_data = {"payload": "x" * 5000}
+        fast.set_meta(feature_name, meta)
+
+        assert feature_name not in fast._cache  # noqa: SLF001
+        assert fast.get(feature_name)._meta.client_data == {"payload": "x" * 5000}  # noqa: SLF001
+
+    def test_weighs_entries_with_ttl(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, ttl=60, max_bytes=100_000, concurrent=True, segments=1)
+        feature_name = self.create(fast, 1000)
+
+        assert fast.currsize == self.weight(feature_name)
+
+    def test_passes_getsizeof_to_cache_factory(self) -> None:
+        factory = MagicMock(side_effect=LRUCache)
+
+        CachedFeatureFlagStore(self.slow, max_bytes=1000, eviction_policy=factory)
+
+        assert factory.call_args.args == (1000,)
+        assert callable(factory.call_args.kwargs["getsizeof"])
+
+    def test_rejects_max_entry_bytes_without_max_bytes(self) -> None:
+        with pytest.raises(ValueError, match="max_entry_bytes requires max_bytes"):
+            CachedFeatureFlagStore(self.slow, max_entry_bytes=1000)
+
+
+class TestStats(BaseTest):
+    def test_counts_hits_and_misses(self) -> None:
+        feature_name = self.txt()
+        self.slow.create(feature_name)
+
+        self.fast.get(feature_name)
+        self.fast.get(feature_name)
+        self.fast.get(feature_name)
+        stats = self.fast.stats()
+
+        assert (stats.hits, stats.misses, stats.negative_hits) == (2, 1, 0)
+        assert stats.loads == 1
+        assert stats.load_latency.count == 1
+
+    def test_counts_negative_hits(self) -> None:
+        feature_name = self.txt()
+
+        self.fast.get(feature_name)
+        self.fast.get(feature_name)
+        stats = self.fast.stats()
+
+        assert (stats.hits, stats.misses, stats.negative_hits) == (1, 1, 1)
+
+    def test_counts_load_errors(self) -> None:
+        self.slow.get = MagicMock(side_effect=ConnectionError)
+
+        with pytest.raises(ConnectionError):
+            self.fast.get(self.txt())
+
+        stats = self.fast.stats()
+        assert (stats.loads, stats.load_errors) == (0, 1)
+
+    def test_counts_size_evictions(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, size=2)
+        for _ in range(5):
+            fast.get(self.txt())
+
+        assert fast.stats().evictions["size"] == 3  # noqa: PLR2004
+
+    def test_counts_size_evictions_in_concurrent_mode(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, size=2, concurrent=True, segments=1, eviction_policy="w-tinylfu")
+        for _ in range(5):
+            fast.get(self.txt())
+
+        assert fast.stats().evictions["size"] == 3  # noqa: PLR2004
+
+    def test_counts_expired_entries(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, ttl=10)
+        feature_name = self.txt()
+        fast.get(feature_name)
+
+        with patch("flipper.contrib.cached.monotonic", return_value=float("inf")):
+            fast.get(feature_name)
+
+        assert fast.stats().evictions["expired"] == 1
+
+    def test_counts_an_expired_entry_once(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, ttl=10)
+        feature_name = self.txt()
+        fast.get(feature_name)
+        self.slow.get = MagicMock(side_effect=ConnectionError)
+
+        with patch("flipper.contrib.cached.monotonic", return_value=float("inf")):
+            for _ in range(5):
+                with pytest.raises(ConnectionError):
+                    fast.get(feature_name)
+
+        stats = fast.stats()
+        assert stats.evictions["expired"] == 1
+        assert stats.currsize == 0
+
+    def test_counts_oversized_entries(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, max_bytes=10_000, max_entry_bytes=500)
+        fast.create(self.txt(), client_data={"payload": "x" * 1000})
+
+        assert fast.stats().evictions["oversized"] == 1
+
+    def test_calls_event_hook(self) -> None:
+        events = []
+        fast = CachedFeatureFlagStore(self.slow, on_event=events.append)
+        feature_name = self.txt()
+
+        fast.get(feature_name)
+        fast.get(feature_name)
+
+        assert [event.kind for event in events] == ["miss", "load", "negative_hit"]
+        assert events[1].duration >= 0
+
+    def test_ignores_failing_event_hook(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, on_event=MagicMock(side_effect=RuntimeError))
+        feature_name = self.txt()
+        self.slow.create(feature_name, is_enabled=True)
+
+        assert fast.get(feature_name).is_enabled()
+
+    def test_reports_currsize(self) -> None:
+        self.fast.get(self.txt())
+
+        assert self.fast.stats().to_dict()["currsize"] == 1
+
+
+class TestRefreshAhead(BaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.now = 1000.0
+        clock = patch("flipper.contrib.cached.monotonic", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def cached(self, **kwargs) -> CachedFeatureFlagStore:
+        return CachedFeatureFlagStore(self.slow, ttl=100, refresh_workers=1, **kwargs)
+
+    def wait_for_refreshes(self, fast: CachedFeatureFlagStore) -> None:
+        # With one worker, a no-op task finishes after every queued refresh.
+        if fast._executor is not None:  # noqa: SLF001
+            fast._executor.submit(lambda: None).result()  # noqa: SLF001
+
+    def test_returns_cached_value_before_refresh_point(self) -> None:
+        fast = self.cached(refresh_ahead=0.5)
+        feature_name = self.txt()
+        fast.create(feature_name)
+        self.slow.set(feature_name, True)
+
+        self.now += 40
+
+        assert not fast.get(feature_name).is_enabled()
+        self.wait_for_refreshes(fast)
+        assert not fast.get(feature_name).is_enabled()
+
+    def test_returns_cached_value_and_reloads_in_background_after_refresh_point(self) -> None:
+        fast = self.cached(refresh_ahead=0.5)
+        feature_name = self.txt()
+        fast.create(feature_name)
+        self.slow.set(feature_name, True)
+
+        self.now += 60
+
+        assert not fast.get(feature_name).is_enabled()
+        self.wait_for_refreshes(fast)
+        assert fast.get(feature_name).is_enabled()
+
+    def test_schedules_one_reload_per_entry(self) -> None:
+        fast = self.cached(refresh_ahead=0.5)
+        feature_name = self.txt()
+        fast.create(feature_name)
+        self.slow.get = MagicMock(return_value=None)
+
+        self.now += 60
+        for _ in range(5):
+            fast.get(feature_name)
+        self.wait_for_refreshes(fast)
+
+        self.slow.get.assert_called_once_with(feature_name)
+
+    def test_returns_stale_value_within_max_stale(self) -> None:
+        fast = self.cached(max_stale=50)
+        feature_name = self.txt()
+        fast.create(feature_name)
+        self.slow.set(feature_name, True)
+
+        self.now += 120
+
+        assert not fast.get(feature_name).is_enabled()
+        self.wait_for_refreshes(fast)
+        assert fast.get(feature_name).is_enabled()
+
+    def test_reloads_before_returning_beyond_max_stale(self) -> None:
+        fast = self.cached(refresh_ahead=0.5, max_stale=50)
+        feature_name = self.txt()
+        fast.create(feature_name)
+        self.slow.set(feature_name, True)
+
+        self.now += 160
+
+        assert fast.get(feature_name).is_enabled()
+
+    def test_keeps_stale_value_when_reload_fails(self) -> None:
+        fast = self.cached(refresh_ahead=0.5)
+        feature_name = self.txt()
+        fast.create(feature_name)
+        self.slow.get = MagicMock(side_effect=ConnectionError)
+
+        self.now += 60
+        fast.get(feature_name)
+        self.wait_for_refreshes(fast)
+
+        assert fast.get(feature_name) is not None
+        self.wait_for_refreshes(fast)
+        assert self.slow.get.call_count == 2  # noqa: PLR2004
+
+    def test_writes_made_during_reload_win(self) -> None:
+        fast = self.cached(refresh_ahead=0.5)
+        feature_name = self.txt()
+        fast.create(feature_name)
+        entry = fast._cache[feature_name]  # noqa: SLF001
+
+        fast.set(feature_name, True)
+        self.slow.set(feature_name, False)
+        fast._refresh(feature_name, entry)  # noqa: SLF001
+
+        assert fast.get(feature_name).is_enabled()
+
+    def test_jitter_spreads_expirations(self) -> None:
+        fast = self.cached(ttl_jitter=0.5)
+        feature_names = [self.txt() for _ in range(20)]
+        for name in feature_names:
+            fast.create(name)
+
+        expirations = {fast._cache[name].expires_at - self.now for name in feature_names}  # noqa: SLF001
+
+        assert len(expirations) > 1
+        assert all(50 <= ttl <= 100 for ttl in expirations)  # noqa: PLR2004
+
+    def test_requires_ttl(self) -> None:
+        with pytest.raises(ValueError, match="require a ttl"):
+            CachedFeatureFlagStore(self.slow, refresh_ahead=0.5)
+
+    def test_rejects_refresh_ahead_outside_ttl(self) -> None:
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            self.cached(refresh_ahead=1.5)
+
+
+class TestSingleFlight(BaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.feature_name = self.txt()
+        self.slow.create(self.feature_name, is_enabled=True)
+        self.release = threading.Event()
+        self.started = threading.Event()
+        get = self.slow.get
+
+        def slow_get(feature_name: str) -> FeatureFlagStoreItem | None:
+            self.started.set()
+            self.release.wait(5)
+            return get(feature_name)
+
+        self.slow.get = MagicMock(side_effect=slow_get)
+
+    def test_coalesces_concurrent_misses(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, concurrent=True)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fast.get(self.feature_name))) for _ in range(8)]
+
+        threads[0].start()
+        self.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        sleep(0.05)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 8  # noqa: PLR2004
+        assert all(item.is_enabled() for item in results)
+        self.slow.get.assert_called_once_with(self.feature_name)
+
+    def test_waiters_time_out(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, concurrent=True, load_timeout=0.01)
+        leader = threading.Thread(target=fast.get, args=(self.feature_name,))
+        leader.start()
+        self.started.wait(5)
+
+        with pytest.raises(TimeoutError):
+            fast.get(self.feature_name)
+
+        self.release.set()
+        leader.join()
+        assert fast.get(self.feature_name).is_enabled()
+
+    def test_does_not_cache_load_errors(self) -> None:
+        self.slow.get = MagicMock(side_effect=[ConnectionError, None])
+
+        with pytest.raises(ConnectionError):
+            self.fast.get(self.feature_name)
+
+        assert self.fast.get(self.feature_name) is None
+
+    def test_aget_returns_cached_item(self) -> None:
+        self.release.set()
+
+        item = asyncio.run(self.fast.aget(self.feature_name))
+
+        assert item.is_enabled()
+        assert self.fast.get(self.feature_name) is item
+        self.slow.get.assert_called_once_with(self.feature_name)
+
+    def test_aget_coalesces_concurrent_misses(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow, concurrent=True)
+
+        async def main() -> list:
+            waiters = [asyncio.ensure_future(fast.aget(self.feature_name)) for _ in range(5)]
+            await asyncio.sleep(0)
+            self.release.set()
+            return await asyncio.gather(*waiters)
+
+        assert all(item.is_enabled() for item in asyncio.run(main()))
+        self.slow.get.assert_called_once_with(self.feature_name)
+
+
 class TestSet(BaseTest):
     def test_sets_value_correctly(self) -> None:
         feature_name = self.txt()
@@ -261,6 +755,124 @@ class TestList(BaseTest):
         assert expected == actual
 
 
+class TestCachedCatalog(BaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.now = 1000.0
+        clock = patch("flipper.contrib.cached.monotonic", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.fast = CachedFeatureFlagStore(self.slow, cache_catalog=True, catalog_ttl=60)
+        self.feature_names = sorted(self.txt() for _ in range(5))
+        for name in self.feature_names:
+            self.slow.create(name)
+        self.slow.list = MagicMock(side_effect=self.slow.list)
+
+    def names(self, **kwargs) -> list[str]:
+        return [item.feature_name for item in self.fast.list(**kwargs)]
+
+    def test_reads_list_from_store_once(self) -> None:
+        assert self.names() == self.feature_names
+        assert self.names() == self.feature_names
+
+        self.slow.list.assert_called_once_with()
+
+    def test_applies_limit_and_offset_in_memory(self) -> None:
+        assert self.names(offset=1, limit=2) == self.feature_names[1:3]
+        assert self.names(offset=3) == self.feature_names[3:]
+        assert self.names(limit=0) == []
+
+        self.slow.list.assert_called_once_with()
+
+    def test_warms_item_cache(self) -> None:
+        self.names()
+        self.slow.get = MagicMock()
+
+        assert self.fast.get(self.feature_names[0]).feature_name == self.feature_names[0]
+        self.slow.get.assert_not_called()
+
+    def test_reads_list_again_after_catalog_ttl(self) -> None:
+        self.names()
+        self.now += 60
+        self.names()
+
+        assert self.slow.list.call_count == 2  # noqa: PLR2004
+
+    def test_create_drops_catalog(self) -> None:
+        self.names()
+        feature_name = self.txt()
+
+        self.fast.create(feature_name)
+
+        assert self.names() == sorted([*self.feature_names, feature_name])
+
+    def test_delete_drops_catalog(self) -> None:
+        self.names()
+
+        self.fast.delete(self.feature_names[0])
+
+        assert self.names() == self.feature_names[1:]
+
+    def test_set_updates_catalog_in_place(self) -> None:
+        self.names()
+
+        self.fast.set(self.feature_names[2], True)
+
+        assert [item.is_enabled() for item in self.fast.list()] == [False, False, True, False, False]
+        self.slow.list.assert_called_once_with()
+
+    def test_set_of_missing_flag_drops_catalog(self) -> None:
+        self.names()
+        feature_name = self.txt()
+
+        self.fast.set(feature_name, True)
+
+        assert self.names() == sorted([*self.feature_names, feature_name])
+
+    def test_bulk_read_started_before_create_is_not_kept(self) -> None:
+        feature_name = self.txt()
+        list_ = self.slow.list
+
+        def list_then_create():
+            items = list(list_())
+            self.fast.create(feature_name)
+            return iter(items)
+
+        self.slow.list = MagicMock(side_effect=list_then_create)
+        assert feature_name not in self.names()
+        self.slow.list = MagicMock(side_effect=list_)
+
+        assert feature_name in self.names()
+
+    def test_bulk_read_does_not_overwrite_write_made_during_it(self) -> None:
+        feature_name = self.feature_names[0]
+        list_ = self.slow.list
+
+        def list_then_set():
+            items = list(list_())
+            self.fast.set(feature_name, True)
+            return iter(items)
+
+        self.slow.list = MagicMock(side_effect=list_then_set)
+        self.names()
+        self.slow.list = MagicMock(side_effect=list_)
+
+        assert self.fast.get(feature_name).is_enabled()
+        assert next(self.fast.list()).is_enabled()
+
+    def test_passes_through_without_cache_catalog(self) -> None:
+        fast = CachedFeatureFlagStore(self.slow)
+
+        list(fast.list())
+        list(fast.list())
+
+        assert self.slow.list.call_count == 2  # noqa: PLR2004
+
+    def test_rejects_catalog_ttl_without_cache_catalog(self) -> None:
+        with pytest.raises(ValueError, match="catalog_ttl requires cache_catalog"):
+            CachedFeatureFlagStore(self.slow, catalog_ttl=60)
+
+
 class TestSetMeta(BaseTest):
     def test_sets_created_date_correctly(self) -> None:
         feature_name = self.txt()
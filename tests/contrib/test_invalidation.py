@@ -0,0 +1,265 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from flipper import CachedFeatureFlagStore, MemoryFeatureFlagStore
+from flipper.contrib import LoopbackInvalidationBus, RedisInvalidationBus
+from flipper.contrib.invalidation import _restart_listeners_after_fork
+
+
+class BaseTest(unittest.TestCase):
+    def txt(self):
+        return uuid4().hex
+
+
+class TestLoopbackInvalidationBus(BaseTest):
+    def test_delivers_to_every_subscriber(self) -> None:
+        bus = LoopbackInvalidationBus()
+        first, second = MagicMock(), MagicMock()
+        bus.subscribe(first)
+        bus.subscribe(second)
+
+        bus.publish("flag", origin="a")
+
+        first.assert_called_once_with("flag", "a")
+        second.assert_called_once_with("flag", "a")
+
+    def test_stops_delivering_after_unsubscribe(self) -> None:
+        bus = LoopbackInvalidationBus()
+        callback = MagicMock()
+        unsubscribe = bus.subscribe(callback)
+
+        unsubscribe()
+        bus.publish("flag")
+
+        callback.assert_not_called()
+
+    def test_failing_subscriber_does_not_block_others(self) -> None:
+        bus = LoopbackInvalidationBus()
+        callback = MagicMock()
+        bus.subscribe(MagicMock(side_effect=RuntimeError))
+        bus.subscribe(callback)
+
+        bus.publish("flag")
+
+        callback.assert_called_once_with("flag", None)
+
+
+class TestRedisInvalidationBus(BaseTest):
+    def setUp(self) -> None:
+        self.server = fakeredis.FakeServer()
+        self.publisher = RedisInvalidationBus(fakeredis.FakeRedis(server=self.server))
+        self.subscriber = RedisInvalidationBus(fakeredis.FakeRedis(server=self.server))
+        self.addCleanup(self.subscriber.close)
+
+    def test_delivers_published_invalidations(self) -> None:
+        received = threading.Event()
+        messages = []
+
+        def callback(feature_name: str, origin: str | None) -> None:
+            messages.append((feature_name, origin))
+            received.set()
+
+        self.subscriber.subscribe(callback)
+        self.publish_until(received, "flag", "a")
+
+        assert messages[0] == ("flag", "a")
+
+    def test_ignores_malformed_messages(self) -> None:
+        received = threading.Event()
+        callback = MagicMock(side_effect=lambda *_: received.set())
+        self.subscriber.subscribe(callback)
+
+        fakeredis.FakeRedis(server=self.server).publish("flipper:invalidations", b"not json")
+        self.publish_until(received, "flag")
+
+        callback.assert_called_with("flag", None)
+
+    def test_listens_with_exception_handler(self) -> None:
+        self.subscriber.subscribe(MagicMock())
+
+        assert self.subscriber._thread.exception_handler is not None  # noqa: SLF001
+
+    def test_reconnects_after_listener_error(self) -> None:
+        bus = RedisInvalidationBus(fakeredis.FakeRedis(server=self.server), reconnect_interval=0)
+        pubsub = MagicMock()
+
+        bus._on_listener_error(ConnectionError("gone"), pubsub, MagicMock())  # noqa: SLF001
+
+        pubsub.connection.disconnect.assert_called_once_with()
+        pubsub.connection.connect.assert_called_once_with()
+
+    def test_survives_failed_reconnect(self) -> None:
+        bus = RedisInvalidationBus(fakeredis.FakeRedis(server=self.server), reconnect_interval=0)
+        pubsub = MagicMock()
+        pubsub.connection.connect.side_effect = ConnectionError("still gone")
+
+        bus._on_listener_error(ConnectionError("gone"), pubsub, MagicMock())  # noqa: SLF001
+
+    def test_restarts_listener_after_fork(self) -> None:
+        received = threading.Event()
+        self.subscriber.subscribe(MagicMock(side_effect=lambda *_: received.set()))
+        parent_thread = self.subscriber._thread  # noqa: SLF001
+
+        _restart_listeners_after_fork()
+        parent_thread.stop()
+
+        assert self.subscriber._thread is not parent_thread  # noqa: SLF001
+        self.publish_until(received, "flag")
+
+    def publish_until(self, received: threading.Event, feature_name: str, origin: str | None = None) -> None:
+        # The listener thread subscribes asynchronously, so early messages
+        # can be missed; keep publishing until one arrives.
+        for _ in range(100):
+            self.publisher.publish(feature_name, origin=origin)
+            if received.wait(0.05):
+                return
+        self.fail("invalidation was not delivered")
+
+
+class TestCachedFeatureFlagStoreInvalidation(BaseTest):
+    def setUp(self) -> None:
+        self.slow = MemoryFeatureFlagStore()
+        self.bus = LoopbackInvalidationBus()
+        self.writer = CachedFeatureFlagStore(self.slow, invalidation_bus=self.bus)
+        self.reader = CachedFeatureFlagStore(self.slow, ttl=3600, invalidation_bus=self.bus)
+
+    def test_evicts_flags_written_by_other_caches(self) -> None:
+        feature_name = self.txt()
+        self.writer.create(feature_name)
+        assert not self.reader.get(feature_name).is_enabled()
+
+        self.writer.set(feature_name, True)
+
+        assert self.reader.get(feature_name).is_enabled()
+
+    def test_counts_invalidations(self) -> None:
+        feature_name = self.txt()
+        self.writer.create(feature_name)
+        self.reader.get(feature_name)
+
+        self.writer.set(feature_name, True)
+
+        assert self.reader.stats().evictions["invalidated"] == 1
+
+    def test_evicts_deleted_flags(self) -> None:
+        feature_name = self.txt()
+        self.writer.create(feature_name)
+        self.reader.get(feature_name)
+
+        self.writer.delete(feature_name)
+
+        assert self.reader.get(feature_name) is None
+
+    def test_does_not_evict_own_writes(self) -> None:
+        feature_name = self.txt()
+        self.writer.create(feature_name)
+        self.slow.get = MagicMock()
+
+        self.writer.set_meta(feature_name, self.writer.get(feature_name)._meta)  # noqa: SLF001
+        self.slow.get.reset_mock()
+        self.writer.get(feature_name)
+
+        self.slow.get.assert_not_called()
+
+    def test_load_in_flight_does_not_undo_invalidation(self) -> None:
+        feature_name = self.txt()
+        self.writer.create(feature_name)
+        started, release = threading.Event(), threading.Event()
+        get = self.slow.get
+
+        def stalled_get(name: str):
+            item = get(name)
+            started.set()
+            release.wait(5)
+            return item
+
+        self.slow.get = MagicMock(side_effect=stalled_get)
+        reader = threading.Thread(target=self.reader.get, args=(feature_name,))
+        reader.start()
+        started.wait(5)
+        self.slow.get = get
+        self.writer.set(feature_name, True)
+        release.set()
+        reader.join()
+
+        assert self.reader.get(feature_name).is_enabled()
+
+    def test_refresh_keeps_serving_cached_copy_until_reloaded(self) -> None:
+        reader = CachedFeatureFlagStore(self.slow, invalidation_bus=self.bus, on_invalidate="refresh")
+        feature_name = self.txt()
+        self.writer.create(feature_name)
+        reader.get(feature_name)
+        reader._get_executor = MagicMock()  # noqa: SLF001
+
+        self.writer.set(feature_name, True)
+
+        assert not reader.get(feature_name).is_enabled()
+        reader._get_executor().submit.assert_called_once_with(reader._reload, feature_name)  # noqa: SLF001
+
+    def test_drops_cached_catalog(self) -> None:
+        reader = CachedFeatureFlagStore(self.slow, cache_catalog=True, invalidation_bus=self.bus)
+        list(reader.list())
+        feature_name = self.txt()
+
+        self.writer.create(feature_name)
+
+        assert feature_name in [item.feature_name for item in reader.list()]
+
+    def test_refreshes_cached_flags_in_background(self) -> None:
+        reader = CachedFeatureFlagStore(
+            self.slow, invalidation_bus=self.bus, on_invalidate="refresh", refresh_workers=1
+        )
+        feature_name = self.txt()
+        self.writer.create(feature_name)
+        reader.get(feature_name)
+
+        self.writer.set(feature_name, True)
+        reader._executor.submit(lambda: None).result()  # noqa: SLF001
+
+        self.slow.get = MagicMock()
+        assert reader.get(feature_name).is_enabled()
+        self.slow.get.assert_not_called()
+
+    def test_refresh_skips_flags_not_cached(self) -> None:
+        reader = CachedFeatureFlagStore(self.slow, invalidation_bus=self.bus, on_invalidate="refresh")
+        self.writer.create(self.txt())
+
+        assert reader._executor is None  # noqa: SLF001
+
+    def test_close_stops_listening(self) -> None:
+        feature_name = self.txt()
+        self.writer.create(feature_name)
+        self.reader.get(feature_name)
+
+        self.reader.close()
+        self.writer.set(feature_name, True)
+
+        assert not self.reader.get(feature_name).is_enabled()
+
+    def test_rejects_unknown_on_invalidate(self) -> None:
+        with pytest.raises(ValueError, match="on_invalidate"):
+            CachedFeatureFlagStore(self.slow, on_invalidate="ignore")
+
+    def test_works_across_redis(self) -> None:
+        server = fakeredis.FakeServer()
+        writer_bus = RedisInvalidationBus(fakeredis.FakeRedis(server=server))
+        reader_bus = RedisInvalidationBus(fakeredis.FakeRedis(server=server))
+        self.addCleanup(reader_bus.close)
+        writer = CachedFeatureFlagStore(self.slow, invalidation_bus=writer_bus)
+        reader = CachedFeatureFlagStore(self.slow, invalidation_bus=reader_bus)
+        feature_name = self.txt()
+        writer.create(feature_name)
+
+        for _ in range(100):
+            reader.get(feature_name)
+            writer.set(feature_name, True)
+            if reader.get(feature_name).is_enabled():
+                break
+            threading.Event().wait(0.05)
+
+        assert reader.get(feature_name).is_enabled()
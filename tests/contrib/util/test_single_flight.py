@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import pytest
+
+from flipper.contrib.util.single_flight import SingleFlight
+
+
+class BaseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def blocking(self, result):
+        def fn():
+            self.started.set()
+            self.release.wait(5)
+            if isinstance(result, BaseException):
+                raise result
+            return result
+
+        return MagicMock(side_effect=fn)
+
+    def run_threads(self, target, count: int) -> list:
+        results = []
+
+        def run() -> None:
+            try:
+                results.append(target())
+            except Exception as e:  # noqa: BLE001
+                results.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(count)]
+        threads[0].start()
+        self.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # Give the waiters time to join the call before it completes.
+        time.sleep(0.05)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+
+class TestDo(BaseTest):
+    def test_runs_function_once_for_concurrent_callers(self) -> None:
+        fn = self.blocking("item")
+
+        results = self.run_threads(lambda: self.flight.do("key", fn), 8)
+
+        assert results == ["item"] * 8
+        fn.assert_called_once()
+
+    def test_raises_error_to_every_waiter(self) -> None:
+        fn = self.blocking(ConnectionError("down"))
+
+        results = self.run_threads(lambda: self.flight.do("key", fn), 4)
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+        fn.assert_called_once()
+
+    def test_waiters_time_out(self) -> None:
+        fn = self.blocking("item")
+        leader = threading.Thread(target=self.flight.do, args=("key", fn))
+        leader.start()
+        self.started.wait(5)
+
+        with pytest.raises(TimeoutError):
+            self.flight.do("key", fn, timeout=0.01)
+
+        self.release.set()
+        leader.join()
+        fn.assert_called_once()
+
+    def test_runs_again_once_call_completes(self) -> None:
+        fn = MagicMock(return_value="item")
+
+        self.flight.do("key", fn)
+        self.flight.do("key", fn)
+
+        assert fn.call_count == 2  # noqa: PLR2004
+        assert not self.flight.in_flight("key")
+
+    def test_keeps_keys_independent(self) -> None:
+        assert self.flight.do("a", lambda: 1) == 1
+        assert self.flight.do("b", lambda: 2) == 2  # noqa: PLR2004
+
+
+class TestAdo(BaseTest):
+    def test_coalesces_coroutines(self) -> None:
+        fn = self.blocking("item")
+
+        async def main() -> list:
+            waiters = [asyncio.ensure_future(self.flight.ado("key", fn)) for _ in range(5)]
+            await asyncio.sleep(0)
+            self.release.set()
+            return await asyncio.gather(*waiters)
+
+        assert asyncio.run(main()) == ["item"] * 5
+        fn.assert_called_once()
+
+    def test_joins_call_started_by_thread(self) -> None:
+        fn = self.blocking("item")
+        leader = threading.Thread(target=self.flight.do, args=("key", fn))
+        leader.start()
+        self.started.wait(5)
+
+        async def main() -> str:
+            waiter = asyncio.ensure_future(self.flight.ado("key", fn))
+            await asyncio.sleep(0)
+            self.release.set()
+            return await waiter
+
+        assert asyncio.run(main()) == "item"
+        leader.join()
+        fn.assert_called_once()
+
+    def test_timeout_does_not_cancel_call(self) -> None:
+        fn = self.blocking("item")
+
+        async def main() -> str:
+            with pytest.raises(TimeoutError):
+                await self.flight.ado("key", fn, timeout=0.01)
+            waiter = asyncio.ensure_future(self.flight.ado("key", fn))
+            await asyncio.sleep(0)
+            self.release.set()
+            return await waiter
+
+        assert asyncio.run(main()) == "item"
+        fn.assert_called_once()
+
+    def test_raises_error(self) -> None:
+        async def main() -> None:
+            await self.flight.ado("key", MagicMock(side_effect=ConnectionError))
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(main())
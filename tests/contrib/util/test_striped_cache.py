@@ -0,0 +1,81 @@
+import threading
+import unittest
+
+import pytest
+from cachetools import LFUCache
+
+from flipper.contrib.util.striped_cache import READ_BUFFER_DRAIN, StripedCache
+
+
+class TestStripedCache(unittest.TestCase):
+    def test_returns_stored_values(self) -> None:
+        cache = StripedCache(10, segments=1)
+        cache["a"] = 1
+        cache["b"] = None
+
+        assert cache["a"] == 1
+        assert cache["b"] is None
+        assert "b" in cache
+        assert len(cache) == 2  # noqa: PLR2004
+
+    def test_raises_key_error_for_missing_keys(self) -> None:
+        with pytest.raises(KeyError):
+            StripedCache(10)["a"]
+
+    def test_rounds_segments_up_to_a_power_of_two(self) -> None:
+        assert StripedCache(10, segments=5).segments == 8  # noqa: PLR2004
+
+    def test_pop_removes_value(self) -> None:
+        cache = StripedCache(10, segments=1)
+        cache["a"] = 1
+
+        assert cache.pop("a") == 1
+        assert cache.pop("a", "missing") == "missing"
+        assert "a" not in cache
+
+    def test_evicts_least_recently_used_value(self) -> None:
+        cache = StripedCache(2, segments=1)
+        cache["a"] = 1
+        cache["b"] = 2
+        for _ in range(READ_BUFFER_DRAIN):
+            cache["a"]
+        cache["c"] = 3
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_builds_segments_with_cache_factory(self) -> None:
+        cache = StripedCache(2, segments=1, cache_factory=LFUCache)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"]
+        cache["b"]
+        cache["b"]
+        cache["c"] = 3
+
+        assert "a" not in cache
+        assert "b" in cache
+
+    def test_survives_concurrent_reads_and_writes(self) -> None:
+        cache = StripedCache(64, segments=4)
+        errors = []
+
+        def hammer(seed: int) -> None:
+            try:
+                for i in range(5000):
+                    key = (seed * 7919 + i) % 200
+                    cache[key] = key
+                    value = cache.get(key)
+                    assert value in (None, key)
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+
+        threads = [threading.Thread(target=hammer, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(cache) <= 64  # noqa: PLR2004
@@ -0,0 +1,108 @@
+import random
+import unittest
+
+import pytest
+
+from flipper.contrib.util.tinylfu import SKETCH_MAX_COUNT, CountMinSketch, WTinyLFUCache
+
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_counts_increments(self) -> None:
+        sketch = CountMinSketch(100)
+        for _ in range(3):
+            sketch.increment("a")
+
+        assert sketch.frequency("a") == 3  # noqa: PLR2004
+        assert sketch.frequency("b") == 0
+
+    def test_saturates_counters(self) -> None:
+        sketch = CountMinSketch(1000)
+        for _ in range(SKETCH_MAX_COUNT + 5):
+            sketch.increment("a")
+
+        assert sketch.frequency("a") == SKETCH_MAX_COUNT
+
+    def test_halves_counters_after_sample(self) -> None:
+        sketch = CountMinSketch(1)
+        for _ in range(8):
+            sketch.increment("a")
+        sketch.increment("b")
+        sketch.increment("b")
+
+        assert sketch.frequency("a") == 4  # noqa: PLR2004
+
+
+class TestWTinyLFUCache(unittest.TestCase):
+    def fill(self, cache: WTinyLFUCache, keys, reads: int = 1) -> None:
+        for key in keys:
+            cache[key] = key
+            for _ in range(reads):
+                cache[key]
+
+    def test_returns_stored_values(self) -> None:
+        cache = WTinyLFUCache(10)
+        cache["a"] = 1
+        cache["a"] = 2
+
+        assert cache["a"] == 2  # noqa: PLR2004
+        assert len(cache) == 1
+        with pytest.raises(KeyError):
+            cache["b"]
+
+    def test_never_exceeds_maxsize(self) -> None:
+        cache = WTinyLFUCache(50)
+        rng = random.Random(0)  # noqa: S311
+        for _ in range(5000):
+            key = rng.randrange(500)
+            if key in cache:
+                cache[key]
+            else:
+                cache[key] = key
+
+        assert len(cache) == 50  # noqa: PLR2004
+
+    def test_keeps_frequent_keys_through_scan(self) -> None:
+        cache = WTinyLFUCache(100)
+        hot = [f"hot-{i}" for i in range(50)]
+        self.fill(cache, hot, reads=3)
+        # Pushes the last hot key out of the admission window.
+        cache["warm"] = "warm"
+
+        self.fill(cache, (f"cold-{i}" for i in range(1000)), reads=0)
+
+        # Sketch collisions can make the odd cold key look as popular as a
+        # hot one; an LRU cache would have kept none.
+        assert sum(key in cache for key in hot) >= 45  # noqa: PLR2004
+
+    def test_admits_keys_that_become_frequent(self) -> None:
+        cache = WTinyLFUCache(100)
+        self.fill(cache, range(100))
+
+        for _ in range(5):
+            self.fill(cache, ["new"], reads=2)
+            cache.pop("new")
+        cache["new"] = "new"
+        self.fill(cache, range(1000, 1005), reads=0)
+
+        assert "new" in cache
+
+    def test_delete_and_popitem(self) -> None:
+        cache = WTinyLFUCache(10)
+        self.fill(cache, "abc")
+
+        del cache["a"]
+        while cache:
+            cache.popitem()
+
+        assert "a" not in cache
+        with pytest.raises(KeyError):
+            cache.popitem()
+
+    def test_counts_sizes(self) -> None:
+        cache = WTinyLFUCache(10, getsizeof=len)
+        cache["a"] = "xxxx"
+        cache["b"] = "xxxx"
+        cache["c"] = "xxxx"
+
+        assert cache.currsize <= 10  # noqa: PLR2004
+        assert len(cache) == 2  # noqa: PLR2004
@@ -0,0 +1,135 @@
+import random
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from flipper import Condition, FeatureFlagClient, MemoryFeatureFlagStore
+from flipper.batch import evaluate_batch
+from flipper.bucketing import ConsistentHashPercentageBucketer, Percentage, PercentageBucketer
+from flipper.conditions.check import Check
+from flipper.contrib.storage import FeatureFlagStoreItem, FeatureFlagStoreMeta
+
+
+class BaseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = int(datetime.now().timestamp())  # noqa: DTZ005
+        self.rng = random.Random(5)  # noqa: S311
+
+    def item(self, is_enabled=True, conditions=None, bucketer=None):
+        return FeatureFlagStoreItem(
+            "flag", is_enabled, FeatureFlagStoreMeta(self.now, conditions=conditions, bucketer=bucketer)
+        )
+
+    def scalar(self, item, columns):
+        names = list(columns)
+        rows = zip(*(columns[name].tolist() for name in names), strict=True)
+        return np.array([item.is_enabled(**dict(zip(names, row, strict=True))) for row in rows], dtype=bool)
+
+
+class TestEvaluateBatch(BaseTest):
+    def test_returns_all_false_when_disabled(self) -> None:
+        result = evaluate_batch(self.item(is_enabled=False), {"a": np.arange(3)})
+        assert not result.any()
+
+    def test_returns_default_when_flag_does_not_exist(self) -> None:
+        result = evaluate_batch(None, {"a": np.arange(3)}, default=True)
+        assert result.all()
+
+    def test_requires_size_without_columns(self) -> None:
+        with pytest.raises(ValueError, match="size"):
+            evaluate_batch(self.item(), {})
+
+    def test_raises_for_columns_of_different_lengths(self) -> None:
+        with pytest.raises(ValueError, match="same length"):
+            evaluate_batch(self.item(), {"a": np.arange(3), "b": np.arange(4)})
+
+    def test_agrees_with_scalar_path_for_conditions(self) -> None:
+        operators = ["", "__gt", "__gte", "__lt", "__lte", "__ne", "__in", "__not_in", "__between", "__not_between"]
+        columns = {
+            "a": np.array([self.rng.randint(0, 5) for _ in range(200)]),
+            "b": np.array([self.rng.choice(["x", "y", "z"]) for _ in range(200)]),
+        }
+
+        for _ in range(100):
+            conditions = []
+            for _ in range(self.rng.randint(1, 3)):
+                operator = self.rng.choice(operators)
+                if operator.endswith("between"):
+                    conditions.append(Condition(**{"a" + operator: sorted(self.rng.sample(range(6), 2))}))
+                elif operator.endswith("in"):
+                    conditions.append(Condition(**{"b" + operator: self.rng.sample(["x", "y", "z"], 2)}))
+                else:
+                    conditions.append(Condition(**{"a" + operator: self.rng.randint(0, 5)}))
+            item = self.item(conditions=conditions)
+
+            np.testing.assert_array_equal(evaluate_batch(item, columns), self.scalar(item, columns))
+
+    def test_agrees_with_scalar_path_for_mixed_type_membership(self) -> None:
+        columns = {
+            "a": np.array([0, 1, 2]),
+            "b": np.array(["1", "a", "x"]),
+            "c": np.array([1, "1", "a", None], dtype=object),
+        }
+
+        for operator in ("__in", "__not_in"):
+            for name, column in columns.items():
+                item = self.item(conditions=[Condition(**{name + operator: [1, "a"]})])
+                np.testing.assert_array_equal(
+                    evaluate_batch(item, {name: column}), self.scalar(item, {name: column}), err_msg=name + operator
+                )
+
+    def test_agrees_with_scalar_path_for_membership_across_column_kinds(self) -> None:
+        columns = {"company_id": np.array(["3", "7"]), "plan": np.array([3, 7])}
+
+        for operator in ("__in", "__not_in"):
+            for name, values in (("company_id", list(range(20))), ("plan", [str(i) for i in range(20)])):
+                item = self.item(conditions=[Condition(**{name + operator: values})])
+                column = {name: columns[name]}
+                np.testing.assert_array_equal(
+                    evaluate_batch(item, column), self.scalar(item, column), err_msg=name + operator
+                )
+
+    def test_agrees_with_scalar_path_for_non_vectorized_operators(self) -> None:
+        columns = {"email": np.array(["a@example.com", "b@example.org", "c@example.com"])}
+        item = self.item(conditions=[Condition(email__endswith="@example.com")])
+
+        np.testing.assert_array_equal(evaluate_batch(item, columns), [True, False, True])
+
+    def test_coerces_values_for_typed_checks(self) -> None:
+        columns = {"seats": np.array(["5", "12", "not a number"])}
+        item = self.item(conditions=[Condition.from_checks([Check.factory("seats__gte", 10, value_type="int")])])
+
+        np.testing.assert_array_equal(evaluate_batch(item, columns), [False, True, False])
+
+    def test_treats_membership_in_a_string_as_substring(self) -> None:
+        columns = {"letter": np.array(["a", "q"])}
+        item = self.item(conditions=[Condition(letter__in="abc")])
+
+        np.testing.assert_array_equal(evaluate_batch(item, columns), self.scalar(item, columns))
+
+    def test_agrees_with_scalar_path_for_consistent_hash_bucketer(self) -> None:
+        bucketer = ConsistentHashPercentageBucketer(key_whitelist=["user_id"], percentage=Percentage(0.3))
+        columns = {"user_id": np.arange(1000), "plan": np.array(["pro"] * 1000)}
+        item = self.item(bucketer=bucketer)
+
+        np.testing.assert_array_equal(evaluate_batch(item, columns), self.scalar(item, columns))
+
+    def test_uses_random_percentage_for_percentage_bucketer(self) -> None:
+        item = self.item(bucketer=PercentageBucketer(percentage=Percentage(0.5)))
+
+        result = evaluate_batch(item, {}, size=10000)
+
+        assert 0.4 < result.mean() < 0.6  # noqa: PLR2004
+
+
+class TestClientEvaluateBatch(unittest.TestCase):
+    def test_evaluates_flag_from_store(self) -> None:
+        client = FeatureFlagClient(MemoryFeatureFlagStore())
+        client.create("flag", is_enabled=True)
+        client.add_condition("flag", Condition(age__gte=18))
+
+        result = client.evaluate_batch("flag", {"age": np.array([10, 18, 30])})
+
+        np.testing.assert_array_equal(result, [False, True, True])
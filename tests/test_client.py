@@ -5,7 +5,7 @@ from uuid import uuid4
 import pytest
 
 from flipper import Condition, FeatureFlagClient, MemoryFeatureFlagStore
-from flipper.bucketing import Percentage, PercentageBucketer
+from flipper.bucketing import Percentage, PercentageBucketer, VariantBucketer
 from flipper.contrib.storage import FeatureFlagStoreMeta
 from flipper.events import EventType, FlipperEventEmitter, FlipperEventSubscriber
 from flipper.exceptions import FlagDoesNotExistError
@@ -102,6 +102,111 @@ class TestIsEnabled(BaseTest):
         bucketer.check.assert_called_with(foo=True)
 
 
+class TestIsEnabledContext(BaseTest):
+    def test_returns_default_when_flag_does_not_exist(self) -> None:
+        assert self.client.is_enabled_context(self.txt(), {}, default=True)
+
+    def test_reads_only_variables_the_flag_checks(self) -> None:
+        feature_name = self.txt()
+        self.client.create(feature_name, is_enabled=True)
+        self.client.add_condition(feature_name, Condition(is_staff=True))
+        context = {"is_staff": lambda: True, "seats": MagicMock()}
+
+        assert self.client.is_enabled_context(feature_name, context)
+        context["seats"].assert_not_called()
+
+
+class TestGetVariant(BaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.feature_name = self.txt()
+        self.bucketer = VariantBucketer(variants={"a": 0.5, "b": 0.5}, key_whitelist=["user_id"])
+        self.client.create(self.feature_name, is_enabled=True)
+        self.client.set_bucketer(self.feature_name, self.bucketer)
+
+    def test_returns_assigned_variant(self) -> None:
+        for user_id in range(20):
+            assert self.client.get_variant(self.feature_name, user_id=user_id) == self.bucketer.variant(user_id=user_id)
+
+    def test_returns_default_when_flag_does_not_exist(self) -> None:
+        assert self.client.get_variant(self.txt(), default="control", user_id=1) == "control"
+
+    def test_returns_default_when_flag_is_disabled(self) -> None:
+        self.client.disable(self.feature_name)
+        assert self.client.get_variant(self.feature_name, default="control", user_id=1) == "control"
+
+    def test_returns_default_when_a_condition_fails(self) -> None:
+        self.client.add_condition(self.feature_name, Condition(is_staff=True))
+        assert self.client.get_variant(self.feature_name, user_id=1, is_staff=False) is None
+        assert self.client.get_variant(self.feature_name, user_id=1, is_staff=True) is not None
+
+    def test_is_enabled_outside_every_variant_only_without_conditions(self) -> None:
+        self.client.set_bucketer(self.feature_name, VariantBucketer(variants={"a": 0.1}, key_whitelist=["user_id"]))
+        user_id = next(
+            user_id for user_id in range(100) if self.client.get_variant(self.feature_name, user_id=user_id) is None
+        )
+        assert not self.client.is_enabled(self.feature_name, user_id=user_id)
+
+        self.client.add_condition(self.feature_name, Condition(country="US"))
+
+        assert self.client.is_enabled(self.feature_name, user_id=user_id, country="US")
+        assert self.client.get_variant(self.feature_name, user_id=user_id, country="US") is None
+
+    def test_returns_default_without_variant_bucketer(self) -> None:
+        self.client.set_bucketer(self.feature_name, PercentageBucketer(percentage=Percentage(1.0)))
+        assert self.client.get_variant(self.feature_name, default="control", user_id=1) == "control"
+
+    def test_is_available_on_flag(self) -> None:
+        flag = self.client.get(self.feature_name)
+        assert flag.get_variant(user_id=3) == self.bucketer.variant(user_id=3)
+
+
+class TestEvaluateAll(BaseTest):
+    def test_returns_result_for_every_flag(self) -> None:
+        enabled, disabled = self.txt(), self.txt()
+
+        self.client.create(enabled, is_enabled=True)
+        self.client.create(disabled)
+
+        assert self.client.evaluate_all() == {enabled: True, disabled: False}
+
+    def test_matches_is_enabled_for_each_flag(self) -> None:
+        names = [self.txt() for _ in range(4)]
+        for name in names:
+            self.client.create(name, is_enabled=True)
+        self.client.add_condition(names[0], Condition(is_staff=True))
+        self.client.add_condition(names[1], Condition(is_staff=False))
+        self.client.add_condition(names[2], Condition(plan__in=["pro"], is_staff=True))
+
+        results = self.client.evaluate_all(is_staff=True, plan="pro")
+
+        assert results == {name: self.client.is_enabled(name, is_staff=True, plan="pro") for name in names}
+
+    def test_reuses_index_while_flags_are_unchanged(self) -> None:
+        self.client.create(self.txt())
+
+        assert self.client.rule_index() is self.client.rule_index()
+
+    def test_rebuilds_index_after_write(self) -> None:
+        feature_name = self.txt()
+        self.client.create(feature_name)
+        assert self.client.evaluate_all() == {feature_name: False}
+
+        self.store.set(feature_name, True)
+
+        assert self.client.evaluate_all() == {feature_name: True}
+
+    def test_rebuilds_index_after_delete(self) -> None:
+        kept, deleted = self.txt(), self.txt()
+        self.client.create(kept)
+        self.client.create(deleted)
+        self.client.evaluate_all()
+
+        self.client.destroy(deleted)
+
+        assert self.client.evaluate_all() == {kept: False}
+
+
 class TestCreate(BaseTest):
     def test_creates_and_returns_instance_of_feature_flag_class(self) -> None:
         feature_name = self.txt()
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock
+
+from flipper import EvaluationContext
+
+
+class TestEvaluationContext(unittest.TestCase):
+    def test_resolves_callables_when_read(self) -> None:
+        loader = MagicMock(return_value="pro")
+        context = EvaluationContext({"plan": loader})
+
+        loader.assert_not_called()
+        assert context["plan"] == "pro"
+
+    def test_resolves_each_value_once(self) -> None:
+        loader = MagicMock(return_value=3)
+        context = EvaluationContext({"seats": loader})
+
+        context["seats"]
+        context["seats"]
+
+        loader.assert_called_once_with()
+
+    def test_reads_lazy_mappings_only_for_requested_keys(self) -> None:
+        source = MagicMock()
+        source.__getitem__.return_value = 1
+        source.__contains__.return_value = True
+        context = EvaluationContext(source)
+
+        assert "seats" in context
+        assert context["seats"] == 1
+        source.__getitem__.assert_called_once_with("seats")
+
+    def test_lists_keys_without_resolving(self) -> None:
+        loader = MagicMock()
+        context = EvaluationContext({"plan": loader, "seats": 2})
+
+        assert list(context) == ["plan", "seats"]
+        assert len(context) == 2  # noqa: PLR2004
+        loader.assert_not_called()
+
+
+class TestWrap(unittest.TestCase):
+    def test_returns_plain_dicts_untouched(self) -> None:
+        context = {"plan": "pro"}
+        assert EvaluationContext.wrap(context) is context
+
+    def test_wraps_dicts_with_callables(self) -> None:
+        assert isinstance(EvaluationContext.wrap({"plan": lambda: "pro"}), EvaluationContext)
+
+    def test_does_not_wrap_twice(self) -> None:
+        context = EvaluationContext({})
+        assert EvaluationContext.wrap(context) is context